@@ -1,7 +1,9 @@
 from .azure_blob import BlobClient, BlobServiceClient, ContainerClient
-from .azure_sql import AzureSqlConnection, SqlManagementClient
+from .azure_sql import (AzureSqlConnection, SqlManagementClient,
+                        dispose_sql_connections, get_sql_connection)
 from .azure_tables import TableServiceClient
-from .dataframe_io import read_df, write_df, write_df_from_sqltable
+from .dataframe_io import read_df, scan_sql, write_df, write_df_from_sqltable
+from .warmup import warm_up
 
 __all__ = [
     "BlobClient",
@@ -9,8 +11,12 @@ __all__ = [
     "ContainerClient",
     "AzureSqlConnection",
     "SqlManagementClient",
+    "dispose_sql_connections",
+    "get_sql_connection",
     "TableServiceClient",
     "read_df",
+    "scan_sql",
     "write_df",
     "write_df_from_sqltable",
+    "warm_up",
 ]
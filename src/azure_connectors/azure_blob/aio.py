@@ -0,0 +1,25 @@
+from azure.storage.blob.aio import BlobClient as AzBlobClient
+from azure.storage.blob.aio import BlobServiceClient as AzBlobServiceClient
+from azure.storage.blob.aio import ContainerClient as AzContainerClient
+
+from azure_connectors.client_factory import AsyncClientFactory
+from azure_connectors.config import CredentialScope
+
+from .settings import (BlobClientSettings, BlobServiceClientSettings,
+                       ContainerClientSettings)
+
+BlobServiceClient = AsyncClientFactory(
+    AzBlobServiceClient,
+    settings_class=BlobServiceClientSettings,
+    scope=CredentialScope.AZURE_BLOB,
+).client
+
+ContainerClient = AsyncClientFactory(
+    AzContainerClient,
+    settings_class=ContainerClientSettings,
+    scope=CredentialScope.AZURE_BLOB,
+).client
+
+BlobClient = AsyncClientFactory(
+    AzBlobClient, settings_class=BlobClientSettings, scope=CredentialScope.AZURE_BLOB
+).client
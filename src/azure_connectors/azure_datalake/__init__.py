@@ -1,3 +1,4 @@
-from .sdk_clients import BlobClient as BlobClient
-from .sdk_clients import BlobServiceClient as BlobServiceClient
-from .sdk_clients import ContainerClient as ContainerClient
+from .sdk_clients import DataLakeDirectoryClient as DataLakeDirectoryClient
+from .sdk_clients import DataLakeFileClient as DataLakeFileClient
+from .sdk_clients import DataLakeServiceClient as DataLakeServiceClient
+from .sdk_clients import FileSystemClient as FileSystemClient
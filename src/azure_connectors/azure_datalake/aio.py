@@ -0,0 +1,39 @@
+from azure.storage.filedatalake.aio import \
+    DataLakeDirectoryClient as AzDataLakeDirectoryClient
+from azure.storage.filedatalake.aio import \
+    DataLakeFileClient as AzDataLakeFileClient
+from azure.storage.filedatalake.aio import \
+    DataLakeServiceClient as AzDataLakeServiceClient
+from azure.storage.filedatalake.aio import \
+    FileSystemClient as AzFileSystemClient
+
+from azure_connectors.client_factory import AsyncClientFactory
+from azure_connectors.config import CredentialScope
+
+from .settings import (DataLakeDirectoryClientSettings,
+                       DataLakeFileClientSettings,
+                       DataLakeServiceClientSettings, FileSystemClientSettings)
+
+DataLakeServiceClient = AsyncClientFactory(
+    AzDataLakeServiceClient,
+    settings_class=DataLakeServiceClientSettings,
+    scope=CredentialScope.AZURE_DATALAKE,
+).client
+
+FileSystemClient = AsyncClientFactory(
+    AzFileSystemClient,
+    settings_class=FileSystemClientSettings,
+    scope=CredentialScope.AZURE_DATALAKE,
+).client
+
+DataLakeDirectoryClient = AsyncClientFactory(
+    AzDataLakeDirectoryClient,
+    settings_class=DataLakeDirectoryClientSettings,
+    scope=CredentialScope.AZURE_DATALAKE,
+).client
+
+DataLakeFileClient = AsyncClientFactory(
+    AzDataLakeFileClient,
+    settings_class=DataLakeFileClientSettings,
+    scope=CredentialScope.AZURE_DATALAKE,
+).client
@@ -1,2 +1,4 @@
 from .connection import AzureSqlConnection as AzureSqlConnection
+from .registry import dispose_sql_connections as dispose_sql_connections
+from .registry import get_sql_connection as get_sql_connection
 from .sdk_clients import SqlManagementClient as SqlManagementClient
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from functools import cached_property
+from typing import TYPE_CHECKING, Any
 
 import pyodbc
 import sqlalchemy
@@ -10,6 +11,9 @@ from azure_connectors.credential import AzureCredential
 from .constants import SQL_COPT_SS_ACCESS_TOKEN, SQLALCHEMY_PREFIX
 from .settings import AzureSqlSettings
 
+if TYPE_CHECKING:
+    import mssql_python
+
 
 @dataclass(frozen=True)
 class AzureSqlConnection:
@@ -48,14 +52,52 @@ class AzureSqlConnection:
         Returns:
             sqlalchemy.engine.base.Engine: The SQLAlchemy engine.
         """
+        # connections come from `creator`; the URL only identifies the database
+        url = f"{SQLALCHEMY_PREFIX}{self.settings.server}/{self.settings.database}"
         engine = sqlalchemy.create_engine(
-            SQLALCHEMY_PREFIX,
+            url,
             creator=self._connect,
             fast_executemany=self.fast_executemany,
         )
 
         return engine
 
+    def dispose(self, close: bool = True) -> None:
+        """
+        Dispose of the engine's connection pool, if the engine was created.
+
+        Args:
+            close (bool): Whether to close the pooled connections. Pass False in a forked
+                child process, so the parent's connections are dropped without being
+                closed underneath it.
+        """
+        if "engine" in self.__dict__:
+            self.engine.dispose(close=close)
+
+    def arrow_connection(self) -> "mssql_python.Connection":
+        """
+        Open a connection with the mssql-python driver, whose cursors fetch result sets
+        directly into Arrow record batches (`cursor.arrow()`), authenticated with the same
+        token as `engine`. Connections are pooled by the driver.
+
+        Returns:
+            mssql_python.Connection: The mssql-python connection object.
+
+        Raises:
+            ImportError: If the optional `mssql-python` dependency is not installed.
+        """
+        try:
+            import mssql_python
+        except ImportError as e:
+            raise ImportError(
+                "Arrow-native reads require mssql-python: pip install 'azure-connectors[arrow]'"
+            ) from e
+
+        return mssql_python.connect(
+            self.settings.arrow_connection_string,
+            attrs_before=self._attrs_before(),
+        )
+
     def _connect(self) -> pyodbc.Connection:
         """
         Connect to the Azure SQL database using the connection string and access token.
@@ -63,8 +105,15 @@ class AzureSqlConnection:
         Returns:
             pyodbc.Connection: The pyodbc connection object.
         """
-        token = self.credential.token.get_secret_value()
         return pyodbc.connect(
             self.settings.connection_string,
-            attrs_before={SQL_COPT_SS_ACCESS_TOKEN: token},
+            attrs_before=self._attrs_before(),
         )
+
+    def _attrs_before(self) -> dict[int, Any]:
+        """
+        Get the pre-connection ODBC attributes that authenticate with the current access
+        token, so connections opened late in a long job never use an expired one.
+        """
+        token = self.credential.token.get_secret_value()
+        return {SQL_COPT_SS_ACCESS_TOKEN: token}
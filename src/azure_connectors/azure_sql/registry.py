@@ -0,0 +1,95 @@
+import functools
+import os
+import threading
+from typing import Optional
+
+from azure_connectors.credential import AzureCredential
+from azure_connectors.credential.enums import CredentialSource
+from azure_connectors.credential.settings import AzureCredentialSettings
+
+from .connection import AzureSqlConnection
+from .settings import AzureSqlSettings
+
+RegistryKey = tuple[str, str, str, CredentialSource]
+
+_lock = threading.Lock()
+_connections: dict[RegistryKey, AzureSqlConnection] = {}
+
+
+def get_sql_connection(
+    settings: Optional[AzureSqlSettings] = None,
+    source: Optional[CredentialSource] = None,
+) -> AzureSqlConnection:
+    """
+    Get the process-wide shared AzureSqlConnection for the given settings and credential
+    source, creating it (and its credential and engine) on first use.
+
+    Connections are keyed by the resolved server, database, driver and credential
+    source, so every caller targeting the same database shares one credential, token
+    and connection pool instead of paying for a new one per call. Settings and source
+    read from the environment are parsed once, until `dispose_sql_connections`.
+
+    Args:
+        settings (Optional[AzureSqlSettings]): The settings for the connection. If not
+            provided, they will be read from the environment.
+        source (Optional[CredentialSource]): The source of the credentials. If not
+            provided, it will be read from the environment.
+
+    Returns:
+        AzureSqlConnection: The shared connection.
+    """
+    if settings is None:
+        settings = _settings_from_env()
+    if source is None:
+        source = _source_from_env()
+    key: RegistryKey = (settings.server, settings.database, settings.driver, source)
+
+    with _lock:
+        connection = _connections.get(key)
+        if connection is None:
+            credential = AzureCredential.from_env(
+                source=source, scope=AzureSqlConnection.CREDENTIAL_SCOPE
+            )
+            connection = AzureSqlConnection(settings=settings, credential=credential)
+            _connections[key] = connection
+    return connection
+
+
+def dispose_sql_connections() -> None:
+    """
+    Dispose of the connection pools of all shared connections and forget them, so the
+    next `get_sql_connection` call creates a fresh connection, from freshly read
+    environment settings.
+    """
+    with _lock:
+        connections = list(_connections.values())
+        _connections.clear()
+    _settings_from_env.cache_clear()
+    _source_from_env.cache_clear()
+    for connection in connections:
+        connection.dispose()
+
+
+@functools.cache
+def _settings_from_env() -> AzureSqlSettings:
+    return AzureSqlSettings()
+
+
+@functools.cache
+def _source_from_env() -> CredentialSource:
+    return AzureCredentialSettings(scope=AzureSqlConnection.CREDENTIAL_SCOPE).source
+
+
+def _reset_after_fork() -> None:
+    # pooled pyodbc connections must not be shared with a forked child: drop them
+    # without closing, so the parent's sessions are left intact
+    global _lock
+    _lock = threading.Lock()
+    connections = list(_connections.values())
+    _connections.clear()
+    for connection in connections:
+        connection.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
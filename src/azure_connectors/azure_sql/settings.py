@@ -38,6 +38,17 @@ class AzureSqlSettings(BaseSettings):
         """
         return f"DRIVER={self.driver};SERVER={self.server};DATABASE={self.database};"
 
+    @property
+    def arrow_connection_string(self) -> str:
+        """
+        Generates the connection string for the mssql-python driver, which rejects the
+        `DRIVER` keyword (it is its own driver).
+
+        Returns:
+            The connection string.
+        """
+        return f"Server={self.server};Database={self.database};"
+
 
 class SqlManagementClientSettings(AzureSqlSettings):
     @computed_field  # type: ignore
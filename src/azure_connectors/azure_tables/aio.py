@@ -0,0 +1,12 @@
+from azure.data.tables.aio import TableServiceClient as AzTableServiceClient
+
+from azure_connectors.client_factory import AsyncClientFactory
+from azure_connectors.config import CredentialScope
+
+from .settings import TableServiceClientSettings
+
+TableServiceClient = AsyncClientFactory(
+    AzTableServiceClient,
+    settings_class=TableServiceClientSettings,
+    scope=CredentialScope.AZURE_TABLES,
+).client
@@ -1,3 +1,4 @@
+from .client_factory import AsyncClientFactory as AsyncClientFactory
 from .client_factory import ClientFactory as ClientFactory
 from .client_factory import \
     SqlManagementClientFactory as SqlManagementClientFactory
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from azure.core.pipeline.transport import AioHttpTransport
+
+DEFAULT_CONNECTION_LIMIT: int = 1_000
+DEFAULT_CONNECTION_LIMIT_PER_HOST: int = 0
+
+_lock = threading.Lock()
+# the aiohttp session shared by every async client in a loop is stored on the loop:
+# the session references its loop, so a module-level mapping would keep both alive
+_SESSION_ATTR = "_azure_connectors_aiohttp_session"
+
+
+def get_shared_transport() -> "AioHttpTransport":
+    """
+    Get a transport for a new async client that sends its requests through the
+    running event loop's shared aiohttp session, so that all async clients draw on
+    one connection pool. The session is not closed with the client; close it with
+    `close_shared_session`.
+
+    Must be called with an event loop running.
+
+    Returns:
+        AioHttpTransport: A transport over the shared session.
+
+    Raises:
+        ImportError: If the optional `aiohttp` dependency is not installed.
+        RuntimeError: If no event loop is running.
+    """
+    try:
+        import aiohttp
+        from azure.core.pipeline.transport import AioHttpTransport
+    except ImportError as e:
+        raise ImportError(
+            "Async clients require aiohttp: pip install 'azure-connectors[aio]'"
+        ) from e
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        session = vars(loop).get(_SESSION_ATTR)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=DEFAULT_CONNECTION_LIMIT,
+                limit_per_host=DEFAULT_CONNECTION_LIMIT_PER_HOST,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            vars(loop)[_SESSION_ATTR] = session
+    return AioHttpTransport(session=session, session_owner=False)
+
+
+async def close_shared_session() -> None:
+    """Close the running event loop's shared aiohttp session, if it was created."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        session = vars(loop).pop(_SESSION_ATTR, None)
+    if session is not None:
+        await session.close()
@@ -3,8 +3,11 @@ from typing import Any, Type
 
 from azure_connectors.config import CredentialScope
 from azure_connectors.credential import AzureCredential
+from azure_connectors.credential.aio import get_async_base_credential
+from azure_connectors.credential.settings import AzureCredentialSettings
 from azure_connectors.utils import get_parameters
 
+from .aio_transport import get_shared_transport
 from .typing import CredParamMap, SettingsClass, TokenCredential
 
 # from .typing import DynamicAzureClientWithFromEnv, AzureSDKClient
@@ -148,11 +151,45 @@ class BaseClientFactory(ABC):
 
 
 class ClientFactory(BaseClientFactory):
-    cred_param_map: CredParamMap = {"base_credential": "credential"}
+    cred_param_map: CredParamMap = {"token_credential": "credential"}
 
 
 class SqlManagementClientFactory(BaseClientFactory):
     cred_param_map: CredParamMap = {
-        "base_credential": "credential",
+        "token_credential": "credential",
         "subscription_id": "subscription_id",
     }
+
+
+class AsyncClientFactory(BaseClientFactory):
+    """
+    Client factory for the async (`aio`) Azure SDK clients.
+
+    `from_env` resolves settings exactly as for the sync clients, but authenticates with
+    the event loop's shared `azure.identity.aio` credential and sends requests through
+    the loop's shared aiohttp session (see `get_shared_transport`), so that any number of
+    async clients draw on one credential and one connection pool. It must be called
+    with an event loop running. It sets the credential itself, so it has no
+    `cred_param_map`.
+    """
+
+    def _update_client_kwargs_with_credential(
+        self, client_kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Updates the client_kwargs dictionary with the shared async credential and a
+        transport over the shared aiohttp session, unless they were passed.
+
+        Args:
+            client_kwargs (dict[str, Any]): The client_kwargs dictionary to be updated.
+
+        Returns:
+            dict[str, Any]: The updated client_kwargs dictionary.
+        """
+        if "credential" not in client_kwargs:
+            settings = AzureCredentialSettings(scope=self.scope)
+            client_kwargs["credential"] = get_async_base_credential(settings)
+        if "transport" not in client_kwargs:
+            client_kwargs["transport"] = get_shared_transport()
+
+        return client_kwargs
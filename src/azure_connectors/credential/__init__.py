@@ -1 +1,5 @@
 from .credential import AzureCredential as AzureCredential
+from .registry import SharedTokenCredential as SharedTokenCredential
+from .registry import close_credentials as close_credentials
+from .registry import get_base_credential as get_base_credential
+from .registry import get_token_provider as get_token_provider
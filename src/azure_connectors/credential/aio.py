@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+from azure.identity.aio import AzureCliCredential, DefaultAzureCredential
+
+from .enums import CredentialSource
+from .settings import AzureCredentialSettings
+
+AsyncBaseCredential = DefaultAzureCredential | AzureCliCredential
+
+_lock = threading.Lock()
+# async credentials are bound to their event loop, so each loop holds its own
+# (source -> credential) on itself, and they go away with it
+_CREDENTIALS_ATTR = "_azure_connectors_credentials"
+
+
+def get_async_base_credential(settings: AzureCredentialSettings) -> AsyncBaseCredential:
+    """
+    Get the shared `azure.identity.aio` credential for `settings.source` in the running
+    event loop, creating it on first use. All async clients created in the loop share
+    it, and with it its token cache.
+
+    Must be called with an event loop running.
+
+    Args:
+        settings (AzureCredentialSettings): The credential settings; the scope is not
+            part of the key, since one credential serves every scope.
+
+    Returns:
+        AsyncBaseCredential: The shared async credential.
+
+    Raises:
+        ValueError: If settings.source isn't a valid value.
+        RuntimeError: If no event loop is running.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        credentials = vars(loop).setdefault(_CREDENTIALS_ATTR, {})
+        credential = credentials.get(settings.source)
+        if credential is None:
+            match settings.source:
+                case CredentialSource.CLI:
+                    credential = AzureCliCredential()
+                case CredentialSource.DEFAULT:
+                    credential = DefaultAzureCredential()
+                case _:
+                    raise ValueError("Invalid value for credential source.")
+            credentials[settings.source] = credential
+    return credential
+
+
+async def close_async_credentials() -> None:
+    """Close the shared async credentials of the running event loop and forget them."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        credentials = vars(loop).pop(_CREDENTIALS_ATTR, {})
+    for credential in credentials.values():
+        await credential.close()
@@ -1,18 +1,25 @@
-import struct
+import asyncio
+import threading
+import weakref
 from dataclasses import dataclass, field
-from functools import cached_property
 from typing import Optional
 
-from azure.identity import AzureCliCredential, DefaultAzureCredential
 from azure.mgmt.subscription import SubscriptionClient
 from pydantic import SecretBytes
 
 from azure_connectors.config.enums import CredentialScope
 
 from .enums import CredentialSource
+from .registry import (SharedTokenCredential, get_base_credential,
+                       get_token_provider)
 from .settings import AzureCredentialSettings
+from .token_provider import TokenProvider
 from .typing import BaseCredential
 
+# subscription ids listed per shared base credential
+_subscription_lock = threading.Lock()
+_subscription_ids: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
 
 @dataclass(frozen=True)
 class AzureCredential:
@@ -61,7 +68,8 @@ class AzureCredential:
 
     def _get_azure_credential(self) -> BaseCredential:
         """
-        Retrieves the appropriate Azure credential based on the self.credential_type.
+        Retrieves the process-wide shared Azure credential for self.settings.source
+        (see `get_base_credential`).
 
         Returns:
             BaseCredential: The Azure credential object.
@@ -69,23 +77,37 @@ class AzureCredential:
         Raises:
             ValueError: If self.settings.source isn't a valid value.
         """
+        return get_base_credential(self.settings)
+
+    @property
+    def token_provider(self) -> TokenProvider:
+        """
+        The shared provider that keeps the token of this credential's source for
+        `settings.scope` current, refreshing it on a background thread before it
+        expires (see `get_token_provider`).
 
-        credential: BaseCredential
+        Returns:
+            TokenProvider: The token provider.
+        """
+        return get_token_provider(self.settings)
 
-        match self.settings.source:
-            case CredentialSource.CLI:
-                credential = AzureCliCredential()
-            case CredentialSource.DEFAULT:
-                credential = DefaultAzureCredential()
-            case _:
-                raise ValueError("Invalid value for credential source.")
+    @property
+    def token_credential(self) -> SharedTokenCredential:
+        """
+        A TokenCredential for Azure SDK clients that serves tokens from the shared,
+        background-refreshed token providers of this credential's source.
 
-        return credential
+        Returns:
+            SharedTokenCredential: The token credential.
+        """
+        return SharedTokenCredential(self.settings)
 
-    @cached_property
+    @property
     def token(self) -> SecretBytes:
         """
-        Retrieves the Azure AD / Entra ID token.
+        Retrieves the current Azure AD / Entra ID token, packed for the ODBC drivers.
+        The token is refreshed in the background before it expires, so a long-lived
+        credential never hands out an expired token.
 
         Returns:
             SecretBytes: The token as a SecretBytes object.
@@ -93,27 +115,50 @@ class AzureCredential:
         Raises:
             RuntimeError: If failed to obtain the token.
         """
-        try:
-            credential = self.base_credential
-            token_bytes = credential.get_token(
-                str(self.settings.scope.value)
-            ).token.encode("UTF-16-LE")
-            token_struct = struct.pack(
-                f"<I{len(token_bytes)}s", len(token_bytes), token_bytes
-            )
-            return SecretBytes(token_struct)
-
-        except Exception as e:
-            raise RuntimeError("Failed to obtain Azure AD / Entra ID token") from e
+        return SecretBytes(self.token_provider.packed_token())
 
     @property
     def subscription_id(self) -> str:
         """
-        Retrieves the subscription ID for the Azure credentials.
+        Retrieves the subscription ID for the Azure credentials: the
+        AZURE_CREDENTIAL_SUBSCRIPTION_ID setting if given, else the first subscription
+        the credential can list. The listed ID is memoized per (shared) credential, so
+        only the first lookup makes a network call.
 
         Returns:
             str: The subscription ID.
+
+        Raises:
+            RuntimeError: If failed to obtain the subscription ID.
+        """
+        if self.settings.subscription_id is not None:
+            return self.settings.subscription_id
+        with _subscription_lock:
+            subscription_id = _subscription_ids.get(self.base_credential)
+            if subscription_id is None:
+                subscription_id = self._list_subscription_id()
+                _subscription_ids[self.base_credential] = subscription_id
+        return subscription_id
+
+    async def get_subscription_id_async(self) -> str:
+        """
+        Retrieves the subscription ID like `subscription_id`, without blocking the
+        event loop: a lookup that needs the network runs on a worker thread.
+
+        Returns:
+            str: The subscription ID.
+
+        Raises:
+            RuntimeError: If failed to obtain the subscription ID.
         """
+        if self.settings.subscription_id is not None:
+            return self.settings.subscription_id
+        subscription_id = _subscription_ids.get(self.base_credential)
+        if subscription_id is not None:
+            return subscription_id
+        return await asyncio.to_thread(lambda: self.subscription_id)
+
+    def _list_subscription_id(self) -> str:
         try:
             client = SubscriptionClient(self.base_credential)
             subscription = next(iter(client.subscriptions.list()))
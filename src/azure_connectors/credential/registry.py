@@ -0,0 +1,159 @@
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from azure.core.credentials import AccessToken
+from azure.identity import AzureCliCredential, DefaultAzureCredential
+
+from .enums import CredentialSource
+from .settings import AzureCredentialSettings
+from .token_cache import PersistentlyCachedCredential, PersistentTokenCache
+from .token_provider import TokenProvider
+from .typing import BaseCredential
+
+RegistryKey = tuple[CredentialSource, bool, Optional[Path], bool]
+
+_lock = threading.Lock()
+_credentials: dict[RegistryKey, BaseCredential] = {}
+_token_providers: dict[tuple[RegistryKey, str], TokenProvider] = {}
+
+
+def get_base_credential(settings: AzureCredentialSettings) -> BaseCredential:
+    """
+    Get the process-wide shared Azure SDK credential for the credential source (and
+    token cache options) of `settings`, creating it on first use.
+
+    Every AzureCredential, and so every SQL, Blob, Data Lake and Tables client, with
+    the same source shares one credential. The credential chain of
+    `DefaultAzureCredential` is resolved once, and the token caches of its providers
+    are kept for all scopes, instead of being rebuilt and discarded per client.
+
+    Args:
+        settings (AzureCredentialSettings): The credential settings; the scope is not
+            part of the key, since one credential serves every scope.
+
+    Returns:
+        BaseCredential: The shared credential.
+
+    Raises:
+        ValueError: If settings.source isn't a valid value.
+    """
+    key = _registry_key(settings)
+    with _lock:
+        credential = _credentials.get(key)
+        if credential is None:
+            credential = _create_credential(settings)
+            _credentials[key] = credential
+    return credential
+
+
+def get_token_provider(
+    settings: AzureCredentialSettings, scope: Optional[str] = None
+) -> TokenProvider:
+    """
+    Get the process-wide shared TokenProvider for the shared credential of `settings`
+    and `scope` (default: `settings.scope`), so that one background refresh serves
+    every connection and client.
+
+    Returns:
+        TokenProvider: The shared token provider.
+    """
+    credential = get_base_credential(settings)
+    if scope is None:
+        scope = str(settings.scope.value)
+    key = (_registry_key(settings), scope)
+    with _lock:
+        provider = _token_providers.get(key)
+        if provider is None:
+            provider = TokenProvider(credential, scope)
+            _token_providers[key] = provider
+    return provider
+
+
+class SharedTokenCredential:
+    """
+    A TokenCredential that serves plain single-scope token requests, as made by the
+    Azure SDK clients, from the shared token providers of a credential source. Tokens
+    fetched ahead of time (e.g. by `warm_up`) are then used by every client, and are
+    refreshed in the background. Other requests go to the shared base credential.
+
+    Attributes:
+        settings (AzureCredentialSettings): The credential settings.
+    """
+
+    def __init__(self, settings: AzureCredentialSettings):
+        self.settings = settings
+
+    def get_token(
+        self,
+        *scopes: str,
+        claims: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AccessToken:
+        if len(scopes) == 1 and claims is None and tenant_id is None and not kwargs:
+            return get_token_provider(self.settings, scopes[0]).get_token()
+        return get_base_credential(self.settings).get_token(
+            *scopes, claims=claims, tenant_id=tenant_id, **kwargs
+        )
+
+    def close(self) -> None:
+        """Shared credentials are closed with `close_credentials`."""
+
+
+def close_credentials() -> None:
+    """
+    Close all shared credentials and token providers and forget them, so the next
+    `get_base_credential` call creates fresh ones.
+    """
+    with _lock:
+        credentials = list(_credentials.values())
+        providers = list(_token_providers.values())
+        _credentials.clear()
+        _token_providers.clear()
+    for provider in providers:
+        provider.close()
+    for credential in credentials:
+        credential.close()
+
+
+def _registry_key(settings: AzureCredentialSettings) -> RegistryKey:
+    return (
+        settings.source,
+        settings.persistent_cache,
+        settings.cache_path,
+        settings.allow_unencrypted_cache,
+    )
+
+
+def _create_credential(settings: AzureCredentialSettings) -> BaseCredential:
+    credential: BaseCredential
+
+    match settings.source:
+        case CredentialSource.CLI:
+            credential = AzureCliCredential()
+        case CredentialSource.DEFAULT:
+            credential = DefaultAzureCredential()
+        case _:
+            raise ValueError("Invalid value for credential source.")
+
+    if settings.persistent_cache:
+        cache = PersistentTokenCache(
+            settings.cache_path, allow_unencrypted=settings.allow_unencrypted_cache
+        )
+        credential = PersistentlyCachedCredential(credential, settings.source, cache)
+
+    return credential
+
+
+def _reset_after_fork() -> None:
+    # credentials hold HTTP sessions that must not be shared with a forked child
+    global _lock
+    _lock = threading.Lock()
+    _credentials.clear()
+    _token_providers.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
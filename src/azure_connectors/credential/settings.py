@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -16,9 +19,20 @@ class AzureCredentialSettings(BaseSettings):
     Attributes:
         source (CredentialSource): The source of the credentials, either "cli" or "default".
         scope (CredentialScope): The scope of the credentials.
+        persistent_cache (bool): Whether to share tokens between processes through an
+            encrypted file (see `PersistentTokenCache`).
+        cache_path (Optional[Path]): The token cache file, if not the default.
+        allow_unencrypted_cache (bool): Whether to fall back to a user-only plain file
+            where encrypted storage is unavailable.
+        subscription_id (Optional[str]): The subscription ID to use, instead of looking
+            up the credential's first subscription.
     """
 
     model_config = get_settings_config(EnvPrefix.AZURE_CREDENTIAL)
 
     source: CredentialSource = Field(default=None)
     scope: CredentialScope = Field(default=None)
+    persistent_cache: bool = Field(default=False)
+    cache_path: Optional[Path] = Field(default=None)
+    allow_unencrypted_cache: bool = Field(default=False)
+    subscription_id: Optional[str] = Field(default=None)
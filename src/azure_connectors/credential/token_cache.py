@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from azure.core.credentials import AccessToken, TokenCredential
+from msal_extensions import (CrossPlatLock, FilePersistence,
+                             build_encrypted_persistence)
+from msal_extensions.persistence import PersistenceNotFound
+
+from .enums import CredentialSource
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH: Path = Path.home() / ".azure_connectors" / "token_cache.bin"
+# cached tokens closer to expiry than this are treated as expired
+DEFAULT_MIN_VALIDITY_SECONDS: float = 5 * 60
+
+
+class PersistentTokenCache:
+    """
+    A token cache stored in one file shared by every process of the user, so that
+    concurrent workers fetch each token once instead of once per process (for
+    `CredentialSource.CLI`, each fetch starts an `az` subprocess).
+
+    The file is encrypted with the OS's user-scoped secret store (DPAPI on Windows,
+    the Keychain on macOS, libsecret on Linux). Where that is unavailable (e.g. a
+    headless Linux container), `allow_unencrypted=True` falls back, with a logged
+    warning, to a plain file created readable only by the user.
+
+    A miss takes a cross-process file lock before fetching, so workers starting
+    together wait for the first one's token rather than all fetching their own.
+
+    Attributes:
+        path (Path): The cache file; its lock file is `<path>.lock`.
+        min_validity (float): The remaining lifetime, in seconds, below which a cached
+            token is not used.
+
+    Raises:
+        RuntimeError: If encryption is unavailable and `allow_unencrypted` is False.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        allow_unencrypted: bool = False,
+        min_validity: float = DEFAULT_MIN_VALIDITY_SECONDS,
+    ):
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.min_validity = min_validity
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._persistence = build_encrypted_persistence(str(self.path))
+        except Exception as e:
+            if not allow_unencrypted:
+                raise RuntimeError(
+                    "Encrypted token cache storage is unavailable; "
+                    "set allow_unencrypted to store tokens in a user-only file."
+                ) from e
+            logger.warning(
+                "Encrypted token cache storage is unavailable (%r); storing tokens "
+                "unencrypted in %s, readable only by the current user.",
+                e,
+                self.path,
+            )
+            _create_user_only_file(self.path)
+            self._persistence = FilePersistence(str(self.path))
+        self._lock_path = f"{self.path}.lock"
+        self._memory: dict[str, AccessToken] = {}
+        self._memory_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[AccessToken]:
+        """Get the cached token for `key`, or None if missing or about to expire."""
+        with self._memory_lock:
+            token = self._memory.get(key)
+        if token is not None and self._is_valid(token):
+            return token
+        token = self._load().get(key)
+        if token is None or not self._is_valid(token):
+            return None
+        with self._memory_lock:
+            self._memory[key] = token
+        return token
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], AccessToken]) -> AccessToken:
+        """
+        Get the cached token for `key`, or call `fetch` and store its token. Only one
+        process at a time fetches.
+        """
+        token = self.get(key)
+        if token is not None:
+            return token
+        with CrossPlatLock(self._lock_path):
+            # another process may have fetched it while we waited for the lock
+            token = self.get(key)
+            if token is not None:
+                return token
+            token = fetch()
+            tokens = self._load()
+            tokens[key] = token
+            now = time.time()
+            self._save({k: t for k, t in tokens.items() if t.expires_on > now})
+        with self._memory_lock:
+            self._memory[key] = token
+        return token
+
+    def clear(self) -> None:
+        """Forget every cached token."""
+        with CrossPlatLock(self._lock_path):
+            self._save({})
+        with self._memory_lock:
+            self._memory.clear()
+
+    def _is_valid(self, token: AccessToken) -> bool:
+        return token.expires_on - time.time() > self.min_validity
+
+    def _load(self) -> dict[str, AccessToken]:
+        try:
+            content = json.loads(self._persistence.load() or "{}")
+        except (PersistenceNotFound, FileNotFoundError, ValueError):
+            return {}
+        return {key: AccessToken(*value) for key, value in content.items()}
+
+    def _save(self, tokens: dict[str, AccessToken]) -> None:
+        content = {key: [t.token, t.expires_on] for key, t in tokens.items()}
+        self._persistence.save(json.dumps(content))
+
+
+def _create_user_only_file(path: Path) -> None:
+    """
+    Create `path` with mode 0o600 (or restrict an existing file to it) before any token
+    is written, so the plaintext cache is never readable by other users, even briefly.
+    `FilePersistence` truncates and rewrites the file in place, keeping its mode.
+    """
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+    if os.name != "nt":
+        os.chmod(path, 0o600)
+
+
+class PersistentlyCachedCredential:
+    """
+    Wraps a credential so that its tokens are shared through a `PersistentTokenCache`,
+    keyed by credential source and scope. Requests with claims or for a specific
+    tenant bypass the cache.
+
+    Attributes:
+        credential (TokenCredential): The credential tokens are fetched from on a miss.
+        source (CredentialSource): The source of `credential`, part of the cache key.
+        cache (PersistentTokenCache): The cache.
+    """
+
+    def __init__(
+        self,
+        credential: TokenCredential,
+        source: CredentialSource,
+        cache: PersistentTokenCache,
+    ):
+        self.credential = credential
+        self.source = source
+        self.cache = cache
+
+    def get_token(
+        self,
+        *scopes: str,
+        claims: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AccessToken:
+        if claims is not None or tenant_id is not None:
+            return self.credential.get_token(
+                *scopes, claims=claims, tenant_id=tenant_id, **kwargs
+            )
+        key = f"{self.source.value} {' '.join(sorted(scopes))}"
+        return self.cache.get_or_fetch(
+            key, lambda: self.credential.get_token(*scopes, **kwargs)
+        )
+
+    def close(self) -> None:
+        self.credential.close()  # type: ignore[attr-defined]
@@ -0,0 +1,155 @@
+import os
+import struct
+import threading
+import time
+import weakref
+from typing import Optional
+
+from azure.core.credentials import AccessToken
+
+from .typing import BaseCredential
+
+DEFAULT_REFRESH_MARGIN_SECONDS: float = 5 * 60
+DEFAULT_RETRY_INTERVAL_SECONDS: float = 30.0
+
+
+def pack_token(token: str) -> bytes:
+    """
+    Pack an access token into the length-prefixed UTF-16-LE structure that the SQL
+    Server ODBC drivers expect for SQL_COPT_SS_ACCESS_TOKEN.
+    """
+    token_bytes = token.encode("UTF-16-LE")
+    return struct.pack(f"<I{len(token_bytes)}s", len(token_bytes), token_bytes)
+
+
+class TokenProvider:
+    """
+    Keeps a current access token for one credential and scope.
+
+    The first request fetches a token; after that, a background thread replaces it
+    `refresh_margin` seconds before it expires, so callers are handed the current token
+    without waiting on the identity provider. A failed refresh is retried every
+    `retry_interval` seconds while the current token is still valid. Only if it has
+    expired (e.g. every refresh failed, or the process was suspended) does a caller
+    fetch a new token synchronously.
+
+    Attributes:
+        credential (BaseCredential): The credential tokens are requested from.
+        scope (str): The scope tokens are requested for.
+        refresh_margin (float): How long before expiry to refresh, in seconds.
+        retry_interval (float): How long to wait after a failed refresh, in seconds.
+    """
+
+    def __init__(
+        self,
+        credential: BaseCredential,
+        scope: str,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN_SECONDS,
+        retry_interval: float = DEFAULT_RETRY_INTERVAL_SECONDS,
+    ):
+        self.credential = credential
+        self.scope = scope
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        # (token, packed token), replaced as a whole so readers need no lock
+        self._current: Optional[tuple[AccessToken, bytes]] = None
+        self._next_refresh_at = 0.0
+        self._closed = False
+        self._start_refresher()
+
+    def get_token(self) -> AccessToken:
+        """
+        Get the current access token, fetching one only if there is no valid token.
+
+        Raises:
+            RuntimeError: If a token had to be fetched, and that failed.
+        """
+        return self._valid()[0]
+
+    def packed_token(self) -> bytes:
+        """Get the current access token packed for the ODBC drivers (see `pack_token`)."""
+        return self._valid()[1]
+
+    def refresh(self) -> AccessToken:
+        """
+        Fetch a new token now, replacing the current one.
+
+        Raises:
+            RuntimeError: If the token could not be obtained.
+        """
+        with self._lock:
+            return self._fetch()[0]
+
+    def close(self) -> None:
+        """Stop the background refresh."""
+        self._closed = True
+        self._wakeup.set()
+
+    def _valid(self) -> tuple[AccessToken, bytes]:
+        if os.getpid() != self._pid:
+            # the refresh thread does not survive a fork
+            self._start_refresher()
+        current = self._current
+        if current is None or current[0].expires_on <= time.time():
+            with self._lock:
+                current = self._current
+                if current is None or current[0].expires_on <= time.time():
+                    current = self._fetch()
+        return current
+
+    def _fetch(self) -> tuple[AccessToken, bytes]:
+        try:
+            token = self.credential.get_token(self.scope)
+        except Exception as e:
+            self._next_refresh_at = time.time() + self.retry_interval
+            raise RuntimeError("Failed to obtain Azure AD / Entra ID token") from e
+        current = (token, pack_token(token.token))
+        self._current = current
+        now = time.time()
+        # short-lived tokens are refreshed halfway through their remaining lifetime
+        self._next_refresh_at = max(
+            token.expires_on - self.refresh_margin,
+            now + (token.expires_on - now) / 2,
+        )
+        self._wakeup.set()
+        return current
+
+    def _start_refresher(self) -> None:
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        thread = threading.Thread(
+            target=_refresh_loop,
+            args=(weakref.ref(self), self._wakeup),
+            name=f"token-refresh-{self.scope}",
+            daemon=True,
+        )
+        thread.start()
+
+
+def _refresh_loop(ref: "weakref.ref[TokenProvider]", wakeup: threading.Event) -> None:
+    # holds the provider only weakly between refreshes, so an unused provider (and
+    # this thread) can be garbage collected
+    while True:
+        provider = ref()
+        if provider is None or provider._closed or provider._wakeup is not wakeup:
+            return
+        if provider._current is None:
+            delay = None
+        else:
+            delay = max(provider._next_refresh_at - time.time(), 0.0)
+        del provider
+
+        # wake up at least once a minute to notice a collected provider
+        wakeup.wait(60.0 if delay is None else min(delay, 60.0))
+        wakeup.clear()
+
+        provider = ref()
+        if provider is None or provider._closed or provider._wakeup is not wakeup:
+            return
+        if provider._current is not None and time.time() >= provider._next_refresh_at:
+            try:
+                provider.refresh()
+            except RuntimeError:
+                pass  # retried after retry_interval; callers still hold a valid token
+        del provider
@@ -1,3 +1,7 @@
 from azure.identity import AzureCliCredential, DefaultAzureCredential
 
-BaseCredential = DefaultAzureCredential | AzureCliCredential
+from .token_cache import PersistentlyCachedCredential
+
+BaseCredential = (
+    DefaultAzureCredential | AzureCliCredential | PersistentlyCachedCredential
+)
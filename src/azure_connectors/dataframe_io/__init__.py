@@ -1,4 +1,30 @@
-from .read import read_df
+from .blob_export import BlobExportResult, export_parquet_to_blob
+from .metrics import ChunkEvent, IOObserver, MetricsAggregator
+from .partitioned_read import read_df_partitioned
+from .read import read_df, read_df_arrow
+from .result_cache import ResultCache
+from .scan import scan_sql
+from .schema_resolver import resolve_schema
+from .sync import SyncResult, sync_parquet_snapshot
+from .table_stats import TableStats, get_table_stats
 from .write import write_df, write_df_from_sqltable
 
-__all__ = ["read_df", "write_df", "write_df_from_sqltable"]
+__all__ = [
+    "BlobExportResult",
+    "ChunkEvent",
+    "IOObserver",
+    "MetricsAggregator",
+    "ResultCache",
+    "SyncResult",
+    "TableStats",
+    "export_parquet_to_blob",
+    "read_df",
+    "read_df_arrow",
+    "read_df_partitioned",
+    "resolve_schema",
+    "scan_sql",
+    "get_table_stats",
+    "sync_parquet_snapshot",
+    "write_df",
+    "write_df_from_sqltable",
+]
@@ -0,0 +1,191 @@
+import io
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Literal
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlalchemy
+from azure.storage.blob import BlobBlock, ContentSettings
+from azure.storage.blob import BlobClient as AzBlobClient
+
+from azure_connectors.azure_blob import BlobClient
+
+from . import dataframe_io_config
+from .metrics import IOObserver
+from .read import read_df
+
+ParquetCompression = Literal["zstd", "snappy", "gzip", "lz4", "none"]
+
+
+@dataclass(frozen=True)
+class BlobExportResult:
+    """
+    The outcome of `export_parquet_to_blob`.
+
+    Attributes:
+        rows (int): The number of rows written.
+        bytes (int): The size of the committed Parquet blob.
+        blocks (int): The number of blocks it was staged in.
+        row_groups (int): The number of Parquet row groups.
+    """
+
+    rows: int
+    bytes: int
+    blocks: int
+    row_groups: int
+
+
+def export_parquet_to_blob(
+    query: str,
+    blob_client: AzBlobClient | None = None,
+    blob_name: str | None = None,
+    engine: sqlalchemy.Engine | None = None,
+    batch_size: int = dataframe_io_config.DEFAULT_STREAM_BATCH_SIZE,
+    block_size: int = dataframe_io_config.DEFAULT_BLOB_BLOCK_BYTES,
+    max_concurrency: int = dataframe_io_config.DEFAULT_BLOB_UPLOAD_CONCURRENCY,
+    compression: ParquetCompression = "zstd",
+    schema_overrides: pl.Schema | None = None,
+    backend: Literal["sqlalchemy", "arrow"] = "sqlalchemy",
+    observer: IOObserver | None = None,
+) -> BlobExportResult:
+    """
+    Run `query` and write its result to a Parquet blob without holding the result in
+    memory or on local disk.
+
+    Each batch of `batch_size` rows read by `read_df(iter_batches=True)` is encoded as
+    one Parquet row group, and the encoded bytes are uploaded as staged blocks of
+    `block_size` bytes, `max_concurrency` at a time. The blob is only committed (and
+    replaces any existing blob) once the whole result is written, so a failed export
+    leaves the old blob in place; its staged blocks are discarded by the service.
+
+    The three stages overlap: the query is fetched on a background thread (see
+    `read_df`'s `prefetch_depth`), and blocks upload on a thread pool while the next
+    batch is encoded. Memory stays bounded by about one batch plus
+    `max_concurrency + 1` blocks.
+
+    `blob_client` defaults to `BlobClient.from_env(blob_name=blob_name)`, i.e. the
+    "AZURE_BLOB_" settings. The Parquet schema is taken from the first batch; pass
+    `schema_overrides` for columns that may be all NULL in it.
+
+    Raises:
+        ValueError: If `block_size` is not positive.
+    """
+    if block_size <= 0:
+        raise ValueError(f"{block_size=} must be positive.")
+    if blob_client is None:
+        blob_kwargs = {} if blob_name is None else {"blob_name": blob_name}
+        blob_client = BlobClient.from_env(**blob_kwargs)
+
+    batches = read_df(
+        query,
+        engine=engine,
+        iter_batches=True,
+        batch_size=batch_size,
+        schema_overrides=schema_overrides,
+        backend=backend,
+        observer=observer,
+    )
+    rows = row_groups = 0
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        sink = _BlockStager(blob_client, executor, block_size, max_concurrency)
+        writer: pq.ParquetWriter | None = None
+        try:
+            for batch in batches:
+                table = batch.to_arrow()
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        sink, table.schema, compression=compression
+                    )
+                elif table.schema != writer.schema:
+                    table = table.cast(writer.schema)
+                writer.write_table(table, row_group_size=table.num_rows)
+                rows += table.num_rows
+                row_groups += 1
+            if writer is None:
+                # an empty result still gets a valid Parquet file, with no columns
+                writer = pq.ParquetWriter(sink, pa.schema([]), compression=compression)
+            writer.close()
+            block_ids = sink.finish()
+        finally:
+            batches.close()  # type: ignore[attr-defined]
+            sink.abort()
+
+    blob_client.commit_block_list(
+        [BlobBlock(block_id) for block_id in block_ids],
+        content_settings=ContentSettings(content_type="application/vnd.apache.parquet"),
+    )
+    return BlobExportResult(
+        rows=rows, bytes=sink.position, blocks=len(block_ids), row_groups=row_groups
+    )
+
+
+class _BlockStager(io.RawIOBase):
+    """
+    A write-only file that uploads what is written to it as staged blocks.
+
+    Full blocks are handed to `executor`; writes block while `max_pending` uploads are
+    in flight, which bounds memory and surfaces upload errors early.
+    """
+
+    def __init__(
+        self,
+        blob_client: AzBlobClient,
+        executor: ThreadPoolExecutor,
+        block_size: int,
+        max_pending: int,
+    ):
+        self.blob_client = blob_client
+        self.executor = executor
+        self.block_size = block_size
+        self.max_pending = max_pending
+        self.position = 0
+        self.block_ids: list[str] = []
+        self._buffer = bytearray()
+        self._pending: list[Future] = []
+        # block ids must all have the same length; a fresh prefix per export keeps
+        # blocks of a concurrent or abandoned export of the same blob apart
+        self._prefix = uuid.uuid4().hex[:16]
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._buffer += data
+        self.position += len(data)
+        while len(self._buffer) >= self.block_size:
+            self._stage(bytes(self._buffer[: self.block_size]))
+            del self._buffer[: self.block_size]
+        return len(data)
+
+    def finish(self) -> list[str]:
+        """Stage the remaining bytes, wait for all uploads, and return the block ids."""
+        if self._buffer or not self.block_ids:
+            self._stage(bytes(self._buffer))
+            self._buffer.clear()
+        for future in self._pending:
+            future.result()
+        self._pending.clear()
+        return self.block_ids
+
+    def abort(self) -> None:
+        """Stop waiting on uploads still queued, e.g. after a failure."""
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+
+    def _stage(self, block: bytes) -> None:
+        block_id = f"{self._prefix}-{len(self.block_ids):08d}"
+        self.block_ids.append(block_id)
+        self._pending.append(
+            self.executor.submit(
+                self.blob_client.stage_block, block_id, block, length=len(block)
+            )
+        )
+        while len(self._pending) > self.max_pending:
+            self._pending.pop(0).result()
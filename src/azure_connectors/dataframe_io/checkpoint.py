@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class ChunkLedger:
+    """
+    Records which chunks of a chunked write have been committed, so that a failed
+    load can be resumed by skipping exactly those chunks.
+
+    Chunk `i` is the slice `df[i * chunk_size : (i + 1) * chunk_size]`, so a ledger is
+    only meaningful for the same frame written with the same `chunk_size`; `load`
+    refuses to reuse a ledger recorded for a different shape.
+
+    Attributes:
+        table_name (str): The table being written.
+        chunk_size (int): The chunk size the ledger was recorded with.
+        n_rows (int): The number of rows in the frame being written.
+        path (Path | None): Where the ledger is persisted. If None, it is kept in memory only.
+        committed (set[int]): Indices of committed chunks.
+    """
+
+    table_name: str
+    chunk_size: int
+    n_rows: int
+    path: Path | None = None
+    committed: set[int] = field(default_factory=set)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _contiguous: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self._advance_contiguous()
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path | None,
+        table_name: str,
+        chunk_size: int,
+        n_rows: int,
+    ) -> "ChunkLedger":
+        """
+        Load the ledger at `path` if it exists, or start an empty one.
+
+        Raises:
+            ValueError: If the stored ledger was recorded for a different table, chunk size or row count.
+        """
+        if path is None:
+            return cls(table_name=table_name, chunk_size=chunk_size, n_rows=n_rows)
+
+        path = Path(path)
+        if not path.exists():
+            return cls(
+                table_name=table_name, chunk_size=chunk_size, n_rows=n_rows, path=path
+            )
+
+        stored = json.loads(path.read_text())
+        expected = {"table_name": table_name, "chunk_size": chunk_size, "n_rows": n_rows}
+        mismatched = {k: stored.get(k) for k, v in expected.items() if stored.get(k) != v}
+        if mismatched:
+            raise ValueError(
+                f"Checkpoint {path} does not match this write: {mismatched=}, {expected=}"
+            )
+        return cls(
+            table_name=table_name,
+            chunk_size=chunk_size,
+            n_rows=n_rows,
+            path=path,
+            committed=set(range(stored["contiguous_committed"]))
+            | set(stored["committed_out_of_order"]),
+        )
+
+    @property
+    def contiguous_committed(self) -> int:
+        """The number of chunks committed without gaps from chunk 0."""
+        return self._contiguous
+
+    def is_committed(self, chunk_index: int) -> bool:
+        return chunk_index in self.committed
+
+    def mark_committed(self, chunk_index: int) -> None:
+        """Record `chunk_index` as committed and persist the ledger. Thread-safe."""
+        with self._lock:
+            self.committed.add(chunk_index)
+            self._advance_contiguous()
+            self._save()
+
+    def _advance_contiguous(self) -> None:
+        while self._contiguous in self.committed:
+            self._contiguous += 1
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        # store the gap-free prefix as a count, so the file stays small on long loads
+        contiguous = self.contiguous_committed
+        content = {
+            "table_name": self.table_name,
+            "chunk_size": self.chunk_size,
+            "n_rows": self.n_rows,
+            "contiguous_committed": contiguous,
+            "committed_out_of_order": sorted(i for i in self.committed if i > contiguous),
+        }
+        # write-then-rename so a crash mid-write never leaves a truncated ledger
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(content))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,125 @@
+from typing import Iterator, Literal
+
+import polars as pl
+
+from . import dataframe_io_config
+
+ChunkSize = int | Literal["auto"]
+
+
+def max_rows_for_parameter_limit(n_columns: int) -> int:
+    """
+    The most rows a single multi-row `INSERT ... VALUES` can carry without exceeding
+    SQL Server's limit on parameters per statement (one parameter per cell).
+    """
+    # leave one parameter of headroom; the limit is inclusive of driver-added parameters
+    return max(1, (dataframe_io_config.SQL_SERVER_MAX_PARAMETERS - 1) // max(1, n_columns))
+
+
+def initial_chunk_size(df: pl.DataFrame, parameter_limited: bool = False) -> int:
+    """
+    Derive a starting chunk size from the estimated in-memory width of a row, aiming
+    for chunks of about `AUTO_CHUNK_TARGET_BYTES`.
+
+    Args:
+        df (pl.DataFrame): The frame to be written.
+        parameter_limited (bool): Whether each chunk is sent as one multi-row statement
+            (pandas `method="multi"`), which caps the chunk at the parameter limit.
+
+    Returns:
+        int: The chunk size, in rows.
+    """
+    row_bytes = max(1.0, df.estimated_size() / max(1, df.shape[0]))
+    rows = int(dataframe_io_config.AUTO_CHUNK_TARGET_BYTES / row_bytes)
+    rows = min(
+        max(rows, dataframe_io_config.AUTO_CHUNK_MIN_ROWS),
+        dataframe_io_config.AUTO_CHUNK_MAX_ROWS,
+    )
+    if parameter_limited:
+        rows = min(rows, max_rows_for_parameter_limit(df.shape[1]))
+    return rows
+
+
+class AdaptiveChunkSizer:
+    """
+    Adjusts the chunk size of a sequential write from the measured latency and
+    throughput of each chunk.
+
+    Chunks faster than the target window are doubled, as long as doubling keeps
+    improving rows/s; chunks slower than the window are halved. A growth step that
+    lowers throughput is rolled back, and the size is then held there.
+
+    Attributes:
+        chunk_size (int): The size, in rows, to use for the next chunk.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_rows: int = dataframe_io_config.AUTO_CHUNK_MIN_ROWS,
+        max_rows: int = dataframe_io_config.AUTO_CHUNK_MAX_ROWS,
+        target_seconds: tuple[float, float] = dataframe_io_config.AUTO_CHUNK_TARGET_SECONDS,
+        tolerance: float = 0.1,
+    ):
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.target_seconds = target_seconds
+        self.tolerance = tolerance
+        self.chunk_size = self._clamp(initial)
+        self._previous_size: int | None = None
+        self._previous_throughput: float | None = None
+        self._max_growth_size: int = max_rows
+
+    @classmethod
+    def for_df(cls, df: pl.DataFrame) -> "AdaptiveChunkSizer":
+        return cls(initial=initial_chunk_size(df))
+
+    def record(self, n_rows: int, seconds: float) -> None:
+        """Record that a chunk of `n_rows` took `seconds` to write, and resize."""
+        if n_rows < self.chunk_size:
+            # a short final chunk says nothing about the chosen size
+            return
+
+        throughput = n_rows / max(seconds, 1e-9)
+        min_seconds, max_seconds = self.target_seconds
+        grew = self._previous_size is not None and self.chunk_size > self._previous_size
+
+        if (
+            grew
+            and self._previous_throughput is not None
+            and throughput < self._previous_throughput * (1 - self.tolerance)
+        ):
+            # growing hurt: go back, and don't grow past here again
+            self._max_growth_size = self._previous_size  # type: ignore[assignment]
+            new_size = self._previous_size
+        elif seconds > max_seconds:
+            new_size = self.chunk_size // 2
+        elif seconds < min_seconds:
+            new_size = min(self.chunk_size * 2, self._max_growth_size)
+        else:
+            new_size = self.chunk_size
+
+        self._previous_size = self.chunk_size
+        self._previous_throughput = throughput
+        self.chunk_size = self._clamp(new_size)  # type: ignore[arg-type]
+
+    def _clamp(self, size: int) -> int:
+        return min(max(size, self.min_rows), self.max_rows)
+
+
+def iter_chunks(
+    df: pl.DataFrame, chunk_size: int | AdaptiveChunkSizer
+) -> Iterator[pl.DataFrame]:
+    """
+    Iterate over zero-copy slices of `df`, either of a fixed size or of the size an
+    `AdaptiveChunkSizer` currently asks for.
+    """
+    if isinstance(chunk_size, int):
+        yield from df.iter_slices(chunk_size)
+        return
+
+    offset = 0
+    while offset < df.shape[0]:
+        chunk = df.slice(offset, chunk_size.chunk_size)
+        offset += chunk.shape[0]
+        yield chunk
@@ -1 +1,23 @@
 DEFAULT_WRITE_CHUNKSIZE: int = 1_000
+DEFAULT_MAX_WORKERS: int = 4
+DEFAULT_STREAM_BATCH_SIZE: int = 100_000
+DEFAULT_PREFETCH_DEPTH: int = 1
+DEFAULT_ARROW_FETCH_BATCH_SIZE: int = 65_536
+
+# "auto" chunk sizing
+SQL_SERVER_MAX_PARAMETERS: int = 2_100
+AUTO_CHUNK_TARGET_BYTES: int = 8 * 1024**2
+AUTO_CHUNK_MIN_ROWS: int = 100
+AUTO_CHUNK_MAX_ROWS: int = 200_000
+AUTO_CHUNK_TARGET_SECONDS: tuple[float, float] = (0.5, 2.0)
+
+# read_df result cache
+DEFAULT_CACHE_MAX_BYTES: int = 10 * 1024**3
+DEFAULT_CACHE_TTL_SECONDS: float = 24 * 60 * 60
+
+# table statistics
+DEFAULT_TABLE_STATS_MAX_AGE_SECONDS: float = 60.0
+
+# Parquet export to Blob storage
+DEFAULT_BLOB_BLOCK_BYTES: int = 8 * 1024**2
+DEFAULT_BLOB_UPLOAD_CONCURRENCY: int = 4
@@ -1,12 +1,23 @@
-from typing import Literal
+import logging
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, Literal
 
 import polars as pl
 import sqlalchemy
-from tqdm.auto import tqdm
 
-from azure_connectors.dataframe_io.utils import find_n_chunks
+from azure_connectors.dataframe_io.utils import (build_insert_sql,
+                                                 find_n_chunks,
+                                                 identity_insert_sql)
 
 from . import dataframe_io_config
+from .checkpoint import ChunkLedger
+from .chunk_sizing import (AdaptiveChunkSizer, iter_chunks,
+                           max_rows_for_parameter_limit)
+from .metrics import ChunkEvent, IOObserver, observing
+from .retry import RetryPolicy, chunk_committed
+
+logger = logging.getLogger(__name__)
 
 
 def pl_to_sql_via_pandas(
@@ -15,9 +26,24 @@ def pl_to_sql_via_pandas(
     if_table_exists: Literal["append", "replace", "fail"],
     engine: sqlalchemy.Engine,
     chunk_size: int = dataframe_io_config.DEFAULT_WRITE_CHUNKSIZE,
+    observer: IOObserver | None = None,
 ) -> None:
-    try:
-        df.to_pandas(use_pyarrow_extension_array=True).to_sql(
+    """
+    pandas writes all chunks in one call, so `observer` receives a single event for the
+    whole frame, with `fallback` set if the pyarrow-backed conversion failed and the
+    frame had to be converted (and sent) a second time.
+
+    pandas commits chunks as it goes, so a failed write cannot be replayed per chunk and
+    transient errors are not retried here.
+    """
+    # method="multi" sends each chunk as one statement with a parameter per cell
+    chunk_size = min(chunk_size, max_rows_for_parameter_limit(df.shape[1]))
+
+    def to_sql(use_pyarrow_extension_array: bool) -> tuple[float, float]:
+        start = time.perf_counter()
+        pd_df = df.to_pandas(use_pyarrow_extension_array=use_pyarrow_extension_array)
+        encoded = time.perf_counter()
+        pd_df.to_sql(
             con=engine,
             name=table_name,
             if_exists=if_table_exists,
@@ -25,15 +51,33 @@ def pl_to_sql_via_pandas(
             index=False,
             chunksize=chunk_size,
         )
-    except Exception as e:
-        print("Failed writing to df when using pyarrow to convert pl --> pd:", e)
-        df.to_pandas(use_pyarrow_extension_array=False).to_sql(
-            con=engine,
-            name=table_name,
-            if_exists=if_table_exists,
-            method="multi",
-            index=False,
-            chunksize=chunk_size,
+        return encoded - start, time.perf_counter() - encoded
+
+    with observing(observer, total_rows=df.shape[0]) as obs:
+        event_kwargs: dict[str, Any] = dict(
+            operation="write",
+            method="pl_to_sql_via_pandas",
+            chunk_index=0,
+            rows=df.shape[0],
+            bytes=df.estimated_size(),
+        )
+        fallback: str | None = None
+        try:
+            try:
+                encode_seconds, execute_seconds = to_sql(True)
+            except Exception as e:
+                fallback = f"use_pyarrow_extension_array=False after {e!r}"
+                encode_seconds, execute_seconds = to_sql(False)
+        except Exception as e:
+            obs.on_chunk(ChunkEvent(**event_kwargs, fallback=fallback, error=e))
+            raise e
+        obs.on_chunk(
+            ChunkEvent(
+                **event_kwargs,
+                encode_seconds=encode_seconds,
+                execute_seconds=execute_seconds,
+                fallback=fallback,
+            )
         )
 
 
@@ -41,22 +85,368 @@ def pl_to_sql_row_by_row(
     df: pl.DataFrame,
     table: sqlalchemy.Table,
     engine: sqlalchemy.Engine,
-    chunk_size: int = dataframe_io_config.DEFAULT_WRITE_CHUNKSIZE,
+    chunk_size: int | AdaptiveChunkSizer = dataframe_io_config.DEFAULT_WRITE_CHUNKSIZE,
+    observer: IOObserver | None = None,
+    retry_policy: RetryPolicy | None = RetryPolicy(),
 ) -> None:
+    """
+    Pass an `AdaptiveChunkSizer` as `chunk_size` to resize chunks as the write proceeds.
+
+    A chunk failing with a transient error is replayed on a fresh pooled connection
+    according to `retry_policy` (None disables retries), unless its primary key shows
+    it was committed after all. That probe is part of the retried attempt, so a probe
+    failing transiently (e.g. mid-failover) backs off and tries again.
+    """
     insert_statement = sqlalchemy.insert(table)
+    can_retry = retry_policy is not None and _has_primary_key(table, df)
+
+    with observing(observer, df.shape[0]) as obs:
+        conn: sqlalchemy.Connection | None = engine.connect()
+        try:
+            for i, chunk in enumerate(iter_chunks(df, chunk_size)):
+                timer = _ChunkTimer()
+                attempt = 0
+                while True:
+                    try:
+                        if attempt > 0:
+                            committed = chunk_committed(chunk, table, engine)
+                            timer.skip()
+                            if committed:
+                                break
+                        if conn is None:
+                            conn = engine.connect()
+                        params = chunk.rows(named=True)
+                        timer.lap("encode")
+                        conn.execute(insert_statement, params)
+                        timer.lap("execute")
+                        conn.commit()
+                        timer.lap("commit")
+                        break
+                    except Exception as e:
+                        if conn is not None:
+                            conn.invalidate()
+                            conn.close()
+                            conn = None
+                        if not (can_retry and retry_policy.should_retry(e, attempt)):  # type: ignore[union-attr]
+                            obs.on_chunk(
+                                timer.event(
+                                    "pl_to_sql_row_by_row", i, chunk, attempt, error=e
+                                )
+                            )
+                            raise e
+                        time.sleep(retry_policy.delay(attempt))  # type: ignore[union-attr]
+                        timer.skip()
+                        attempt += 1
+                obs.on_chunk(timer.event("pl_to_sql_row_by_row", i, chunk, attempt))
+                if isinstance(chunk_size, AdaptiveChunkSizer):
+                    chunk_size.record(chunk.shape[0], timer.total)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def pl_to_sql_fast_executemany(
+    df: pl.DataFrame,
+    table: sqlalchemy.Table,
+    engine: sqlalchemy.Engine,
+    chunk_size: int | AdaptiveChunkSizer = dataframe_io_config.DEFAULT_WRITE_CHUNKSIZE,
+    observer: IOObserver | None = None,
+    retry_policy: RetryPolicy | None = RetryPolicy(),
+) -> None:
+    """
+    Insert `df` into `table` through a raw pyodbc cursor with `fast_executemany`.
+
+    Unlike `pl_to_sql_row_by_row`, no dict is built per row and no SQLAlchemy statement
+    is compiled per chunk: each chunk is handed to pyodbc as one plain tuple per row
+    (`DataFrame.rows()`), which pyodbc copies into its parameter arrays and sends to
+    the server in a single round trip.
+
+    Timezone-aware datetimes, Duration, List, Array, Struct and Object columns cannot be
+    bound and raise a ValueError before anything is written; cast them first (e.g.
+    `dt.replace_time_zone(None)`, or to strings).
+
+    Explicit values for an IDENTITY column (see `get_identity_column`) are inserted with
+    `IDENTITY_INSERT` switched on for the session, as SQLAlchemy does for
+    `pl_to_sql_row_by_row`; a session that fails with it on is not returned to the pool.
+
+    Pass an `AdaptiveChunkSizer` as `chunk_size` to resize chunks as the write proceeds.
+    Transient failures are retried per chunk as in `pl_to_sql_row_by_row`.
+    """
+    columns: list[str] = [col.name for col in table.columns if col.name in df.columns]
+    df = _cast_for_executemany(df.select(columns))
+    writer = _RawChunkWriter(table, columns, engine, retry_policy)
+
+    try:
+        with observing(observer, df.shape[0]) as obs:
+            for i, chunk in enumerate(iter_chunks(df, chunk_size)):
+                timer = _ChunkTimer()
+                try:
+                    retries = writer.write(chunk, timer)
+                except _ChunkFailed as e:
+                    obs.on_chunk(
+                        timer.event(
+                            "pl_to_sql_fast_executemany", i, chunk, e.retries, e.error
+                        )
+                    )
+                    raise e.error
+                obs.on_chunk(
+                    timer.event("pl_to_sql_fast_executemany", i, chunk, retries)
+                )
+                if isinstance(chunk_size, AdaptiveChunkSizer):
+                    chunk_size.record(chunk.shape[0], timer.total)
+    finally:
+        writer.close()
+
+
+def pl_to_sql_parallel(
+    df: pl.DataFrame,
+    table: sqlalchemy.Table,
+    engine: sqlalchemy.Engine,
+    chunk_size: int = dataframe_io_config.DEFAULT_WRITE_CHUNKSIZE,
+    max_workers: int = dataframe_io_config.DEFAULT_MAX_WORKERS,
+    ledger: ChunkLedger | None = None,
+    observer: IOObserver | None = None,
+    retry_policy: RetryPolicy | None = RetryPolicy(),
+) -> ChunkLedger:
+    """
+    Insert `df` into `table` with up to `max_workers` concurrent sessions, each a pooled
+    connection from `engine` writing whole chunks with `fast_executemany`.
+
+    Every chunk is committed independently and recorded in `ledger`; chunks the ledger
+    already lists as committed are skipped, so re-running with the same ledger after a
+    failure writes exactly the missing chunks. Transient failures are retried per chunk
+    as in `pl_to_sql_row_by_row`; on the first other failure, pending chunks are
+    cancelled, in-flight chunks are allowed to finish, and the exception is re-raised.
+
+    Note: `max_workers` should not exceed the engine's pool capacity
+    (`pool_size + max_overflow`, 15 by default), or workers will queue for connections.
+
+    Returns:
+        ChunkLedger: The ledger, including the chunks committed by this call.
+    """
+    columns: list[str] = [col.name for col in table.columns if col.name in df.columns]
+    df = _cast_for_executemany(df.select(columns))
+
+    if ledger is None:
+        ledger = ChunkLedger(
+            table_name=table.name, chunk_size=chunk_size, n_rows=df.shape[0]
+        )
+
+    pending_chunks = [
+        (i, chunk)
+        for i, chunk in enumerate(df.iter_slices(chunk_size))
+        if not ledger.is_committed(i)
+    ]
+
+    def write_chunk(chunk_index: int, chunk: pl.DataFrame, obs: IOObserver) -> None:
+        timer = _ChunkTimer()
+        writer = _RawChunkWriter(table, columns, engine, retry_policy)
+        try:
+            retries = writer.write(chunk, timer)
+        except _ChunkFailed as e:
+            obs.on_chunk(
+                timer.event("pl_to_sql_parallel", chunk_index, chunk, e.retries, e.error)
+            )
+            raise e.error
+        finally:
+            writer.close()
+        ledger.mark_committed(chunk_index)
+        obs.on_chunk(timer.event("pl_to_sql_parallel", chunk_index, chunk, retries))
+
+    pending_rows = sum(chunk.shape[0] for _, chunk in pending_chunks)
+    with (
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+        observing(observer, pending_rows) as obs,
+    ):
+        futures = {
+            executor.submit(write_chunk, i, chunk, obs): i for i, chunk in pending_chunks
+        }
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        failed = [f for f in done if f.exception() is not None]
+        if failed:
+            executor.shutdown(wait=True, cancel_futures=True)
+            first_failed = min(failed, key=lambda f: futures[f])
+            # the failed chunk itself was reported to the observer
+            logger.error(
+                "`pl_to_sql_parallel` failed on chunk #%d. "
+                "%d of %d chunks are committed.",
+                futures[first_failed],
+                len(ledger.committed),
+                find_n_chunks(df, chunk_size),
+            )
+            raise first_failed.exception()  # type: ignore[misc]
+
+    return ledger
+
+
+class _ChunkTimer:
+    """Splits the time spent on one chunk into encode, execute and commit phases."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {"encode": 0.0, "execute": 0.0, "commit": 0.0}
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.seconds[phase] += now - self._last
+        self._last = now
+
+    def skip(self) -> None:
+        """Leave the time since the last lap, e.g. a backoff, out of every phase."""
+        self._last = time.perf_counter()
+
+    @property
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+    def event(
+        self,
+        method: str,
+        chunk_index: int,
+        chunk: pl.DataFrame,
+        retries: int = 0,
+        error: BaseException | None = None,
+    ) -> ChunkEvent:
+        return ChunkEvent(
+            operation="write",
+            method=method,
+            chunk_index=chunk_index,
+            rows=chunk.shape[0],
+            bytes=chunk.estimated_size(),
+            encode_seconds=self.seconds["encode"],
+            execute_seconds=self.seconds["execute"],
+            commit_seconds=self.seconds["commit"],
+            retries=retries,
+            error=error,
+        )
 
-    total_chunks: int = find_n_chunks(df, chunk_size=chunk_size)
 
-    with engine.connect() as conn:
-        for i, chunk in tqdm(
-            enumerate(df.iter_slices(chunk_size)),
-            total=total_chunks,
-        ):
+class _ChunkFailed(Exception):
+    def __init__(self, error: BaseException, retries: int):
+        self.error = error
+        self.retries = retries
+
+
+class _RawChunkWriter:
+    """
+    Writes chunks with `fast_executemany` on a pooled raw pyodbc connection, one
+    transaction per chunk.
+
+    A chunk failing with a transient error is replayed after a backoff on a fresh
+    connection (the failed one is invalidated rather than returned to the pool), unless
+    probing its primary key shows the chunk was committed before the error surfaced.
+    The probe is part of the retried attempt, so its transient failures are retried too.
+    """
+
+    def __init__(
+        self,
+        table: sqlalchemy.Table,
+        columns: list[str],
+        engine: sqlalchemy.Engine,
+        retry_policy: RetryPolicy | None,
+    ):
+        self.table = table
+        self.engine = engine
+        self.retry_policy = retry_policy
+        self.insert_sql = build_insert_sql(table, columns, engine.dialect)
+        self.identity_insert = identity_insert_sql(table, columns, engine.dialect)
+        primary_keys = [col.name for col in table.primary_key.columns]
+        self.can_retry = (
+            retry_policy is not None
+            and len(primary_keys) > 0
+            and all(key in columns for key in primary_keys)
+        )
+        self._raw_conn: Any = None
+        self._cursor: Any = None
+
+    def write(self, chunk: pl.DataFrame, timer: "_ChunkTimer") -> int:
+        """
+        Write and commit `chunk`.
+
+        Returns:
+            int: The number of retries it took.
+
+        Raises:
+            _ChunkFailed: Wrapping the error, if the chunk could not be written.
+        """
+        attempt = 0
+        while True:
             try:
-                conn.execute(insert_statement, chunk.rows(named=True))
-                conn.commit()
+                if attempt > 0:
+                    committed = chunk_committed(chunk, self.table, self.engine)
+                    timer.skip()
+                    if committed:
+                        return attempt
+                cursor = self._connect()
+                params = chunk.rows()
+                timer.lap("encode")
+                cursor.executemany(self.insert_sql, params)
+                timer.lap("execute")
+                self._raw_conn.commit()
+                timer.lap("commit")
+                return attempt
             except Exception as e:
-                print(
-                    f"`pl_to_sql_row_by_row` failed while executing {insert_statement} on chunk #{i}.\n{chunk=}"
-                )
-                raise e
+                self._discard()
+                if not (self.can_retry and self.retry_policy.should_retry(e, attempt)):  # type: ignore[union-attr]
+                    raise _ChunkFailed(e, attempt) from e
+                time.sleep(self.retry_policy.delay(attempt))  # type: ignore[union-attr]
+                timer.skip()
+                attempt += 1
+
+    def close(self) -> None:
+        if self._raw_conn is None:
+            return
+        try:
+            if self.identity_insert is not None:
+                self._cursor.execute(self.identity_insert[1])
+            self._cursor.close()
+        except Exception:
+            self._discard()
+            raise
+        self._raw_conn.close()
+        self._raw_conn = None
+
+    def _connect(self) -> Any:
+        if self._raw_conn is None:
+            self._raw_conn = self.engine.raw_connection()
+            self._cursor = self._raw_conn.cursor()
+            self._cursor.fast_executemany = True
+            if self.identity_insert is not None:
+                self._cursor.execute(self.identity_insert[0])
+        return self._cursor
+
+    def _discard(self) -> None:
+        # don't return a broken session, or one with IDENTITY_INSERT left ON, to the pool
+        if self._raw_conn is None:
+            return
+        self._raw_conn.invalidate()
+        self._raw_conn.close()
+        self._raw_conn = None
+
+
+def _has_primary_key(table: sqlalchemy.Table, df: pl.DataFrame) -> bool:
+    primary_keys = [col.name for col in table.primary_key.columns]
+    return len(primary_keys) > 0 and all(key in df.columns for key in primary_keys)
+
+
+def _cast_for_executemany(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Cast dtypes that pyodbc cannot bind (categoricals, enums) to plain strings, and
+    reject the ones it cannot bind at all.
+    """
+    unsupported = {
+        name: dtype
+        for name, dtype in df.schema.items()
+        if isinstance(dtype, (pl.Duration, pl.List, pl.Array, pl.Struct, pl.Object))
+        or (isinstance(dtype, pl.Datetime) and dtype.time_zone is not None)
+    }
+    if unsupported:
+        raise ValueError(
+            f"Columns with dtypes that pyodbc cannot insert: {unsupported}. Cast them "
+            "first, e.g. timezone-aware datetimes with `dt.replace_time_zone(None)`."
+        )
+    return df.with_columns(
+        pl.col(name).cast(pl.String)
+        for name, dtype in df.schema.items()
+        if isinstance(dtype, (pl.Categorical, pl.Enum))
+    )
@@ -0,0 +1,173 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Literal, Protocol, runtime_checkable
+
+from tqdm.auto import tqdm
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class ChunkEvent:
+    """
+    Timing and size of one chunk of a write (or one batch of a read).
+
+    Attributes:
+        operation (Literal["write", "read"]): Whether the chunk was written or read.
+        method (str): The insertion method or read path that produced the event.
+        chunk_index (int): The index of the chunk within its write or read.
+        rows (int): The number of rows in the chunk.
+        bytes (int): The estimated in-memory size of the chunk.
+        encode_seconds (float): Time spent converting the chunk to driver parameters.
+        execute_seconds (float): Time spent executing the statement on the server.
+        commit_seconds (float): Time spent committing.
+        retries (int): The number of times the chunk was retried before this outcome.
+        fallback (str | None): A slower fallback path taken for the chunk, if any.
+        error (BaseException | None): The exception the chunk failed with, if it did.
+        timestamp (float): `time.perf_counter()` when the chunk finished.
+    """
+
+    operation: Literal["write", "read"]
+    method: str
+    chunk_index: int
+    rows: int
+    bytes: int
+    encode_seconds: float = 0.0
+    execute_seconds: float = 0.0
+    commit_seconds: float = 0.0
+    retries: int = 0
+    fallback: str | None = None
+    error: BaseException | None = None
+    timestamp: float = field(default_factory=time.perf_counter)
+
+    @property
+    def seconds(self) -> float:
+        return self.encode_seconds + self.execute_seconds + self.commit_seconds
+
+
+@runtime_checkable
+class IOObserver(Protocol):
+    """Receives a `ChunkEvent` for every chunk written or read. Must be thread-safe."""
+
+    def on_chunk(self, event: ChunkEvent) -> None: ...
+
+
+class ProgressObserver:
+    """
+    The default observer: a tqdm progress bar over rows, with failures and fallbacks
+    logged (logger `azure_connectors.dataframe_io.metrics`, levels ERROR and WARNING).
+    Each record carries its `ChunkEvent` as `record.chunk_event`.
+    """
+
+    def __init__(self, total_rows: int | None = None):
+        self._progress = tqdm(total=total_rows, unit="rows")
+        self._lock = threading.Lock()
+
+    def on_chunk(self, event: ChunkEvent) -> None:
+        with self._lock:
+            if event.error is not None:
+                logger.error(
+                    "`%s` failed on chunk #%d (%d rows): %r",
+                    event.method,
+                    event.chunk_index,
+                    event.rows,
+                    event.error,
+                    extra={"chunk_event": event},
+                )
+                return
+            if event.fallback is not None:
+                logger.warning(
+                    "`%s` fell back to %s.",
+                    event.method,
+                    event.fallback,
+                    extra={"chunk_event": event},
+                )
+            self._progress.update(event.rows)
+
+    def close(self) -> None:
+        self._progress.close()
+
+
+@contextmanager
+def observing(
+    observer: IOObserver | None, total_rows: int | None = None
+) -> Iterator[IOObserver]:
+    """Use `observer`, or a `ProgressObserver` over `total_rows` if none was given."""
+    if observer is not None:
+        yield observer
+        return
+    progress = ProgressObserver(total_rows)
+    try:
+        yield progress
+    finally:
+        progress.close()
+
+
+class MetricsAggregator:
+    """
+    Collects `ChunkEvent`s and summarizes them: throughput over wall-clock time,
+    per-chunk latency percentiles, and where the time went.
+    """
+
+    def __init__(self) -> None:
+        self.events: list[ChunkEvent] = []
+        self._lock = threading.Lock()
+
+    def on_chunk(self, event: ChunkEvent) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self) -> dict[str, float]:
+        with self._lock:
+            events = [e for e in self.events if e.error is None]
+            failures = len(self.events) - len(events)
+        if not events:
+            return {"chunks": 0, "failures": failures}
+
+        # wall-clock span, so that concurrent chunks are not double-counted
+        start = min(e.timestamp - e.seconds for e in events)
+        end = max(e.timestamp for e in events)
+        wall_seconds = max(end - start, 1e-9)
+        rows = sum(e.rows for e in events)
+        latencies = sorted(e.seconds for e in events)
+
+        return {
+            "chunks": len(events),
+            "failures": failures,
+            "rows": rows,
+            "bytes": sum(e.bytes for e in events),
+            "wall_seconds": wall_seconds,
+            "rows_per_second": rows / wall_seconds,
+            "latency_p50": _percentile(latencies, 0.50),
+            "latency_p90": _percentile(latencies, 0.90),
+            "latency_p99": _percentile(latencies, 0.99),
+            "encode_seconds": sum(e.encode_seconds for e in events),
+            "execute_seconds": sum(e.execute_seconds for e in events),
+            "commit_seconds": sum(e.commit_seconds for e in events),
+            "retries": sum(e.retries for e in events),
+            "fallbacks": sum(e.fallback is not None for e in events),
+        }
+
+    def report(self) -> str:
+        """A one-line human-readable summary, e.g. for logs."""
+        s = self.summary()
+        if not s.get("rows"):
+            return f"{s['chunks']} chunks, {s['failures']} failures"
+        return (
+            f"{s['rows']:_.0f} rows in {s['chunks']:.0f} chunks, "
+            f"{s['rows_per_second']:_.0f} rows/s; "
+            f"chunk latency p50={s['latency_p50']:.3f}s p90={s['latency_p90']:.3f}s "
+            f"p99={s['latency_p99']:.3f}s; "
+            f"encode={s['encode_seconds']:.1f}s execute={s['execute_seconds']:.1f}s "
+            f"commit={s['commit_seconds']:.1f}s; "
+            f"{s['retries']:.0f} retries, {s['fallbacks']:.0f} fallbacks, "
+            f"{s['failures']:.0f} failures"
+        )
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
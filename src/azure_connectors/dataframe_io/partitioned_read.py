@@ -0,0 +1,124 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal
+
+import polars as pl
+import sqlalchemy
+from sqlalchemy.dialects import mssql
+
+from azure_connectors.azure_sql import get_sql_connection
+
+from . import dataframe_io_config
+from .metrics import IOObserver
+from .read import read_df
+
+
+def read_df_partitioned(
+    query: str,
+    partition_on: str,
+    n_partitions: int = dataframe_io_config.DEFAULT_MAX_WORKERS,
+    bounds: tuple[Any, Any] | None = None,
+    engine: sqlalchemy.Engine | None = None,
+    max_workers: int | None = None,
+    backend: Literal["sqlalchemy", "arrow"] = "sqlalchemy",
+    observer: IOObserver | None = None,
+) -> pl.DataFrame:
+    """
+    Read a table or query as `n_partitions` key-range queries run concurrently on
+    pooled connections, and concatenate the results in range order.
+
+    `query` is either a table name (e.g. `"dbo.votes"`) or a `SELECT` statement, which
+    is wrapped as a subquery (so it cannot end in `ORDER BY`). `partition_on` must be a
+    numeric, date or datetime column, ideally the leading column of an index so that
+    each range is a seek. The ranges split `bounds` evenly; without `bounds`, they are
+    read with one `MIN`/`MAX` query. The outermost ranges are open-ended and the first
+    also takes NULLs, so every row is read exactly once even if `bounds` are stale.
+
+    `max_workers` defaults to `n_partitions`; the sqlalchemy backend shares the engine's
+    pool, so keep it within the pool size. `backend` and `observer` are passed on to
+    `read_df` for every partition.
+    """
+    if engine is None and backend == "sqlalchemy":
+        engine = get_sql_connection().engine
+    dialect = engine.dialect if engine is not None else mssql.dialect()
+
+    if len(query.split()) == 1:
+        query = f"SELECT * FROM {query}"
+    subquery = (
+        sqlalchemy.text(query)
+        .columns(sqlalchemy.column(partition_on))
+        .subquery("partitioned")
+    )
+    column = subquery.c[partition_on]
+    select_all = sqlalchemy.select(sqlalchemy.text("*")).select_from(subquery)
+
+    def read(select: sqlalchemy.Select) -> pl.DataFrame:
+        compiled = select.compile(
+            dialect=dialect, compile_kwargs={"literal_binds": True}
+        )
+        return read_df(
+            str(compiled),
+            engine=engine if backend == "sqlalchemy" else None,
+            backend=backend,
+            observer=observer,
+        )
+
+    if bounds is None:
+        bounds = read(
+            sqlalchemy.select(sqlalchemy.func.min(column), sqlalchemy.func.max(column))
+        ).row(0)
+    lower, upper = bounds
+    if lower is None:
+        # empty table, or an all-NULL partition column
+        return read(select_all)
+
+    boundaries = partition_boundaries(lower, upper, n_partitions)
+    n_ranges = len(boundaries) - 1
+    if n_ranges <= 1:
+        return read(select_all)
+
+    predicates: list[sqlalchemy.ColumnElement[bool]] = [
+        sqlalchemy.or_(column < boundaries[1], column.is_(None))
+    ]
+    for i in range(1, n_ranges - 1):
+        predicates.append(
+            sqlalchemy.and_(column >= boundaries[i], column < boundaries[i + 1])
+        )
+    predicates.append(column >= boundaries[n_ranges - 1])
+
+    with ThreadPoolExecutor(max_workers=max_workers or n_ranges) as executor:
+        frames = list(
+            executor.map(
+                lambda predicate: read(select_all.where(predicate)), predicates
+            )
+        )
+    return pl.concat(frames, how="vertical_relaxed", rechunk=False)
+
+
+def partition_boundaries(lower: Any, upper: Any, n_partitions: int) -> list[Any]:
+    """
+    Split `[lower, upper]` into at most `n_partitions` equal ranges, returning the
+    `n + 1` increasing boundaries. Integer and date boundaries stay integral, and
+    datetime boundaries are truncated to whole seconds, so they compare exactly against
+    `datetime` columns.
+    """
+    boundaries: list[Any] = []
+    for i in range(n_partitions + 1):
+        if isinstance(lower, int):
+            boundary = lower + (upper - lower) * i // n_partitions
+        elif isinstance(lower, datetime.datetime):
+            boundary = lower + (upper - lower) * i / n_partitions
+            boundary = boundary.replace(microsecond=0)
+        elif isinstance(lower, datetime.date):
+            boundary = lower + datetime.timedelta(
+                days=(upper - lower).days * i // n_partitions
+            )
+        else:
+            boundary = lower + (upper - lower) * i / n_partitions
+        if i == 0:
+            boundary = lower
+        elif i == n_partitions:
+            boundary = upper
+        if not boundaries or boundary > boundaries[-1]:
+            boundaries.append(boundary)
+    return boundaries
@@ -0,0 +1,42 @@
+import polars as pl
+
+from .streaming import collect_streaming
+
+
+def check_primary_key_unique(
+    df: pl.DataFrame | pl.LazyFrame, primary_keys: list[str]
+) -> None:
+    """
+    Check that `df` is unique on the composite key `primary_keys`.
+
+    The common (unique) case is a single streaming pass that hashes each composite key
+    once and counts distinct hashes, holding only 8 bytes per row. Offending rows are
+    only looked up, in a second pass, when that count shows a possible duplicate; a
+    hash collision between distinct keys therefore costs time but never a false error.
+
+    Raises:
+        ValueError: If any composite key occurs more than once.
+    """
+    lf = df.lazy()
+    key = pl.struct(primary_keys)
+
+    counts = collect_streaming(
+        lf.select(
+            pl.len().alias("n_rows"),
+            key.hash().n_unique().alias("n_unique_keys"),
+        )
+    )
+    if counts["n_rows"].item() == counts["n_unique_keys"].item():
+        return
+
+    offending_observations = collect_streaming(
+        lf.filter(key.is_duplicated())
+    ).sort(primary_keys)
+    if offending_observations.is_empty():
+        return
+
+    raise ValueError(
+        f"df must be unique on {primary_keys=}.",
+        "The following observations have >1 unique value corresponding to the same unique primary_key (i.e., these are the observations causing this error):",
+        offending_observations,
+    )
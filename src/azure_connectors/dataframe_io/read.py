@@ -1,49 +1,349 @@
-from typing import Any, Literal
+import time
+from typing import Any, Iterator, Literal, Sequence, overload
 
 import polars as pl
 import sqlalchemy
 
-from azure_connectors import AzureSqlConnection
+from azure_connectors.azure_sql import AzureSqlConnection, get_sql_connection
+
+from . import dataframe_io_config
+from .metrics import ChunkEvent, IOObserver
+from .result_cache import ResultCache, cached_read
+from .schema_resolver import resolve_schema
+from .streaming import prefetch
+from .table_stats import get_table_stats
+
+
+@overload
+def read_df(
+    query: str,
+    engine: sqlalchemy.Engine | None = ...,
+    iter_batches: Literal[False] = ...,
+    batch_size: int | None = ...,
+    schema_overrides: pl.Schema | None = ...,
+    infer_schema_length: int | None = ...,
+    execute_options: dict[str, Any] | None = ...,
+    observer: IOObserver | None = ...,
+    backend: Literal["sqlalchemy", "arrow"] = ...,
+    prefetch_depth: int = ...,
+    cache: ResultCache | None = ...,
+    cache_depends_on: Sequence[str] | None = ...,
+    catalog_schema: bool = ...,
+) -> pl.DataFrame: ...
+
+
+@overload
+def read_df(
+    query: str,
+    engine: sqlalchemy.Engine | None = ...,
+    *,
+    iter_batches: Literal[True],
+    batch_size: int | None = ...,
+    schema_overrides: pl.Schema | None = ...,
+    infer_schema_length: int | None = ...,
+    execute_options: dict[str, Any] | None = ...,
+    observer: IOObserver | None = ...,
+    backend: Literal["sqlalchemy", "arrow"] = ...,
+    prefetch_depth: int = ...,
+    cache: None = ...,
+    cache_depends_on: None = ...,
+    catalog_schema: bool = ...,
+) -> Iterator[pl.DataFrame]: ...
 
 
 def read_df(
     query: str,
     engine: sqlalchemy.Engine | None = None,
-    iter_batches: Literal[False] = False,
+    iter_batches: bool = False,
     batch_size: int | None = None,
     schema_overrides: pl.Schema | None = None,
     infer_schema_length: int | None = None,
     execute_options: dict[str, Any] | None = None,
-) -> pl.DataFrame:
+    observer: IOObserver | None = None,
+    backend: Literal["sqlalchemy", "arrow"] = "sqlalchemy",
+    prefetch_depth: int = dataframe_io_config.DEFAULT_PREFETCH_DEPTH,
+    cache: ResultCache | None = None,
+    cache_depends_on: Sequence[str] | None = None,
+    catalog_schema: bool = False,
+) -> pl.DataFrame | Iterator[pl.DataFrame]:
     """
-    Note: passing an `engine` will likely speed up execution time.
+    Without an `engine`, the process-wide shared connection for the environment's
+    settings is used (see `azure_connectors.azure_sql.get_sql_connection`).
+
+    `observer` receives one `ChunkEvent` (operation="read") with the rows, bytes and
+    time taken by the query.
+
+    `backend="arrow"` fetches the result set column-wise into Arrow record batches of
+    `batch_size` rows (see `read_df_arrow`) instead of building a Python tuple per row
+    through the pyodbc cursor. It uses the shared connection, so it cannot be combined
+    with an `engine`.
+
+    `iter_batches=True` returns a generator of DataFrames of `batch_size` rows (default
+    `DEFAULT_STREAM_BATCH_SIZE`) read from one open cursor, so results larger than
+    memory need no OFFSET/FETCH pagination. The query runs and up to `prefetch_depth`
+    batches are fetched on a background thread while the caller processes the current
+    one; `observer` then receives one event per batch. The connection is held until the
+    generator is exhausted or closed.
+
+    With a `cache` (see `ResultCache`), a repeated read of the same query against the
+    same database is served from a memory-mapped local copy while it is fresh.
+    `cache_depends_on` names the tables the query reads, for caches validated with
+    `staleness="last_user_update"`. A cache hit emits an event with method
+    "read_df_cache". Not available with `iter_batches`.
+
+    `catalog_schema=True` takes the column dtypes from SQL Server's description of the
+    result set (see `resolve_schema`, cached per query), so that columns are built at
+    their exact type (e.g. DECIMAL stays Decimal) without inferring from the first
+    rows. `schema_overrides` still take precedence.
     """
+    if backend == "arrow" and engine is not None:
+        raise ValueError("backend='arrow' does not take an engine.")
+
+    if catalog_schema:
+        resolved = resolve_schema(query, engine=engine or get_sql_connection().engine)
+        schema_overrides = pl.Schema({**resolved, **(schema_overrides or {})})
+
+    if cache is not None:
+        if iter_batches:
+            raise ValueError("cache is not supported with iter_batches=True.")
+        start = time.perf_counter()
+        df, hit = cached_read(
+            cache,
+            query,
+            engine=engine or get_sql_connection().engine,
+            read=lambda: read_df(
+                query,
+                engine=engine,
+                batch_size=batch_size,
+                schema_overrides=schema_overrides,
+                infer_schema_length=infer_schema_length,
+                execute_options=execute_options,
+                observer=observer,
+                backend=backend,
+            ),
+            backend=backend,
+            schema_overrides=schema_overrides,
+            depends_on=cache_depends_on,
+            execute_options=execute_options,
+            infer_schema_length=infer_schema_length,
+        )
+        if hit and observer is not None:
+            observer.on_chunk(
+                _read_event("read_df_cache", 0, df, time.perf_counter() - start)
+            )
+        return df
+
+    if iter_batches:
+        batch_size = batch_size or dataframe_io_config.DEFAULT_STREAM_BATCH_SIZE
+        batches: Iterator[pl.DataFrame]
+        if backend == "arrow":
+            batches = _iter_arrow_batches(
+                query,
+                sql_connection=get_sql_connection(),
+                batch_size=batch_size,
+                schema_overrides=schema_overrides,
+                parameters=(execute_options or {}).get("parameters"),
+            )
+        else:
+            batches = _iter_database_batches(
+                query,
+                engine=engine or get_sql_connection().engine,
+                batch_size=batch_size,
+                schema_overrides=schema_overrides,
+                infer_schema_length=infer_schema_length,
+                execute_options=execute_options,
+            )
+        method = "read_df_arrow" if backend == "arrow" else "read_df"
+        return prefetch(_observed(batches, method, observer), depth=prefetch_depth)
+
+    if backend == "arrow":
+        return read_df_arrow(
+            query,
+            batch_size=batch_size or dataframe_io_config.DEFAULT_ARROW_FETCH_BATCH_SIZE,
+            schema_overrides=schema_overrides,
+            parameters=(execute_options or {}).get("parameters"),
+            observer=observer,
+        )
+
     if engine is None:
-        sql_info = AzureSqlConnection.from_env()
+        sql_info = get_sql_connection()
         engine = sql_info.engine
 
-    return pl.read_database(
-        query=query,
-        connection=engine,
-        #
-        iter_batches=iter_batches,
-        batch_size=batch_size,
-        schema_overrides=schema_overrides,
-        infer_schema_length=infer_schema_length,
-        execute_options=execute_options,
+    start = time.perf_counter()
+    try:
+        df = pl.read_database(
+            query=query,
+            connection=engine,
+            #
+            batch_size=batch_size,
+            schema_overrides=schema_overrides,
+            infer_schema_length=infer_schema_length,
+            execute_options=execute_options,
+        )
+    except Exception as e:
+        if observer is not None:
+            observer.on_chunk(
+                _read_event("read_df", 0, None, time.perf_counter() - start, error=e)
+            )
+        raise e
+
+    if observer is not None:
+        observer.on_chunk(_read_event("read_df", 0, df, time.perf_counter() - start))
+    return df
+
+
+def read_df_arrow(
+    query: str,
+    sql_connection: AzureSqlConnection | None = None,
+    batch_size: int = dataframe_io_config.DEFAULT_ARROW_FETCH_BATCH_SIZE,
+    schema_overrides: pl.Schema | None = None,
+    parameters: Sequence[Any] | None = None,
+    observer: IOObserver | None = None,
+) -> pl.DataFrame:
+    """
+    Read the result of `query` through the mssql-python driver, which binds column-wise
+    ODBC buffers and exports each `batch_size`-row fetch as an Arrow record batch. Polars
+    adopts the Arrow buffers without copying them, so no Python object is created per
+    value. Requires the optional `mssql-python` dependency.
+
+    Without a `sql_connection`, the process-wide shared connection is used; either way,
+    the connection is authenticated with the same token as its SQLAlchemy engine.
+    """
+    if sql_connection is None:
+        sql_connection = get_sql_connection()
+
+    start = time.perf_counter()
+    try:
+        conn = sql_connection.arrow_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, *(parameters or ()))
+            table = cursor.arrow(batch_size=batch_size)
+        finally:
+            conn.close()
+        df: pl.DataFrame = pl.from_arrow(table, rechunk=False)  # type: ignore[assignment]
+        if schema_overrides is not None:
+            df = df.cast(schema_overrides)  # type: ignore[arg-type]
+    except Exception as e:
+        if observer is not None:
+            observer.on_chunk(
+                _read_event(
+                    "read_df_arrow", 0, None, time.perf_counter() - start, error=e
+                )
+            )
+        raise e
+
+    if observer is not None:
+        observer.on_chunk(
+            _read_event("read_df_arrow", 0, df, time.perf_counter() - start)
+        )
+    return df
+
+
+def _iter_database_batches(
+    query: str,
+    engine: sqlalchemy.Engine,
+    batch_size: int,
+    schema_overrides: pl.Schema | None,
+    infer_schema_length: int | None,
+    execute_options: dict[str, Any] | None,
+) -> Iterator[pl.DataFrame]:
+    # a generator, so that the query itself also runs on the prefetch thread, and the
+    # connection is returned to the pool when the caller stops early
+    with engine.connect() as conn:
+        yield from pl.read_database(
+            query=query,
+            connection=conn,
+            iter_batches=True,
+            batch_size=batch_size,
+            schema_overrides=schema_overrides,
+            infer_schema_length=infer_schema_length,
+            execute_options=execute_options,
+        )
+
+
+def _iter_arrow_batches(
+    query: str,
+    sql_connection: AzureSqlConnection,
+    batch_size: int,
+    schema_overrides: pl.Schema | None,
+    parameters: Sequence[Any] | None,
+) -> Iterator[pl.DataFrame]:
+    conn = sql_connection.arrow_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, *(parameters or ()))
+        while True:
+            batch = cursor.arrow_batch(batch_size=batch_size)
+            if batch.num_rows == 0:
+                return
+            df: pl.DataFrame = pl.from_arrow(batch)  # type: ignore[assignment]
+            if schema_overrides is not None:
+                df = df.cast(schema_overrides)  # type: ignore[arg-type]
+            yield df
+            if batch.num_rows < batch_size:
+                return
+    finally:
+        conn.close()
+
+
+def _observed(
+    batches: Iterator[pl.DataFrame], method: str, observer: IOObserver | None
+) -> Iterator[pl.DataFrame]:
+    """Emit a read `ChunkEvent` per batch, timing the fetch of each one."""
+    i = 0
+    start = time.perf_counter()
+    try:
+        for batch in batches:
+            if observer is not None:
+                observer.on_chunk(
+                    _read_event(method, i, batch, time.perf_counter() - start)
+                )
+            yield batch
+            i += 1
+            start = time.perf_counter()
+    except Exception as e:
+        if observer is not None:
+            observer.on_chunk(
+                _read_event(method, i, None, time.perf_counter() - start, error=e)
+            )
+        raise e
+    finally:
+        close = getattr(batches, "close", None)
+        if close is not None:
+            close()
+
+
+def _read_event(
+    method: str,
+    chunk_index: int,
+    df: pl.DataFrame | None,
+    seconds: float,
+    error: BaseException | None = None,
+) -> ChunkEvent:
+    return ChunkEvent(
+        operation="read",
+        method=method,
+        chunk_index=chunk_index,
+        rows=0 if df is None else df.shape[0],
+        bytes=0 if df is None else df.estimated_size(),
+        execute_seconds=seconds,
+        error=error,
     )
 
 
-def get_table_len(table_name: str) -> int:
+def get_table_len(
+    table_name: str, engine: sqlalchemy.Engine | None = None, exact: bool = False
+) -> int:
     """
+    Read the row count from the partition metadata (see `get_table_stats`), instead of
+    scanning the table with `COUNT(*)`. Pass `exact=True` for a transactionally exact
+    count.
+
     Raises:
-        sqlalchemy.exc.ProgrammingError: If table does not exist.
-    """
-    query = f"""--sql
-    SELECT COUNT(*) AS TableLength FROM {table_name};
+        ValueError: If table does not exist.
     """
-    response: pl.DataFrame = read_df(query)
-    return response.item()
+    return get_table_stats(table_name, engine=engine, exact=exact).row_count
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Literal, Sequence
+
+import polars as pl
+import sqlalchemy
+
+from . import dataframe_io_config
+
+Staleness = Literal["none", "last_user_update", "change_tracking"]
+
+# single-quoted SQL literals, with '' as the escaped quote
+_STRING_LITERAL = re.compile(r"('(?:[^']|'')*')")
+
+
+@dataclass
+class ResultCache:
+    """
+    An on-disk cache of query results, stored as uncompressed Arrow IPC files so that a
+    hit is a memory-mapped read rather than a new pull from the database.
+
+    Entries are keyed by the normalized query text, the database (engine URL), the
+    read backend, the schema overrides, the execute options (including the query
+    parameters) and `infer_schema_length`. An entry is a miss once it is older than
+    `ttl`, or when the server-side change signal chosen by `staleness` differs from the
+    one recorded with it:
+        - `"none"`: rely on `ttl` only.
+        - `"last_user_update"`: the latest `sys.dm_db_index_usage_stats.last_user_update`
+          of the tables the query depends on (passed per read).
+        - `"change_tracking"`: the database's `CHANGE_TRACKING_CURRENT_VERSION()`, which
+          requires change tracking to be enabled.
+
+    When the entries outgrow `max_bytes`, the least recently used are evicted.
+
+    Attributes:
+        directory (Path): Where entries are stored.
+        max_bytes (int): The total size the cache is trimmed to after each store.
+        ttl (float | None): The maximum age of an entry, in seconds. None for no limit.
+        staleness (Staleness): The server-side change signal entries are validated against.
+    """
+
+    directory: Path
+    max_bytes: int = dataframe_io_config.DEFAULT_CACHE_MAX_BYTES
+    ttl: float | None = dataframe_io_config.DEFAULT_CACHE_TTL_SECONDS
+    staleness: Staleness = "none"
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(
+        self,
+        query: str,
+        engine: sqlalchemy.Engine,
+        backend: str = "sqlalchemy",
+        schema_overrides: pl.Schema | None = None,
+        execute_options: dict[str, Any] | None = None,
+        infer_schema_length: int | None = None,
+    ) -> str:
+        """The cache key of a read, as a hex digest."""
+        overrides = schema_overrides or {}
+        parts = [
+            normalize_query(query),
+            engine.url.render_as_string(hide_password=True),
+            backend,
+            repr(sorted((name, repr(dtype)) for name, dtype in overrides.items())),
+            # parameter values that JSON cannot represent (dates, decimals) by repr
+            json.dumps(execute_options or {}, sort_keys=True, default=repr),
+            repr(infer_schema_length),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+    def signal(
+        self, engine: sqlalchemy.Engine, depends_on: Sequence[str] | None = None
+    ) -> str | None:
+        """
+        Read the current server-side change signal for `staleness`.
+
+        Raises:
+            ValueError: If `staleness="last_user_update"` and `depends_on` is empty.
+        """
+        params: dict[str, str] = {}
+        match self.staleness:
+            case "none":
+                return None
+            case "change_tracking":
+                query = "SELECT CHANGE_TRACKING_CURRENT_VERSION()"
+            case "last_user_update":
+                if not depends_on:
+                    raise ValueError(
+                        "staleness='last_user_update' needs the tables the query reads."
+                    )
+                params = {f"table_{i}": table for i, table in enumerate(depends_on)}
+                object_ids = ", ".join(f"OBJECT_ID(:{name})" for name in params)
+                query = (
+                    "SELECT MAX(last_user_update) FROM sys.dm_db_index_usage_stats "
+                    f"WHERE database_id = DB_ID() AND object_id IN ({object_ids})"
+                )
+            case _:
+                raise ValueError(f"Invalid value for {self.staleness=}.")
+        with engine.connect() as conn:
+            value = conn.execute(sqlalchemy.text(query), params).scalar()
+        return repr(value)
+
+    def load(self, key: str, signal: str | None = None) -> pl.DataFrame | None:
+        """
+        Get the cached result for `key` (memory-mapped), or None on a miss.
+
+        Expired entries, and entries recorded with a different `signal`, are misses.
+        """
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if self.ttl is not None and time.time() - meta.get("created_at", 0) > self.ttl:
+            return None
+        if meta.get("signal") != signal:
+            return None
+        try:
+            # uncompressed IPC files are memory-mapped by default
+            df = pl.read_ipc(data_path)
+            # the data file's mtime records its last use, for LRU eviction
+            os.utime(data_path)
+        except OSError:
+            return None
+        return df
+
+    def store(
+        self, key: str, df: pl.DataFrame, signal: str | None = None, query: str = ""
+    ) -> None:
+        """Store `df` under `key`, then evict least recently used entries."""
+        data_path, meta_path = self._paths(key)
+        # write-then-rename, so concurrent readers never see a partial file
+        suffix = f".{uuid.uuid4().hex[:8]}.tmp"
+        tmp_data_path = data_path.with_name(data_path.name + suffix)
+        tmp_meta_path = meta_path.with_name(meta_path.name + suffix)
+        try:
+            df.write_ipc(tmp_data_path, compression="uncompressed")
+            tmp_meta_path.write_text(
+                json.dumps(
+                    {"created_at": time.time(), "signal": signal, "query": query}
+                )
+            )
+            os.replace(tmp_data_path, data_path)
+            os.replace(tmp_meta_path, meta_path)
+        except OSError:
+            # e.g. the old entry is memory-mapped by another reader on Windows
+            tmp_data_path.unlink(missing_ok=True)
+            tmp_meta_path.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache is within `max_bytes`."""
+        with self._lock:
+            entries: list[tuple[float, int, Path]] = []
+            for data_path in self.directory.glob("*.arrow"):
+                try:
+                    stat = data_path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, data_path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, data_path in sorted(entries):
+                if total <= self.max_bytes:
+                    return
+                try:
+                    data_path.with_suffix(".json").unlink(missing_ok=True)
+                    data_path.unlink()
+                except OSError:
+                    continue
+                total -= size
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        for path in [*self.directory.glob("*.arrow"), *self.directory.glob("*.json")]:
+            path.unlink(missing_ok=True)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.directory / f"{key}.arrow", self.directory / f"{key}.json"
+
+
+def normalize_query(query: str) -> str:
+    """
+    Collapse whitespace outside of string literals, so that re-indented or reflowed
+    copies of a query share a cache entry.
+    """
+    parts = _STRING_LITERAL.split(query.strip())
+    return "".join(
+        part if i % 2 else re.sub(r"\s+", " ", part) for i, part in enumerate(parts)
+    )
+
+
+def cached_read(
+    cache: ResultCache,
+    query: str,
+    engine: sqlalchemy.Engine,
+    read: Callable[[], pl.DataFrame],
+    backend: str = "sqlalchemy",
+    schema_overrides: pl.Schema | None = None,
+    depends_on: Sequence[str] | None = None,
+    execute_options: dict[str, Any] | None = None,
+    infer_schema_length: int | None = None,
+) -> tuple[pl.DataFrame, bool]:
+    """
+    Load the result of `query` from `cache`, or call `read()` and store its result.
+
+    Returns:
+        tuple[pl.DataFrame, bool]: The result, and whether it came from the cache.
+    """
+    key = cache.key(
+        query,
+        engine,
+        backend=backend,
+        schema_overrides=schema_overrides,
+        execute_options=execute_options,
+        infer_schema_length=infer_schema_length,
+    )
+    signal = cache.signal(engine, depends_on)
+    df = cache.load(key, signal)
+    if df is not None:
+        return df, True
+    df = read()
+    cache.store(key, df, signal=signal, query=query)
+    return df, False
@@ -0,0 +1,110 @@
+from typing import Any, TypeVar
+
+import polars as pl
+import sqlalchemy
+
+from .read import read_df
+
+FrameT = TypeVar("FrameT", pl.DataFrame, pl.LazyFrame)
+
+# key types that SQL Server and Polars order the same way; strings (collations) and
+# UNIQUEIDENTIFIER (compared byte group by byte group, last group first) are not
+_ORDERABLE_KEY_TYPES: tuple[type[sqlalchemy.types.TypeEngine], ...] = (
+    sqlalchemy.Integer,
+    sqlalchemy.Numeric,
+    sqlalchemy.Date,
+    sqlalchemy.DateTime,
+    sqlalchemy.Time,
+)
+
+
+def has_orderable_key(table: sqlalchemy.Table) -> bool:
+    """
+    Whether SQL Server orders the primary key of `table` the way Polars does, which a
+    primary-key watermark needs.
+    """
+    return all(
+        isinstance(col.type, _ORDERABLE_KEY_TYPES) for col in table.primary_key.columns
+    )
+
+
+def is_sorted_by(df: pl.DataFrame, keys: list[str]) -> bool:
+    """Whether the rows of `df` are in ascending order of `keys`."""
+    if len(keys) == 1:
+        return df[keys[0]].is_sorted()
+    key_columns = df.select(keys)
+    return key_columns.equals(key_columns.sort(keys))
+
+
+def get_primary_key_watermark(
+    table: sqlalchemy.Table, engine: sqlalchemy.Engine
+) -> tuple[Any, ...] | None:
+    """
+    Get the largest primary key committed to `table`, or None if it is empty.
+
+    Runs `SELECT TOP 1 <pk> ... ORDER BY <pk> DESC`, which SQL Server answers with a
+    single seek on the primary-key index instead of the full scan that `COUNT(*)` needs.
+    """
+    pk_columns = list(table.primary_key.columns)
+    query = (
+        sqlalchemy.select(*pk_columns)
+        .order_by(*(col.desc() for col in pk_columns))
+        .limit(1)
+    )
+    with engine.connect() as conn:
+        row = conn.execute(query).first()
+    return None if row is None else tuple(row)
+
+
+def keys_after_watermark(
+    primary_keys: list[str], watermark: tuple[Any, ...]
+) -> pl.Expr:
+    """
+    Expression selecting rows whose composite key is lexicographically greater than
+    `watermark`, matching SQL Server's `ORDER BY` on the same columns.
+    """
+    expr = pl.lit(False)
+    for key, value in reversed(list(zip(primary_keys, watermark))):
+        expr = (pl.col(key) > value) | ((pl.col(key) == value) & expr)
+    return expr
+
+
+def resume_after_watermark(
+    df: FrameT, table: sqlalchemy.Table, engine: sqlalchemy.Engine
+) -> FrameT:
+    """
+    Drop the rows of `df` that are at or below the table's primary-key watermark.
+
+    Exact only when the earlier run wrote `df` in ascending primary-key order on a
+    single session, and the key is ordered the same way in SQL Server (see
+    `has_orderable_key`). Otherwise rows below the watermark that were never written
+    are silently skipped; use `resume_by_anti_join`.
+    """
+    primary_keys: list[str] = [col.name for col in table.primary_key.columns]
+    watermark = get_primary_key_watermark(table, engine)
+    if watermark is None:
+        return df
+    return df.filter(keys_after_watermark(primary_keys, watermark))
+
+
+def resume_by_anti_join(
+    df: FrameT, table: sqlalchemy.Table, engine: sqlalchemy.Engine
+) -> FrameT:
+    """
+    Drop the rows of `df` whose primary key is already in `table`.
+
+    Exact regardless of the order rows were written in, at the cost of reading every
+    committed key (only the key columns cross the wire).
+    """
+    primary_keys: list[str] = [col.name for col in table.primary_key.columns]
+    pk_query = sqlalchemy.select(*table.primary_key.columns)
+    committed_keys: pl.DataFrame = read_df(
+        str(pk_query.compile(engine, compile_kwargs={"literal_binds": True})),
+        engine=engine,
+    )
+    committed_keys = committed_keys.cast(
+        {key: dtype for key, dtype in df.collect_schema().items() if key in primary_keys}
+    )
+    if isinstance(df, pl.LazyFrame):
+        return df.join(committed_keys.lazy(), on=primary_keys, how="anti")
+    return df.join(committed_keys, on=primary_keys, how="anti")
@@ -0,0 +1,99 @@
+import random
+import re
+from dataclasses import dataclass
+
+import polars as pl
+import sqlalchemy
+
+# SQL Server / Azure SQL native error numbers that are safe to retry, see
+# https://learn.microsoft.com/en-us/azure/azure-sql/database/troubleshoot-common-errors-issues
+TRANSIENT_ERROR_CODES: frozenset[int] = frozenset(
+    {
+        20, 64, 233, 1205, 4060, 4221, 10053, 10054, 10060, 10928, 10929,
+        40143, 40197, 40501, 40540, 40613, 42108, 42109, 49918, 49919, 49920,
+    }
+)  # fmt: skip
+
+# ODBC SQLSTATEs for communication failures, timeouts and deadlock victims
+TRANSIENT_SQLSTATES: frozenset[str] = frozenset(
+    {"08001", "08S01", "08003", "08004", "HYT00", "HYT01", "40001"}
+)
+
+# pyodbc ends each diagnostic record's message with the native error number in
+# parentheses, followed by the ODBC function that failed, as in
+# "[SQL Server]Deadlock victim... (1205) (SQLExecDirectW)"; records are joined by "; "
+_NATIVE_ERROR_PATTERN = re.compile(r"\((\d+)\)\s*(?:\(SQL\w+\))?\s*(?:;|$)")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient Azure SQL errors.
+
+    Attributes:
+        max_attempts (int): The maximum number of attempts per chunk, including the first.
+        base_delay (float): The backoff before the first retry, in seconds.
+        max_delay (float): The cap on any one backoff, in seconds.
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether to retry after `error` on (zero-based) `attempt`."""
+        return attempt + 1 < self.max_attempts and is_transient(error)
+
+    def delay(self, attempt: int) -> float:
+        """The backoff before retrying after (zero-based) `attempt`."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Classify an error from pyodbc (possibly wrapped by SQLAlchemy) as transient, i.e.
+    worth retrying on a fresh connection, rather than fatal.
+    """
+    if isinstance(error, sqlalchemy.exc.DBAPIError):
+        if error.connection_invalidated:
+            return True
+        error = error.orig  # type: ignore[assignment]
+
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+
+    # pyodbc errors carry (sqlstate, message)
+    args = getattr(error, "args", ())
+    if len(args) != 2 or not all(isinstance(arg, str) for arg in args):
+        return False
+    sqlstate, message = args
+    if sqlstate in TRANSIENT_SQLSTATES:
+        return True
+    # only the native error numbers count, not numbers quoted in the message text, as
+    # in "The duplicate key value is (1205). (2627)"
+    return any(
+        int(code) in TRANSIENT_ERROR_CODES
+        for code in _NATIVE_ERROR_PATTERN.findall(message)
+    )
+
+
+def chunk_committed(
+    chunk: pl.DataFrame, table: sqlalchemy.Table, engine: sqlalchemy.Engine
+) -> bool:
+    """
+    Whether `chunk` was committed to `table` before a failure, e.g. when the connection
+    dropped while the commit was in flight.
+
+    Each chunk is inserted in a single transaction, so it is either fully present or
+    absent, and probing the primary key of its first row (one index seek) decides it.
+    """
+    primary_keys: list[str] = [col.name for col in table.primary_key.columns]
+    first_key = chunk.select(primary_keys).row(0, named=True)
+    query = (
+        sqlalchemy.select(sqlalchemy.literal(1))
+        .select_from(table)
+        .where(*(table.c[key] == value for key, value in first_key.items()))
+        .limit(1)
+    )
+    with engine.connect() as conn:
+        return conn.execute(query).first() is not None
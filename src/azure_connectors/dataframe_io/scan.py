@@ -0,0 +1,304 @@
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any, Iterator
+
+import polars as pl
+import sqlalchemy
+from polars.io.plugins import register_io_source
+from sqlalchemy.dialects import mssql
+
+from azure_connectors.azure_sql import get_sql_connection
+
+from . import dataframe_io_config
+from .read import read_df
+
+# (clause, exact): clause None means nothing could be pushed down, and exact means the
+# clause selects exactly the rows the Polars predicate keeps, not a superset of them
+PushedPredicate = tuple[sqlalchemy.ColumnElement[bool] | None, bool]
+
+_COMPARISONS = {
+    "Eq": "__eq__",
+    "NotEq": "__ne__",
+    "Lt": "__lt__",
+    "LtEq": "__le__",
+    "Gt": "__gt__",
+    "GtEq": "__ge__",
+}
+_FLIPPED = {
+    "Eq": "Eq",
+    "NotEq": "NotEq",
+    "Lt": "Gt",
+    "LtEq": "GtEq",
+    "Gt": "Lt",
+    "GtEq": "LtEq",
+}
+_PYTHON_TYPE_TO_POLARS: dict[type, pl.DataType] = {
+    bool: pl.Boolean(),
+    int: pl.Int64(),
+    float: pl.Float64(),
+    str: pl.String(),
+    bytes: pl.Binary(),
+    datetime.date: pl.Date(),
+    datetime.datetime: pl.Datetime("us"),
+    datetime.time: pl.Time(),
+    uuid.UUID: pl.String(),
+}
+_MICROSECONDS_PER_TICK = {
+    "Nanoseconds": lambda ticks: ticks // 1_000,
+    "Microseconds": lambda ticks: ticks,
+    "Milliseconds": lambda ticks: ticks * 1_000,
+}
+
+
+def scan_sql(
+    table: str | sqlalchemy.Table,
+    engine: sqlalchemy.Engine | None = None,
+    batch_size: int = dataframe_io_config.DEFAULT_STREAM_BATCH_SIZE,
+) -> pl.LazyFrame:
+    """
+    Lazily scan an Azure SQL table. Column selections, filters and `head`/`limit`
+    applied to the LazyFrame are compiled into the `SELECT` sent to the server, so only
+    the needed rows and columns cross the wire; results stream in `batch_size`-row
+    batches.
+
+    Filters are pushed down when they are built from comparisons of a column with a
+    literal, `is_null`/`is_not_null`, `is_between`, `&`, `|` and `~`. Anything else is
+    evaluated by Polars, as is every filter after the fetch, so results never depend on
+    what was pushed down. String columns are only pushed down for equality, since
+    SQL Server collations compare and order strings differently than Polars; likewise,
+    datetime literals are rounded to the precision of legacy `datetime` and
+    `smalldatetime` columns, selecting a superset. A limit is only pushed down when the
+    whole filter was, exactly.
+
+    Aggregations run in Polars on the pushed-down columns and rows: Polars IO sources
+    receive projections, filters and limits, but not aggregations.
+
+    `table` is a `sqlalchemy.Table`, or a table name (optionally schema-qualified, e.g.
+    `"dbo.votes"`) whose columns are reflected from the database.
+    """
+    if engine is None:
+        engine = get_sql_connection().engine
+    if isinstance(table, str):
+        schema_name, _, table_name = table.rpartition(".")
+        table = sqlalchemy.Table(
+            table_name,
+            sqlalchemy.MetaData(),
+            schema=schema_name or None,
+            autoload_with=engine,
+        )
+    sql_table: sqlalchemy.Table = table
+    schema = polars_schema(sql_table)
+
+    def source(
+        with_columns: list[str] | None,
+        predicate: pl.Expr | None,
+        n_rows: int | None,
+        batch_size_hint: int | None,
+    ) -> Iterator[pl.DataFrame]:
+        columns = with_columns if with_columns is not None else list(schema)
+        # the predicate is re-evaluated locally, so its columns are fetched too
+        fetched = list(columns)
+        if predicate is not None:
+            fetched += [c for c in predicate.meta.root_names() if c not in fetched]
+
+        query = sqlalchemy.select(*(sql_table.c[c] for c in fetched))
+        clause, exact = None, True
+        if predicate is not None:
+            clause, exact = push_down(predicate, sql_table)
+        if clause is not None:
+            query = query.where(clause)
+        if n_rows is not None and exact:
+            query = query.limit(n_rows)
+        compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+
+        remaining = n_rows
+        # the streaming engine always hints its own default, which would override ours
+        batches = read_df(
+            str(compiled), engine=engine, iter_batches=True, batch_size=batch_size
+        )
+        try:
+            for batch in batches:
+                batch = batch.cast({c: schema[c] for c in fetched})
+                if predicate is not None:
+                    batch = batch.filter(predicate)
+                batch = batch.select(columns)
+                if remaining is not None:
+                    batch = batch.head(remaining)
+                    remaining -= batch.shape[0]
+                yield batch
+                if remaining == 0:
+                    return
+        finally:
+            batches.close()  # type: ignore[attr-defined]
+
+    return register_io_source(source, schema=schema)
+
+
+def polars_schema(table: sqlalchemy.Table) -> pl.Schema:
+    """Map the column types of `table` to Polars dtypes (String for unknown types)."""
+    schema = pl.Schema()
+    for column in table.columns:
+        schema[column.name] = _polars_dtype(column.type)
+    return schema
+
+
+def push_down(predicate: pl.Expr, table: sqlalchemy.Table) -> PushedPredicate:
+    """
+    Translate as much of a Polars filter as SQL Server evaluates identically into a
+    `WHERE` clause on `table`. The clause selects a superset of the rows the predicate
+    keeps (exactly those rows, if the returned flag is True).
+    """
+    try:
+        node = json.loads(predicate.meta.serialize(format="json"))
+        return _push_down(node, table)
+    except Exception:
+        # the serialized expression format is not stable across Polars versions
+        return None, False
+
+
+def _push_down(node: dict[str, Any], table: sqlalchemy.Table) -> PushedPredicate:
+    if "BinaryExpr" in node:
+        left, op, right = (node["BinaryExpr"][k] for k in ("left", "op", "right"))
+        if op in ("And", "LogicalAnd"):
+            (left_clause, left_exact), (right_clause, right_exact) = (
+                _push_down(left, table),
+                _push_down(right, table),
+            )
+            # an operand that is not pushed down only widens the result
+            clauses = [c for c in (left_clause, right_clause) if c is not None]
+            exact = left_exact and right_exact
+            return (sqlalchemy.and_(*clauses) if clauses else None), exact
+        if op in ("Or", "LogicalOr"):
+            (left_clause, left_exact), (right_clause, right_exact) = (
+                _push_down(left, table),
+                _push_down(right, table),
+            )
+            if left_clause is None or right_clause is None:
+                return None, False
+            clause = sqlalchemy.or_(left_clause, right_clause)
+            return clause, left_exact and right_exact
+        if op in _COMPARISONS:
+            if "Column" in right and "Literal" in left:
+                left, right, op = right, left, _FLIPPED[op]
+            return _comparison(left, op, right, table)
+        return None, False
+
+    if "Function" in node:
+        inputs = node["Function"]["input"]
+        function = node["Function"]["function"]
+        if isinstance(function, dict):
+            function = function.get("Boolean")
+        match function:
+            case "Not":
+                clause, exact = _push_down(inputs[0], table)
+                # negating a superset would drop rows, so only exact clauses are negated
+                if clause is None or not exact:
+                    return None, False
+                return sqlalchemy.not_(clause), True
+            case "IsNull" | "IsNotNull":
+                column = _column(inputs[0], table)
+                if column is None:
+                    return None, False
+                if function == "IsNull":
+                    return column.is_(None), True
+                return column.is_not(None), True
+            case {"IsBetween": {"closed": closed}}:
+                lower_op = "GtEq" if closed in ("Both", "Left") else "Gt"
+                upper_op = "LtEq" if closed in ("Both", "Right") else "Lt"
+                lower = _comparison(inputs[0], lower_op, inputs[1], table)
+                upper = _comparison(inputs[0], upper_op, inputs[2], table)
+                if lower[0] is None or upper[0] is None:
+                    return None, False
+                return sqlalchemy.and_(lower[0], upper[0]), lower[1] and upper[1]
+    return None, False
+
+
+def _comparison(
+    column_node: dict[str, Any],
+    op: str,
+    literal_node: dict[str, Any],
+    table: sqlalchemy.Table,
+) -> PushedPredicate:
+    column = _column(column_node, table)
+    if column is None or "Literal" not in literal_node:
+        return None, False
+    value = _literal(literal_node["Literal"])
+    if value is None:
+        return None, False
+    if isinstance(column.type, sqlalchemy.String):
+        # collations ignore case and trailing spaces: `==` selects a superset, and
+        # other comparisons could drop rows
+        if op != "Eq":
+            return None, False
+        return column == value, False
+    if isinstance(value, datetime.datetime):
+        # a literal with microseconds would not convert to a `datetime` column directly
+        value = sqlalchemy.cast(sqlalchemy.literal(value), mssql.DATETIME2)
+        if isinstance(column.type, sqlalchemy.DateTime) and not isinstance(
+            column.type, (mssql.DATETIME2, mssql.DATETIMEOFFSET)
+        ):
+            # compared as DATETIME2, a legacy `datetime` keeps its 1/300 s ticks
+            # (.00333...), not the .003 the driver returns; comparing in the column's
+            # own type rounds the literal to its precision instead, which selects a
+            # superset of the rows, except for `!=`
+            if op == "NotEq":
+                return None, False
+            value = sqlalchemy.cast(value, column.type)
+            return getattr(column, _COMPARISONS[op])(value), False
+    return getattr(column, _COMPARISONS[op])(value), True
+
+
+def _column(node: dict[str, Any], table: sqlalchemy.Table) -> sqlalchemy.Column | None:
+    name = node.get("Column")
+    if not isinstance(name, str) or name not in table.c:
+        return None
+    return table.c[name]
+
+
+def _literal(literal: dict[str, Any]) -> Any:
+    """Decode a serialized Polars literal, or return None if it is not supported."""
+    if "Dyn" in literal:
+        ((kind, value),) = literal["Dyn"].items()
+        return value if kind in ("Int", "Float") else None
+
+    scalar = literal.get("Scalar")
+    if not isinstance(scalar, dict) or len(scalar) != 1:
+        return None
+    ((kind, value),) = scalar.items()
+    match kind:
+        case "String" | "Boolean":
+            return value
+        case _ if kind.startswith(("Int", "UInt", "Float")):
+            return value
+        case "Date":
+            return datetime.date(1970, 1, 1) + datetime.timedelta(days=value)
+        case "Datetime":
+            ticks, unit, time_zone = value
+            if time_zone is not None or unit not in _MICROSECONDS_PER_TICK:
+                return None
+            microseconds = _MICROSECONDS_PER_TICK[unit](ticks)
+            return datetime.datetime(1970, 1, 1) + datetime.timedelta(
+                microseconds=microseconds
+            )
+        case "Decimal":
+            unscaled, _, scale = value
+            return decimal.Decimal(unscaled).scaleb(-scale)
+    return None
+
+
+def _polars_dtype(sql_type: sqlalchemy.types.TypeEngine) -> pl.DataType:
+    try:
+        python_type = sql_type.python_type
+    except NotImplementedError:
+        return pl.String()
+    if python_type is decimal.Decimal:
+        precision = getattr(sql_type, "precision", None)
+        scale = getattr(sql_type, "scale", None)
+        if precision is None:
+            return pl.Float64()
+        return pl.Decimal(precision, scale or 0)
+    if python_type is datetime.datetime and getattr(sql_type, "timezone", False):
+        return pl.Datetime("us", "UTC")
+    return _PYTHON_TYPE_TO_POLARS.get(python_type, pl.String())
@@ -0,0 +1,128 @@
+import re
+import threading
+import weakref
+
+import polars as pl
+import sqlalchemy
+
+from azure_connectors.azure_sql import get_sql_connection
+
+from .result_cache import normalize_query
+
+_DESCRIBE_QUERY = sqlalchemy.text(
+    """--sql
+    SELECT name, system_type_name, precision, scale, error_message
+    FROM sys.dm_exec_describe_first_result_set(:query, NULL, 0)
+    ORDER BY column_ordinal;
+    """
+)
+
+# exact Polars dtypes for the values the drivers return, by SQL Server base type
+_SQL_SERVER_TYPES: dict[str, pl.DataType] = {
+    "bit": pl.Boolean(),
+    "tinyint": pl.UInt8(),
+    "smallint": pl.Int16(),
+    "int": pl.Int32(),
+    "bigint": pl.Int64(),
+    "real": pl.Float32(),
+    "float": pl.Float64(),
+    "money": pl.Decimal(19, 4),
+    "smallmoney": pl.Decimal(10, 4),
+    "date": pl.Date(),
+    "time": pl.Time(),
+    # the drivers return datetimes with microsecond precision, whatever the column's
+    "datetime": pl.Datetime("us"),
+    "datetime2": pl.Datetime("us"),
+    "smalldatetime": pl.Datetime("us"),
+    "datetimeoffset": pl.Datetime("us", "UTC"),
+    "char": pl.String(),
+    "varchar": pl.String(),
+    "nchar": pl.String(),
+    "nvarchar": pl.String(),
+    "text": pl.String(),
+    "ntext": pl.String(),
+    "xml": pl.String(),
+    "uniqueidentifier": pl.String(),
+    "binary": pl.Binary(),
+    "varbinary": pl.Binary(),
+    "image": pl.Binary(),
+    "timestamp": pl.Binary(),
+}
+
+# per engine: normalized query -> schema
+_lock = threading.Lock()
+_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def resolve_schema(query: str, engine: sqlalchemy.Engine | None = None) -> pl.Schema:
+    """
+    Get the exact Polars schema of the result of `query` (or of a table, given its
+    name) from SQL Server's own description of the result set
+    (`sys.dm_exec_describe_first_result_set`), without running the query.
+
+    Decimals keep their precision and scale, `bit` is Boolean, integers keep their
+    width and `uniqueidentifier` is String. Columns of other types (e.g. `sql_variant`,
+    spatial types), and unnamed columns, are left out, to be inferred as before.
+    A query SQL Server cannot describe without running it (e.g. one that reads a
+    temporary table created in the same batch) resolves to an empty schema.
+
+    Schemas are cached per engine and normalized query text until
+    `clear_schema_cache`.
+    """
+    if engine is None:
+        engine = get_sql_connection().engine
+    if len(query.split()) == 1:
+        query = f"SELECT * FROM {query}"
+
+    cache_key = normalize_query(query)
+    with _lock:
+        schema = _cache.get(engine, {}).get(cache_key)
+    if schema is not None:
+        return schema
+
+    with engine.connect() as conn:
+        rows = conn.execute(_DESCRIBE_QUERY, {"query": query}).all()
+    schema = pl.Schema()
+    for row in rows:
+        if row.error_message is not None:
+            schema = pl.Schema()
+            break
+        dtype = sql_server_dtype(row.system_type_name, row.precision, row.scale)
+        if row.name and dtype is not None:
+            schema[row.name] = dtype
+
+    with _lock:
+        _cache.setdefault(engine, {})[cache_key] = schema
+    return schema
+
+
+def sql_server_dtype(
+    type_name: str, precision: int | None = None, scale: int | None = None
+) -> pl.DataType | None:
+    """
+    Map a SQL Server type name, as in `"decimal(18,2)"` or `"nvarchar(max)"`, to the
+    Polars dtype of its values, or None if there is no exact mapping.
+    """
+    base_type = re.sub(r"\(.*\)", "", type_name).strip().lower()
+    if base_type in ("decimal", "numeric"):
+        if precision is None:
+            precision, scale = _precision_and_scale(type_name)
+        return pl.Decimal(precision, scale or 0)
+    return _SQL_SERVER_TYPES.get(base_type)
+
+
+def clear_schema_cache(engine: sqlalchemy.Engine | None = None) -> None:
+    """Forget the resolved schemas of `engine`, or of every engine if None."""
+    with _lock:
+        if engine is None:
+            _cache.clear()
+        else:
+            _cache.pop(engine, None)
+
+
+def _precision_and_scale(type_name: str) -> tuple[int | None, int | None]:
+    match = re.search(r"\((\d+)\s*(?:,\s*(\d+))?\)", type_name)
+    if match is None:
+        # SQL Server's default for a bare `decimal`
+        return 18, 0
+    return int(match[1]), int(match[2] or 0)
@@ -0,0 +1,104 @@
+import queue
+import threading
+from typing import Iterator, TypeVar
+
+import polars as pl
+
+from . import dataframe_io_config
+
+T = TypeVar("T")
+
+_SENTINEL = object()
+
+
+class _Failure:
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+def iter_lazyframe_batches(
+    lf: pl.LazyFrame,
+    batch_size: int = dataframe_io_config.DEFAULT_STREAM_BATCH_SIZE,
+) -> Iterator[pl.DataFrame]:
+    """
+    Yield `lf` as a sequence of DataFrames of roughly `batch_size` rows, without
+    materializing the full result.
+
+    Uses the Polars streaming engine (`LazyFrame.collect_batches`) when available. On older
+    Polars, falls back to collecting successive `slice`s, which bounds memory just the same
+    but re-runs the query plan up to each offset, so it is best suited to plans whose
+    slices push down into the scan (e.g. `pl.scan_parquet`).
+    """
+    if hasattr(pl.LazyFrame, "collect_batches"):
+        yield from lf.collect_batches(chunk_size=batch_size, maintain_order=True)
+        return
+
+    offset = 0
+    while True:
+        batch = lf.slice(offset, batch_size).collect()
+        if batch.is_empty():
+            return
+        yield batch
+        if batch.shape[0] < batch_size:
+            return
+        offset += batch_size
+
+
+def collect_streaming(lf: pl.LazyFrame) -> pl.DataFrame:
+    """Collect `lf` with the Polars streaming engine, if this Polars version has one."""
+    try:
+        return lf.collect(engine="streaming")  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return lf.collect()
+
+
+def prefetch(
+    iterator: Iterator[T],
+    depth: int = dataframe_io_config.DEFAULT_PREFETCH_DEPTH,
+) -> Iterator[T]:
+    """
+    Drive `iterator` on a background thread, keeping up to `depth` items ready, so that
+    producing the next item overlaps with the caller consuming the current one.
+
+    Exceptions raised by `iterator` are re-raised in the consuming thread. If the consumer
+    stops early, the producer thread is released and ends after its current item, closing
+    `iterator` if it is a generator (e.g. to release a database cursor).
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in iterator:
+                if not _put(item):
+                    return
+        except BaseException as e:
+            _put(_Failure(e))
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        _put(_SENTINEL)
+
+    def _put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _SENTINEL:
+                return
+            if isinstance(item, _Failure):
+                raise item.exception
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,379 @@
+import datetime
+import json
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import polars as pl
+import pyarrow.parquet as pq
+import sqlalchemy
+from sqlalchemy.dialects import mssql
+
+from azure_connectors.azure_sql import get_sql_connection
+
+from . import dataframe_io_config
+from .read import read_df
+from .scan import polars_schema
+
+SyncStrategy = Literal["change_tracking", "rowversion", "modified_at"]
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    """
+    The outcome of one `sync_parquet_snapshot` run.
+
+    Attributes:
+        rows_upserted (int): Rows inserted or replaced in the snapshot.
+        rows_deleted (int): Rows removed from the snapshot (change tracking only).
+        full_refresh (bool): Whether the snapshot was rebuilt from a full read.
+        watermark (Any): The watermark stored for the next run.
+    """
+
+    rows_upserted: int
+    rows_deleted: int
+    full_refresh: bool
+    watermark: Any
+
+
+def sync_parquet_snapshot(
+    table: str | sqlalchemy.Table,
+    path: str | Path,
+    strategy: SyncStrategy = "change_tracking",
+    watermark_column: str | None = None,
+    engine: sqlalchemy.Engine | None = None,
+    batch_size: int = dataframe_io_config.DEFAULT_STREAM_BATCH_SIZE,
+) -> SyncResult:
+    """
+    Keep the Parquet file at `path` a current snapshot of `table`, reading only the
+    rows changed since the watermark stored next to it (`<path>.sync.json`) and merging
+    them in by primary key. The first run, or a run whose watermark is no longer valid,
+    streams a full copy of the table instead.
+
+    `strategy` picks the change signal:
+        - `"change_tracking"`: SQL Server change tracking, which must be enabled on the
+          table. Picks up inserts, updates and deletes.
+        - `"rowversion"`: a `rowversion` column, `watermark_column`. Bounded by
+          `MIN_ACTIVE_ROWVERSION()`, so rows of in-flight transactions are not skipped.
+          Deletes are not seen.
+        - `"modified_at"`: a last-modified timestamp column, `watermark_column`,
+          maintained by the application. Rows at the watermark are re-read, but a row
+          committed later with an earlier timestamp is missed. Deletes are not seen.
+
+    Every step is idempotent: the snapshot is replaced atomically before the watermark
+    is advanced, and a run interrupted in between re-applies the same changes.
+
+    Raises:
+        ValueError: If `table` has no primary key, `watermark_column` is missing for the
+            strategy, the stored watermark was recorded for a different table or
+            strategy, or change tracking is not enabled on the database or table.
+    """
+    if engine is None:
+        engine = get_sql_connection().engine
+    if isinstance(table, str):
+        schema_name, _, table_name = table.rpartition(".")
+        table = sqlalchemy.Table(
+            table_name,
+            sqlalchemy.MetaData(),
+            schema=schema_name or None,
+            autoload_with=engine,
+        )
+    primary_keys: list[str] = [col.name for col in table.primary_key.columns]
+    if not primary_keys:
+        raise ValueError(f"Table {table.name!r} has no primary key to merge on.")
+    if strategy != "change_tracking" and watermark_column is None:
+        raise ValueError(f"strategy={strategy!r} requires a watermark_column.")
+
+    path = Path(path)
+    state_path = path.with_name(path.name + ".sync.json")
+    state = _SyncState(
+        table_name=str(table),
+        strategy=strategy,
+        watermark_column=watermark_column,
+        path=state_path,
+    )
+    watermark = state.load() if path.exists() else None
+    schema = polars_schema(table)
+
+    syncer: _ChangeTrackingSync | _WatermarkColumnSync
+    match strategy, watermark_column:
+        case "change_tracking", _:
+            syncer = _ChangeTrackingSync(table, engine, primary_keys)
+        case "rowversion", str():
+            syncer = _RowversionSync(table, engine, watermark_column)
+        case "modified_at", str():
+            syncer = _ModifiedAtSync(table, engine, watermark_column)
+        case _:
+            raise ValueError(f"Invalid value for {strategy=}.")
+
+    if watermark is None or not syncer.is_valid(watermark):
+        watermark = syncer.start()
+        n_rows, watermark = _write_full_snapshot(
+            table, engine, path, schema, batch_size, syncer, watermark
+        )
+        state.save(watermark)
+        return SyncResult(n_rows, 0, full_refresh=True, watermark=watermark)
+
+    next_watermark, changed_keys, upserts = syncer.changes(watermark, schema)
+    if not changed_keys.is_empty():
+        tmp_path = path.with_name(path.name + ".tmp")
+        pl.concat(
+            [
+                pl.scan_parquet(path).join(
+                    changed_keys.lazy(), on=primary_keys, how="anti"
+                ),
+                upserts.lazy(),
+            ]
+        ).sink_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    state.save(next_watermark)
+    return SyncResult(
+        rows_upserted=upserts.shape[0],
+        rows_deleted=changed_keys.shape[0] - upserts.shape[0],
+        full_refresh=False,
+        watermark=next_watermark,
+    )
+
+
+def _write_full_snapshot(
+    table: sqlalchemy.Table,
+    engine: sqlalchemy.Engine,
+    path: Path,
+    schema: pl.Schema,
+    batch_size: int,
+    syncer: "_ChangeTrackingSync | _WatermarkColumnSync",
+    watermark: Any,
+) -> tuple[int, Any]:
+    """Stream all of `table` into a new snapshot, batch by batch."""
+    query = sqlalchemy.select(table).compile(engine)
+    tmp_path = path.with_name(path.name + ".tmp")
+    n_rows = 0
+    writer: pq.ParquetWriter | None = None
+    try:
+        batches = read_df(
+            str(query), engine=engine, iter_batches=True, batch_size=batch_size
+        )
+        for batch in batches:
+            batch = batch.cast(schema)  # type: ignore[arg-type]
+            watermark = syncer.advance(watermark, batch)
+            arrow_batch = batch.to_arrow()
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, arrow_batch.schema)
+            writer.write_table(arrow_batch)
+            n_rows += batch.shape[0]
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        pl.DataFrame(schema=schema).write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    return n_rows, watermark
+
+
+class _ChangeTrackingSync:
+    def __init__(
+        self,
+        table: sqlalchemy.Table,
+        engine: sqlalchemy.Engine,
+        primary_keys: list[str],
+    ):
+        self.table = table
+        self.engine = engine
+        self.primary_keys = primary_keys
+
+    def start(self) -> int:
+        """
+        Raises:
+            ValueError: If change tracking is not enabled on the database.
+        """
+        # read before the full copy: changes made during it are re-applied next run
+        version = self._scalar("SELECT CHANGE_TRACKING_CURRENT_VERSION()")
+        if version is None:
+            raise ValueError(
+                "Change tracking is not enabled on the database "
+                f"of {self.table.name!r}."
+            )
+        return version
+
+    def is_valid(self, watermark: int) -> bool:
+        min_valid = self._scalar(
+            "SELECT CHANGE_TRACKING_MIN_VALID_VERSION(OBJECT_ID(:table_name))",
+            {"table_name": str(self.table)},
+        )
+        if min_valid is None:
+            raise ValueError(f"Change tracking is not enabled on {self.table.name!r}.")
+        return watermark >= min_valid
+
+    def advance(self, watermark: int, batch: pl.DataFrame) -> int:
+        return watermark
+
+    def changes(
+        self, watermark: int, schema: pl.Schema
+    ) -> tuple[int, pl.DataFrame, pl.DataFrame]:
+        next_watermark = self.start()
+        quote = self.engine.dialect.identifier_preparer.quote
+        table_sql = self.engine.dialect.identifier_preparer.format_table(self.table)
+        join_on = " AND ".join(
+            f"t.{quote(key)} = ct.{quote(key)}" for key in self.primary_keys
+        )
+        change_keys = ", ".join(
+            f"ct.{quote(key)} AS {quote('__changed__' + key)}"
+            for key in self.primary_keys
+        )
+        columns = ", ".join(f"t.{quote(col.name)}" for col in self.table.columns)
+        changes = read_df(
+            f"SELECT {change_keys}, {columns} "
+            f"FROM CHANGETABLE(CHANGES {table_sql}, {int(watermark)}) AS ct "
+            f"LEFT JOIN {table_sql} AS t ON {join_on}",
+            engine=self.engine,
+        )
+        changed_keys = changes.select(
+            pl.col(f"__changed__{key}").alias(key) for key in self.primary_keys
+        ).cast({key: schema[key] for key in self.primary_keys})
+        # a change whose row no longer exists is a delete
+        upserts = (
+            changes.filter(pl.col(self.primary_keys[0]).is_not_null())
+            .select(list(schema))
+            .cast(schema)  # type: ignore[arg-type]
+        )
+        return next_watermark, changed_keys, upserts
+
+    def _scalar(self, query: str, params: dict[str, Any] | None = None) -> Any:
+        with self.engine.connect() as conn:
+            return conn.execute(sqlalchemy.text(query), params or {}).scalar()
+
+
+class _WatermarkColumnSync(ABC):
+    """Upserts the rows whose `column` is at or past the watermark."""
+
+    def __init__(self, table: sqlalchemy.Table, engine: sqlalchemy.Engine, column: str):
+        self.table = table
+        self.engine = engine
+        self.column = table.c[column]
+
+    def is_valid(self, watermark: Any) -> bool:
+        return True
+
+    def changes(
+        self, watermark: Any, schema: pl.Schema
+    ) -> tuple[Any, pl.DataFrame, pl.DataFrame]:
+        upper = self.start()
+        query = sqlalchemy.select(self.table).where(*self._range(watermark, upper))
+        upserts = read_df(
+            str(query.compile(self.engine, compile_kwargs={"literal_binds": True})),
+            engine=self.engine,
+        ).cast(schema)  # type: ignore[arg-type]
+        primary_keys = [col.name for col in self.table.primary_key.columns]
+        if upper is None:
+            upper = watermark
+        next_watermark = self.advance(upper, upserts)
+        return next_watermark, upserts.select(primary_keys), upserts
+
+    def start(self) -> Any:
+        return None
+
+    def advance(self, watermark: Any, batch: pl.DataFrame) -> Any:
+        return watermark
+
+    @abstractmethod
+    def _range(self, lower: Any, upper: Any) -> list[sqlalchemy.ColumnElement[bool]]:
+        """The filter selecting the rows changed since `lower` (up to `upper`)."""
+
+
+class _RowversionSync(_WatermarkColumnSync):
+    def start(self) -> bytes:
+        # rows of transactions still in flight get rowversions at or above this
+        with self.engine.connect() as conn:
+            query = sqlalchemy.text("SELECT MIN_ACTIVE_ROWVERSION()")
+            return conn.execute(query).scalar()
+
+    def _range(
+        self, lower: bytes, upper: bytes
+    ) -> list[sqlalchemy.ColumnElement[bool]]:
+        return [
+            self.column >= sqlalchemy.literal_column(f"0x{lower.hex()}"),
+            self.column < sqlalchemy.literal_column(f"0x{upper.hex()}"),
+        ]
+
+
+class _ModifiedAtSync(_WatermarkColumnSync):
+    def advance(self, watermark: Any, batch: pl.DataFrame) -> Any:
+        batch_max = batch.get_column(self.column.name).max()
+        if batch_max is None:
+            return watermark
+        return batch_max if watermark is None else max(watermark, batch_max)
+
+    def _range(self, lower: Any, upper: Any) -> list[sqlalchemy.ColumnElement[bool]]:
+        if isinstance(lower, datetime.datetime):
+            # a literal with microseconds would not convert to a `datetime` column
+            lower = sqlalchemy.cast(sqlalchemy.literal(lower), mssql.DATETIME2)
+        return [self.column >= lower]
+
+
+@dataclass(frozen=True)
+class _SyncState:
+    """The watermark of a snapshot, stored as JSON next to it."""
+
+    table_name: str
+    strategy: SyncStrategy
+    watermark_column: str | None
+    path: Path
+
+    def load(self) -> Any:
+        """
+        Raises:
+            ValueError: If the state was recorded for a different table or strategy.
+        """
+        if not self.path.exists():
+            return None
+        stored = json.loads(self.path.read_text())
+        recorded = tuple(
+            stored[key] for key in ("table_name", "strategy", "watermark_column")
+        )
+        if recorded != (self.table_name, self.strategy, self.watermark_column):
+            raise ValueError(
+                f"{self.path} was recorded for table={recorded[0]!r}, "
+                f"strategy={recorded[1]!r}, watermark_column={recorded[2]!r}."
+            )
+        return _decode(stored["watermark"])
+
+    def save(self, watermark: Any) -> None:
+        content = {
+            "table_name": self.table_name,
+            "strategy": self.strategy,
+            "watermark_column": self.watermark_column,
+            "watermark": _encode(watermark),
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(content))
+        os.replace(tmp_path, self.path)
+
+
+def _encode(value: Any) -> dict[str, Any] | None:
+    match value:
+        case None:
+            return None
+        case bytes():
+            return {"type": "bytes", "value": value.hex()}
+        case datetime.datetime():
+            return {"type": "datetime", "value": value.isoformat()}
+        case datetime.date():
+            return {"type": "date", "value": value.isoformat()}
+        case _:
+            return {"type": "value", "value": value}
+
+
+def _decode(encoded: dict[str, Any] | None) -> Any:
+    if encoded is None:
+        return None
+    match encoded["type"]:
+        case "bytes":
+            return bytes.fromhex(encoded["value"])
+        case "datetime":
+            return datetime.datetime.fromisoformat(encoded["value"])
+        case "date":
+            return datetime.date.fromisoformat(encoded["value"])
+        case _:
+            return encoded["value"]
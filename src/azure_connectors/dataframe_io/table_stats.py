@@ -0,0 +1,113 @@
+import threading
+import time
+import weakref
+from dataclasses import dataclass, replace
+
+import sqlalchemy
+
+from azure_connectors.azure_sql import get_sql_connection
+
+from . import dataframe_io_config
+
+PAGE_BYTES: int = 8 * 1024
+
+_TABLE_STATS_QUERY = sqlalchemy.text(
+    """--sql
+    SELECT
+        OBJECT_ID(:table_name) AS object_id,
+        SUM(CASE WHEN index_id IN (0, 1) THEN row_count ELSE 0 END) AS row_count,
+        SUM(CAST(reserved_page_count AS BIGINT)) AS reserved_pages,
+        SUM(CAST(used_page_count AS BIGINT)) AS used_pages,
+        COUNT(CASE WHEN index_id IN (0, 1) THEN 1 END) AS n_partitions
+    FROM sys.dm_db_partition_stats
+    WHERE object_id = OBJECT_ID(:table_name);
+    """
+)
+
+# per engine: table_name -> (monotonic time read, stats)
+_lock = threading.Lock()
+_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class TableStats:
+    """
+    Size statistics of a table, from the catalog rather than a scan.
+
+    Attributes:
+        table_name (str): The table, as passed in.
+        row_count (int): The number of rows in the heap or clustered index.
+        reserved_bytes (int): The space reserved by the table and its indexes.
+        used_bytes (int): The space used by the table and its indexes.
+        n_partitions (int): The number of partitions of the heap or clustered index.
+        exact (bool): Whether `row_count` was counted with `COUNT_BIG(*)`, rather than
+            read from the partition metadata (which is maintained by the engine but not
+            transactionally consistent with in-flight writes).
+    """
+
+    table_name: str
+    row_count: int
+    reserved_bytes: int
+    used_bytes: int
+    n_partitions: int
+    exact: bool = False
+
+
+def get_table_stats(
+    table_name: str,
+    engine: sqlalchemy.Engine | None = None,
+    exact: bool = False,
+    max_age: float | None = dataframe_io_config.DEFAULT_TABLE_STATS_MAX_AGE_SECONDS,
+) -> TableStats:
+    """
+    Get the row count, reserved and used size, and partition count of `table_name` from
+    `sys.dm_db_partition_stats`, which reads metadata only, however large the table.
+
+    `exact=True` additionally counts the rows with `COUNT_BIG(*)`, which scans the
+    smallest index, and always reads the table's current state. Other results are
+    cached per engine for `max_age` seconds (None caches them until
+    `clear_table_stats_cache`; 0 always re-reads).
+
+    Reading the DMV needs the VIEW DATABASE STATE permission.
+
+    Raises:
+        ValueError: If the table does not exist.
+    """
+    if engine is None:
+        engine = get_sql_connection().engine
+
+    with _lock:
+        cached = None if exact else _cache.get(engine, {}).get(table_name)
+    if cached is not None:
+        read_at, stats = cached
+        if max_age is None or time.monotonic() - read_at < max_age:
+            return stats
+
+    with engine.connect() as conn:
+        row = conn.execute(_TABLE_STATS_QUERY, {"table_name": table_name}).one()
+        if row.object_id is None:
+            raise ValueError(f"Table {table_name!r} does not exist.")
+        stats = TableStats(
+            table_name=table_name,
+            row_count=int(row.row_count or 0),
+            reserved_bytes=int(row.reserved_pages or 0) * PAGE_BYTES,
+            used_bytes=int(row.used_pages or 0) * PAGE_BYTES,
+            n_partitions=int(row.n_partitions or 0),
+        )
+        if exact:
+            count_query = sqlalchemy.text(f"SELECT COUNT_BIG(*) FROM {table_name};")
+            row_count = int(conn.execute(count_query).scalar_one())
+            return replace(stats, row_count=row_count, exact=True)
+
+    with _lock:
+        _cache.setdefault(engine, {})[table_name] = (time.monotonic(), stats)
+    return stats
+
+
+def clear_table_stats_cache(engine: sqlalchemy.Engine | None = None) -> None:
+    """Forget the cached statistics of `engine`, or of every engine if None."""
+    with _lock:
+        if engine is None:
+            _cache.clear()
+        else:
+            _cache.pop(engine, None)
@@ -0,0 +1,110 @@
+import uuid
+
+import sqlalchemy
+
+from .utils import identity_insert_sql
+
+
+def create_staging_table(
+    table: sqlalchemy.Table, columns: list[str], engine: sqlalchemy.Engine
+) -> sqlalchemy.Table:
+    """
+    Create an empty, uniquely named copy of `table`'s `columns` and primary key, to
+    bulk-load rows into before merging them into `table`.
+
+    A regular table rather than a `#temp` table, so that every insertion method can
+    load it, including `pl_to_sql_parallel` over several pooled sessions. It has no
+    IDENTITY, foreign keys or defaults; keeping the primary key lets the MERGE join on
+    two clustered indexes. Columns missing from `columns` are left out, since the MERGE
+    never touches them: a NOT NULL column with a server default is filled in by
+    `table` on insert, as for a plain append.
+    """
+    staging_table = sqlalchemy.Table(
+        f"{table.name}__staging_{uuid.uuid4().hex[:8]}",
+        sqlalchemy.MetaData(),
+        *(
+            sqlalchemy.Column(
+                col.name,
+                col.type,
+                primary_key=col.primary_key,
+                nullable=col.nullable,
+                autoincrement=False,
+            )
+            for col in table.columns
+            if col.name in columns
+        ),
+        schema=table.schema,
+    )
+    staging_table.create(engine)
+    return staging_table
+
+
+def build_merge_sql(
+    table: sqlalchemy.Table,
+    staging_table: sqlalchemy.Table,
+    columns: list[str],
+    dialect: sqlalchemy.Dialect,
+) -> str:
+    """
+    Build a `MERGE` that upserts `columns` from `staging_table` into `table` on its
+    primary key. Matched rows are only updated when a value actually differs (a
+    null-safe comparison via `EXCEPT`), so unchanged rows cost no writes or log.
+    """
+    preparer = dialect.identifier_preparer
+    primary_keys: list[str] = [col.name for col in table.primary_key.columns]
+    value_columns = [col for col in columns if col not in primary_keys]
+
+    def qualified(alias: str, cols: list[str]) -> str:
+        return ", ".join(f"{alias}.{preparer.quote(col)}" for col in cols)
+
+    on_clause = " AND ".join(
+        f"target.{preparer.quote(key)} = source.{preparer.quote(key)}"
+        for key in primary_keys
+    )
+    merge_sql = (
+        f"MERGE INTO {preparer.format_table(table)} WITH (HOLDLOCK) AS target\n"
+        f"USING {preparer.format_table(staging_table)} AS source\n"
+        f"ON {on_clause}\n"
+    )
+    if value_columns:
+        set_clause = ", ".join(
+            f"target.{preparer.quote(col)} = source.{preparer.quote(col)}"
+            for col in value_columns
+        )
+        merge_sql += (
+            f"WHEN MATCHED AND EXISTS (\n"
+            f"    SELECT {qualified('source', value_columns)}\n"
+            f"    EXCEPT SELECT {qualified('target', value_columns)}\n"
+            f") THEN UPDATE SET {set_clause}\n"
+        )
+    column_list = ", ".join(preparer.quote(col) for col in columns)
+    merge_sql += (
+        f"WHEN NOT MATCHED BY TARGET THEN INSERT ({column_list})\n"
+        f"VALUES ({qualified('source', columns)});"
+    )
+    return merge_sql
+
+
+def merge_from_staging(
+    table: sqlalchemy.Table,
+    staging_table: sqlalchemy.Table,
+    columns: list[str],
+    engine: sqlalchemy.Engine,
+) -> int:
+    """
+    Upsert the rows of `staging_table` into `table` in one set-based `MERGE`, in a
+    single transaction.
+
+    Returns:
+        int: The number of rows inserted or updated.
+    """
+    merge_sql = build_merge_sql(table, staging_table, columns, engine.dialect)
+    identity_insert = identity_insert_sql(table, columns, engine.dialect)
+
+    with engine.begin() as conn:
+        if identity_insert is not None:
+            conn.exec_driver_sql(identity_insert[0])
+        result = conn.exec_driver_sql(merge_sql)
+        if identity_insert is not None:
+            conn.exec_driver_sql(identity_insert[1])
+    return result.rowcount
@@ -1,4 +1,5 @@
 import polars as pl
+import sqlalchemy
 
 
 def find_n_chunks(df: pl.DataFrame, chunk_size: int) -> int:
@@ -12,3 +13,48 @@ def get_user_confirmation(question: str) -> None:
     user_input = input(f"{question}\n\tType 'Y' or 'y' to proceed: ").strip()
     if user_input.lower() != "y":
         raise ValueError("Operation aborted by the user.")
+
+
+def build_insert_sql(
+    table: sqlalchemy.Table, columns: list[str], dialect: sqlalchemy.Dialect
+) -> str:
+    """
+    Build a positional (`?`) INSERT statement for `columns` of `table`, quoted for
+    `dialect`. Used with raw pyodbc cursors, which only accept qmark parameters.
+    """
+    preparer = dialect.identifier_preparer
+    column_list = ", ".join(preparer.quote(col) for col in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    return (
+        f"INSERT INTO {preparer.format_table(table)} ({column_list}) "
+        f"VALUES ({placeholders})"
+    )
+
+
+def get_identity_column(table: sqlalchemy.Table) -> sqlalchemy.Column | None:
+    """
+    The column SQL Server creates as IDENTITY for `table`, if any: an explicit
+    `Identity()` column, or the integer primary key SQLAlchemy marks as autoincrement.
+    Inserting explicit values into it requires `SET IDENTITY_INSERT ... ON`.
+    """
+    for col in table.columns:
+        if col.identity is not None:
+            return col
+    return table.autoincrement_column
+
+
+def identity_insert_sql(
+    table: sqlalchemy.Table, columns: list[str], dialect: sqlalchemy.Dialect
+) -> tuple[str, str] | None:
+    """
+    The `SET IDENTITY_INSERT` ON/OFF statements needed to insert `columns` into
+    `table`, or None if no identity column is among them.
+    """
+    identity_column = get_identity_column(table)
+    if identity_column is None or identity_column.name not in columns:
+        return None
+    table_sql = dialect.identifier_preparer.format_table(table)
+    return (
+        f"SET IDENTITY_INSERT {table_sql} ON",
+        f"SET IDENTITY_INSERT {table_sql} OFF",
+    )
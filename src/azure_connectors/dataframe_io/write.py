@@ -1,24 +1,65 @@
+import logging
+from pathlib import Path
 from typing import Literal
 
 import polars as pl
 import sqlalchemy
 
-from azure_connectors import AzureSqlConnection
+from azure_connectors.azure_sql import get_sql_connection
 from azure_connectors.dataframe_io.utils import get_user_confirmation
 
 from . import dataframe_io_config
-from .insertion_methods import pl_to_sql_row_by_row, pl_to_sql_via_pandas
-from .read import get_table_len
+from .checkpoint import ChunkLedger
+from .chunk_sizing import AdaptiveChunkSizer, ChunkSize, initial_chunk_size
+from .insertion_methods import (pl_to_sql_fast_executemany, pl_to_sql_parallel,
+                                pl_to_sql_row_by_row, pl_to_sql_via_pandas)
+from .metrics import IOObserver
+from .primary_key import check_primary_key_unique
+from .retry import RetryPolicy
+from .resume import (has_orderable_key, is_sorted_by, resume_after_watermark,
+                     resume_by_anti_join)
+from .streaming import iter_lazyframe_batches, prefetch
+from .upsert import create_staging_table, merge_from_staging
+
+InsertionMethod = Literal[
+    "pl_to_sql_via_pandas",
+    "pl_to_sql_row_by_row",
+    "pl_to_sql_fast_executemany",
+    "pl_to_sql_parallel",
+]
+
+logger = logging.getLogger(__name__)
 
 
 def write_df(
     df: pl.DataFrame | pl.LazyFrame,
     table_name: str,
     if_table_exists: Literal["append", "replace", "fail"],
+    stream_batch_size: int | None = None,
+    observer: IOObserver | None = None,
 ) -> None:
-    sql_info = AzureSqlConnection.from_env()
+    """
+    If `df` is a LazyFrame and `stream_batch_size` is given, it is computed and written
+    `stream_batch_size` rows at a time (see `write_df_from_sqltable`).
+
+    `observer` receives a `ChunkEvent` per write (see `write_df_from_sqltable`).
+    """
+    sql_info = get_sql_connection()
     engine: sqlalchemy.Engine = sql_info.engine
 
+    if isinstance(df, pl.LazyFrame) and stream_batch_size is not None:
+        for i, batch in enumerate(
+            prefetch(iter_lazyframe_batches(df, batch_size=stream_batch_size))
+        ):
+            pl_to_sql_via_pandas(
+                batch,
+                table_name=table_name,
+                if_table_exists=if_table_exists if i == 0 else "append",
+                engine=engine,
+                observer=observer,
+            )
+        return
+
     if isinstance(df, pl.LazyFrame):
         df = df.collect()
 
@@ -27,19 +68,74 @@ def write_df(
         table_name=table_name,
         if_table_exists=if_table_exists,
         engine=engine,
+        observer=observer,
     )
 
 
 def write_df_from_sqltable(
     df: pl.DataFrame | pl.LazyFrame,
-    if_table_exists: Literal["append", "replace", "fail", "resume"],
+    if_table_exists: Literal["append", "replace", "fail", "resume", "upsert"],
     table: sqlalchemy.Table,
-    chunk_size: int = dataframe_io_config.DEFAULT_WRITE_CHUNKSIZE,
-    insertion_method: Literal[
-        "pl_to_sql_via_pandas", "pl_to_sql_row_by_row"
-    ] = "pl_to_sql_row_by_row",
+    chunk_size: ChunkSize = dataframe_io_config.DEFAULT_WRITE_CHUNKSIZE,
+    insertion_method: InsertionMethod | None = None,
+    max_workers: int = dataframe_io_config.DEFAULT_MAX_WORKERS,
+    checkpoint_path: str | Path | None = None,
+    stream_batch_size: int | None = None,
+    resume_strategy: Literal["auto", "watermark", "anti_join"] = "auto",
+    check_primary_key: bool = True,
+    observer: IOObserver | None = None,
+    retry_policy: RetryPolicy | None = RetryPolicy(),
 ) -> None:
     """
+    `observer` receives a `ChunkEvent` for every chunk written (rows, bytes, encode,
+    execute and commit time, retries, fallbacks, errors), e.g. a `MetricsAggregator`
+    for headless jobs. Without one, progress is shown with a tqdm bar.
+
+    `if_table_exists="upsert"` inserts new rows and updates existing ones, matched on
+    `table.primary_key`, without rewriting the table: `df` is bulk-loaded with
+    `insertion_method` into a staging copy of `table`, then merged in with one set-based
+    `MERGE` that only touches rows whose values changed. The staging table is dropped
+    afterwards, whether or not the merge succeeded, and the number of rows merged is
+    logged (logger `azure_connectors.dataframe_io.write`, level INFO).
+
+    `insertion_method` defaults to `"pl_to_sql_fast_executemany"` for upserts, whose
+    staging table has no constraints beyond its primary key, and to
+    `"pl_to_sql_row_by_row"` otherwise.
+
+    Chunks failing with transient Azure SQL errors (throttling, failover, dropped
+    connections, deadlocks) are retried with jittered exponential backoff per
+    `retry_policy` on a fresh connection, replaying only the failed chunk. Before a
+    replay, the chunk's first primary key is looked up, so a chunk whose commit landed
+    before the connection dropped is not inserted twice. Pass `retry_policy=None` to
+    fail fast. Not applied to `pl_to_sql_via_pandas`.
+
+    `check_primary_key=False` skips the uniqueness check on `table.primary_key`, for
+    callers that already guarantee it (the server still enforces the constraint).
+
+    With `if_table_exists="resume"`, rows already in the table are skipped according to
+    `resume_strategy`:
+        - `"watermark"`: reads the table's largest primary key with one index seek and
+          writes only the rows above it, in primary-key order. Only exact if the earlier
+          run wrote the rows in primary-key order too: rows below the watermark that
+          were never written are skipped. Not available for `pl_to_sql_parallel`
+          (chunks commit out of order; use `checkpoint_path` instead), nor for string
+          or UNIQUEIDENTIFIER keys, which SQL Server does not order the way Polars does.
+        - `"anti_join"`: reads all committed primary keys and anti-joins them away. Exact
+          for any write order, including streamed LazyFrames that are not key-ordered.
+        - `"auto"` (default): `"watermark"` for a DataFrame that is already sorted by a
+          key SQL Server orders the same way, written sequentially; else `"anti_join"`.
+
+    If `df` is a LazyFrame and `stream_batch_size` is given, the frame is never fully
+    materialized: it is computed `stream_batch_size` rows at a time (Polars streaming
+    engine where available), with the next batch computed on a background thread while
+    the current one is written by `insertion_method`. Peak memory is then bounded by
+    the batch size rather than the table size. Note that the primary-key check runs as
+    a separate streaming pass over `df` before any batch is written.
+
+    `max_workers` and `checkpoint_path` apply to `insertion_method="pl_to_sql_parallel"`.
+    With a `checkpoint_path`, the committed chunks are recorded there, and a `"resume"`
+    run with the same path, frame and `chunk_size` writes exactly the missing chunks.
+
     `table` param example:
 
     ```python
@@ -53,33 +149,41 @@ def write_df_from_sqltable(
     )
     ```
     """
-    sql_info = AzureSqlConnection.from_env()
+    streaming: bool = isinstance(df, pl.LazyFrame) and stream_batch_size is not None
+    if insertion_method is None:
+        insertion_method = (
+            "pl_to_sql_fast_executemany"
+            if if_table_exists == "upsert"
+            else "pl_to_sql_row_by_row"
+        )
+
+    if checkpoint_path is not None and insertion_method != "pl_to_sql_parallel":
+        raise ValueError(
+            f"checkpoint_path is only supported with insertion_method='pl_to_sql_parallel', got {insertion_method=}"
+        )
+    if checkpoint_path is not None and streaming:
+        raise ValueError("checkpoint_path is not supported with stream_batch_size.")
+    if checkpoint_path is not None and if_table_exists == "upsert":
+        raise ValueError("checkpoint_path is not supported with if_table_exists='upsert'.")
+
+    sql_info = get_sql_connection()
     engine: sqlalchemy.Engine = sql_info.engine
 
-    if isinstance(df, pl.LazyFrame):
+    if isinstance(df, pl.LazyFrame) and not streaming:
         df = df.collect()
 
     # PRIMARY KEY CHECKS
     primary_keys: list[str] = [col.name for col in table.primary_key.columns]
-    if not all(k in df.columns for k in primary_keys):
+    df_columns: list[str] = df.collect_schema().names()
+    if not all(k in df_columns for k in primary_keys):
         raise ValueError(
-            f"At least one primary key is missing from the columns.\n{primary_keys=}\n{df.columns=}"
+            f"At least one primary key is missing from the columns.\n{primary_keys=}\n{df_columns=}"
         )
     if len(primary_keys) == 0:
         raise ValueError("Must provide a primary key:\n", table)
 
-    any_pk_rows_duplicated: bool = df.select(
-        pl.any_horizontal(pl.col(primary_keys).is_duplicated().any())
-    ).item()
-    if any_pk_rows_duplicated:
-        offending_observations = df.filter(pl.col(primary_keys).is_duplicated()).sort(
-            primary_keys
-        )
-        raise ValueError(
-            f"df must be unique on {primary_keys=}.",
-            "The following observations have >1 unique value corresponding to the same unique primary_key (i.e., these are the observations causing this error):",
-            offending_observations,
-        )
+    if check_primary_key:
+        check_primary_key_unique(df, primary_keys)
     # / PRIMARY KEY CHECKS
 
     inspector = sqlalchemy.inspect(engine)
@@ -103,37 +207,223 @@ def write_df_from_sqltable(
                 table.drop(engine, checkfirst=True)
                 table_exists = False
             pass
-        case "append":
+        case "append" | "upsert":
             pass
         case "resume":
-            if table_exists:
-                current_table_len: int = get_table_len(table.name)
-                df = df.slice(offset=current_table_len)
-                get_user_confirmation(
-                    f"Resuming upload of `{table.name}` from row {current_table_len:_}. {df.shape[0]:_} rows remaining, or {df.shape[0]//chunk_size:_} chunks of size {chunk_size:_}."
-                )
+            if table_exists and checkpoint_path is None:
+                if resume_strategy == "auto":
+                    # the watermark is only exact for rows written in key order
+                    watermark_is_exact = (
+                        isinstance(df, pl.DataFrame)
+                        and insertion_method != "pl_to_sql_parallel"
+                        and has_orderable_key(table)
+                        and is_sorted_by(df, primary_keys)
+                    )
+                    resume_strategy = "watermark" if watermark_is_exact else "anti_join"
+
+                match resume_strategy:
+                    case "watermark":
+                        if insertion_method == "pl_to_sql_parallel":
+                            raise ValueError(
+                                "resume_strategy='watermark' is not supported with insertion_method='pl_to_sql_parallel'; pass checkpoint_path or use resume_strategy='anti_join'."
+                            )
+                        if not has_orderable_key(table):
+                            raise ValueError(
+                                "resume_strategy='watermark' is not supported for string or UNIQUEIDENTIFIER primary keys; use resume_strategy='anti_join'."
+                            )
+                        df = resume_after_watermark(df, table=table, engine=engine)
+                        # the remaining rows are written in key order, so that the
+                        # watermark stays exact if this run is interrupted too
+                        if isinstance(df, pl.DataFrame) and not is_sorted_by(
+                            df, primary_keys
+                        ):
+                            df = df.sort(primary_keys)
+                    case "anti_join":
+                        df = resume_by_anti_join(df, table=table, engine=engine)
+                    case _:
+                        raise ValueError(
+                            f"{resume_strategy=} not in ['auto', 'watermark', 'anti_join']"
+                        )
+
+                if isinstance(df, pl.LazyFrame):
+                    get_user_confirmation(
+                        f"Resuming upload of `{table.name}` ({resume_strategy=})."
+                    )
+                else:
+                    get_user_confirmation(
+                        f"Resuming upload of `{table.name}` ({resume_strategy=}). {df.shape[0]:_} rows remaining, with {chunk_size=}."
+                    )
         case _:
-            raise ValueError('if_table_exists not in ["append", "replace", "fail"].')
+            raise ValueError(
+                'if_table_exists not in ["append", "replace", "fail", "resume", "upsert"].'
+            )
 
     # create table
     if not table_exists:
-        print("Creating table")
+        logger.info("Creating table `%s`.", table.name)
         table.create(engine, checkfirst=True)
 
-    # cast `resume`
+    # cast `resume` and `upsert`
     if_table_exists_no_resume: Literal["append", "replace", "fail"] = (
-        "append" if if_table_exists == "resume" else if_table_exists
+        "append" if if_table_exists in ("resume", "upsert") else if_table_exists
     )
 
     # insert data
+    if if_table_exists == "upsert" and table_exists:
+        columns: list[str] = [
+            col.name for col in table.columns if col.name in df_columns
+        ]
+        staging_table = create_staging_table(table, columns, engine)
+        try:
+            _write_rows(
+                df,
+                table=staging_table,
+                engine=engine,
+                insertion_method=insertion_method,
+                if_table_exists="append",
+                chunk_size=chunk_size,
+                max_workers=max_workers,
+                stream_batch_size=stream_batch_size,
+                observer=observer,
+                retry_policy=retry_policy,
+            )
+            n_upserted = merge_from_staging(table, staging_table, columns, engine)
+            logger.info("Upserted %d rows into `%s`.", n_upserted, table.name)
+        finally:
+            staging_table.drop(engine, checkfirst=True)
+        return
+
+    _write_rows(
+        df,
+        table=table,
+        engine=engine,
+        insertion_method=insertion_method,
+        if_table_exists=if_table_exists_no_resume,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+        stream_batch_size=stream_batch_size,
+        checkpoint_path=checkpoint_path,
+        resume=if_table_exists == "resume",
+        observer=observer,
+        retry_policy=retry_policy,
+    )
+
+
+def _write_rows(
+    df: pl.DataFrame | pl.LazyFrame,
+    table: sqlalchemy.Table,
+    engine: sqlalchemy.Engine,
+    insertion_method: InsertionMethod,
+    if_table_exists: Literal["append", "replace", "fail"],
+    chunk_size: ChunkSize,
+    max_workers: int,
+    stream_batch_size: int | None,
+    checkpoint_path: str | Path | None = None,
+    resume: bool = False,
+    observer: IOObserver | None = None,
+    retry_policy: RetryPolicy | None = None,
+) -> None:
+    if isinstance(df, pl.LazyFrame) and stream_batch_size is not None:
+        batches = prefetch(iter_lazyframe_batches(df, batch_size=stream_batch_size))
+        batch_chunk_size: int | AdaptiveChunkSizer | None = None
+        for i, batch in enumerate(batches):
+            # resolved once, so an adaptive sizer keeps learning across batches
+            if batch_chunk_size is None:
+                batch_chunk_size = _resolve_chunk_size(
+                    batch, chunk_size, insertion_method
+                )
+            _insert_df(
+                batch,
+                table=table,
+                engine=engine,
+                insertion_method=insertion_method,
+                if_table_exists=if_table_exists if i == 0 else "append",
+                chunk_size=batch_chunk_size,
+                max_workers=max_workers,
+                observer=observer,
+                retry_policy=retry_policy,
+            )
+        return
+
+    if isinstance(df, pl.LazyFrame):
+        df = df.collect()
+
+    resolved_chunk_size = _resolve_chunk_size(df, chunk_size, insertion_method)
+
+    ledger: ChunkLedger | None = None
+    if insertion_method == "pl_to_sql_parallel":
+        if resume:
+            ledger = ChunkLedger.load(
+                checkpoint_path,
+                table_name=table.name,
+                chunk_size=_fixed_chunk_size(resolved_chunk_size),
+                n_rows=df.shape[0],
+            )
+        else:
+            ledger = ChunkLedger(
+                table_name=table.name,
+                chunk_size=_fixed_chunk_size(resolved_chunk_size),
+                n_rows=df.shape[0],
+                path=None if checkpoint_path is None else Path(checkpoint_path),
+            )
+
+    _insert_df(
+        df,
+        table=table,
+        engine=engine,
+        insertion_method=insertion_method,
+        if_table_exists=if_table_exists,
+        chunk_size=resolved_chunk_size,
+        max_workers=max_workers,
+        ledger=ledger,
+        observer=observer,
+        retry_policy=retry_policy,
+    )
+
+
+def _resolve_chunk_size(
+    df: pl.DataFrame, chunk_size: ChunkSize, insertion_method: InsertionMethod
+) -> int | AdaptiveChunkSizer:
+    """Turn `chunk_size="auto"` into a starting size, or a sizer for sequential methods."""
+    if chunk_size != "auto":
+        return chunk_size
+    match insertion_method:
+        case "pl_to_sql_via_pandas":
+            return initial_chunk_size(df, parameter_limited=True)
+        case "pl_to_sql_parallel":
+            # the chunk ledger indexes fixed-size chunks
+            return initial_chunk_size(df)
+        case _:
+            return AdaptiveChunkSizer.for_df(df)
+
+
+def _fixed_chunk_size(chunk_size: int | AdaptiveChunkSizer) -> int:
+    if isinstance(chunk_size, AdaptiveChunkSizer):
+        return chunk_size.chunk_size
+    return chunk_size
+
+
+def _insert_df(
+    df: pl.DataFrame,
+    table: sqlalchemy.Table,
+    engine: sqlalchemy.Engine,
+    insertion_method: InsertionMethod,
+    if_table_exists: Literal["append", "replace", "fail"],
+    chunk_size: int | AdaptiveChunkSizer,
+    max_workers: int,
+    ledger: ChunkLedger | None = None,
+    observer: IOObserver | None = None,
+    retry_policy: RetryPolicy | None = None,
+) -> None:
     match insertion_method:
         case "pl_to_sql_via_pandas":
             pl_to_sql_via_pandas(
                 df,
                 table_name=table.name,
-                if_table_exists=if_table_exists_no_resume,
+                if_table_exists=if_table_exists,
                 engine=engine,
-                chunk_size=chunk_size,
+                chunk_size=_fixed_chunk_size(chunk_size),
+                observer=observer,
             )
         case "pl_to_sql_row_by_row":
             pl_to_sql_row_by_row(
@@ -141,10 +431,32 @@ def write_df_from_sqltable(
                 table=table,
                 engine=engine,
                 chunk_size=chunk_size,
+                observer=observer,
+                retry_policy=retry_policy,
+            )
+        case "pl_to_sql_fast_executemany":
+            pl_to_sql_fast_executemany(
+                df,
+                table=table,
+                engine=engine,
+                chunk_size=chunk_size,
+                observer=observer,
+                retry_policy=retry_policy,
+            )
+        case "pl_to_sql_parallel":
+            pl_to_sql_parallel(
+                df,
+                table=table,
+                engine=engine,
+                chunk_size=_fixed_chunk_size(chunk_size),
+                max_workers=max_workers,
+                ledger=ledger,
+                observer=observer,
+                retry_policy=retry_policy,
             )
         case _:
             raise ValueError(
-                f"{insertion_method=} not in ['pl_to_sql_via_pandas', 'pl_to_sql_row_by_row']"
+                f"{insertion_method=} not in ['pl_to_sql_via_pandas', 'pl_to_sql_row_by_row', 'pl_to_sql_fast_executemany', 'pl_to_sql_parallel']"
             )
 
 
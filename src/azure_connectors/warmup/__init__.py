@@ -0,0 +1,3 @@
+from .warmup import WarmupReport as WarmupReport
+from .warmup import WarmupStep as WarmupStep
+from .warmup import warm_up as warm_up
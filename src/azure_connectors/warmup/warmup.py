@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from azure_connectors.azure_sql import get_sql_connection
+from azure_connectors.config import CredentialScope
+from azure_connectors.credential import get_token_provider
+from azure_connectors.credential.enums import CredentialSource
+from azure_connectors.credential.settings import AzureCredentialSettings
+
+DEFAULT_WARMUP_DEADLINE_SECONDS: float = 10.0
+
+
+@dataclass(frozen=True)
+class WarmupStep:
+    """
+    The outcome of one warm-up task.
+
+    Attributes:
+        name (str): What was warmed up, e.g. "token <scope>" or "sql connection 2".
+        seconds (Optional[float]): How long it took, or None if it had not finished by
+            the deadline (it then carries on in the background).
+        error (Optional[BaseException]): The error it failed with, if any.
+    """
+
+    name: str
+    seconds: Optional[float]
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the task finished in time and without error."""
+        return self.seconds is not None and self.error is None
+
+
+@dataclass(frozen=True)
+class WarmupReport:
+    """
+    The outcome of `warm_up`.
+
+    Attributes:
+        steps (tuple[WarmupStep, ...]): One step per token scope and SQL connection.
+        seconds (float): The wall-clock time of the whole warm-up.
+    """
+
+    steps: tuple[WarmupStep, ...]
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        """Whether every step finished in time and without error."""
+        return all(step.ok for step in self.steps)
+
+
+def warm_up(
+    scopes: Iterable[CredentialScope] = tuple(CredentialScope),
+    sql_connections: int = 1,
+    deadline: Optional[float] = DEFAULT_WARMUP_DEADLINE_SECONDS,
+    source: Optional[CredentialSource] = None,
+) -> WarmupReport:
+    """
+    Fetch the tokens for `scopes` and open `sql_connections` pooled connections of the
+    shared SQL connection (see `get_sql_connection`), all concurrently, so that the
+    first real request of a job does not pay for them one after another.
+
+    Tokens go into the shared token providers, which every SQL connection and SDK
+    client of the credential source draws on (and which keep them refreshed).
+    Scopes with the same value (e.g. the storage scopes) are fetched once. The SQL
+    connections are returned to the engine's pool, which keeps up to its `pool_size`.
+
+    Waits at most `deadline` seconds (None waits for everything). Tasks still running
+    then are reported as unfinished and complete in the background. Failures are
+    reported per step rather than raised.
+
+    Args:
+        scopes (Iterable[CredentialScope]): The scopes to fetch tokens for.
+        sql_connections (int): The number of SQL connections to open; 0 for none.
+        deadline (Optional[float]): The longest to wait, in seconds.
+        source (Optional[CredentialSource]): The source of the credentials. If not
+            provided, it will be read from the environment.
+
+    Returns:
+        WarmupReport: The per-step timings and errors.
+    """
+    start = time.perf_counter()
+    tasks: dict[str, Callable[[], Any]] = {}
+    for scope_value in dict.fromkeys(str(scope.value) for scope in scopes):
+        tasks[f"token {scope_value}"] = _token_task(scope_value, source)
+    for i in range(sql_connections):
+        tasks[f"sql connection {i + 1}"] = lambda: _open_sql_connection(source)
+
+    timings: dict[str, float] = {}
+    executor = ThreadPoolExecutor(max_workers=max(len(tasks), 1))
+    futures: dict[str, Future] = {}
+    for name, task in tasks.items():
+        futures[name] = executor.submit(_timed, task, name, timings)
+    done, _ = wait(futures.values(), timeout=deadline)
+    # the SQL connections were held open so that each task opened its own one;
+    # returning them now leaves them in the pool (late ones return when they finish)
+    for future in futures.values():
+        future.add_done_callback(_close_connection)
+    executor.shutdown(wait=False)
+
+    steps = []
+    for name, future in futures.items():
+        if future not in done:
+            steps.append(WarmupStep(name, seconds=None))
+        else:
+            steps.append(
+                WarmupStep(name, seconds=timings.get(name), error=future.exception())
+            )
+    return WarmupReport(steps=tuple(steps), seconds=time.perf_counter() - start)
+
+
+def _token_task(
+    scope_value: str, source: Optional[CredentialSource]
+) -> Callable[[], Any]:
+    def fetch_token() -> None:
+        settings = _credential_settings(CredentialScope(scope_value), source)
+        get_token_provider(settings).get_token()
+
+    return fetch_token
+
+
+def _open_sql_connection(source: Optional[CredentialSource]) -> Any:
+    return get_sql_connection(source=source).engine.connect()
+
+
+def _credential_settings(
+    scope: CredentialScope, source: Optional[CredentialSource]
+) -> AzureCredentialSettings:
+    if source is None:
+        return AzureCredentialSettings(scope=scope)
+    return AzureCredentialSettings(scope=scope, source=source)
+
+
+def _timed(task: Callable[[], Any], name: str, timings: dict[str, float]) -> Any:
+    start = time.perf_counter()
+    try:
+        return task()
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+def _close_connection(future: Future) -> None:
+    if future.exception() is None and hasattr(future.result(), "close"):
+        future.result().close()
@@ -2,7 +2,8 @@
 import importlib
 
 import pytest
-from utils import EnvDict, EnvSet, create_envfile_content, reload_all_modules
+from utils import (EnvDict, EnvSet, create_envfile_content, reload_all_modules,
+                   restore_modules, snapshot_modules)
 
 ENV_FILE_ENV_VAR = "AZURE_CONNECTORS_ENV_FILE"
 
@@ -41,6 +42,7 @@ def setup_env(monkeypatch, tmp_path, request):
                 monkeypatch.setenv(var, value)
 
     # Reload all modules in the 'src' directory to ensure they pick up the new environment variables
+    modules = snapshot_modules()
     reload_all_modules()
 
     yield passed_vars
@@ -53,7 +55,8 @@ def setup_env(monkeypatch, tmp_path, request):
         for var in all_vars:
             monkeypatch.delenv(var, raising=False)
 
-    reload_all_modules()
+    # Put the original modules back, so that other tests' imports stay valid
+    restore_modules(modules)
 
 
 @pytest.fixture
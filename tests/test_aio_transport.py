@@ -0,0 +1,65 @@
+import asyncio
+import gc
+import sys
+import types
+import weakref
+
+import azure.core.pipeline.transport
+import pytest
+
+from azure_connectors.client_factory.aio_transport import (close_shared_session,
+                                                           get_shared_transport)
+
+
+class FakeClientSession:
+    def __init__(self, connector):
+        self.connector = connector
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAioHttpTransport:
+    def __init__(self, session, session_owner):
+        self.session = session
+        self.session_owner = session_owner
+
+
+@pytest.fixture
+def fake_aiohttp(monkeypatch):
+    aiohttp = types.ModuleType("aiohttp")
+    aiohttp.TCPConnector = lambda **kwargs: kwargs  # type: ignore[attr-defined]
+    aiohttp.ClientSession = FakeClientSession  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "aiohttp", aiohttp)
+    # bypasses the module's lazy attribute lookup, which imports aiohttp
+    monkeypatch.setitem(
+        vars(azure.core.pipeline.transport), "AioHttpTransport", FakeAioHttpTransport
+    )
+
+
+def test_transports_share_one_session_per_loop(fake_aiohttp):
+    async def transports():
+        first, second = get_shared_transport(), get_shared_transport()
+        session = first.session
+        await close_shared_session()
+        return first, second, session
+
+    first, second, session = asyncio.run(transports())
+    assert first.session is second.session
+    assert not first.session_owner
+    assert session.closed
+
+    other_loop, _, _ = asyncio.run(transports())
+    assert other_loop.session is not session
+
+
+def test_session_does_not_keep_its_loop_alive(fake_aiohttp):
+    async def transport():
+        get_shared_transport()
+        return weakref.ref(asyncio.get_running_loop())
+
+    loop_ref = asyncio.run(transport())
+    gc.collect()
+    assert loop_ref() is None
@@ -0,0 +1,39 @@
+import sys
+import types
+
+from pydantic import SecretBytes
+
+from azure_connectors.azure_sql import AzureSqlConnection
+from azure_connectors.azure_sql.constants import SQL_COPT_SS_ACCESS_TOKEN
+from azure_connectors.azure_sql.settings import AzureSqlSettings
+
+
+class FakeCredential:
+    token = SecretBytes(b"packed-token")
+
+
+def test_arrow_connection_string_has_no_driver_keyword():
+    settings = AzureSqlSettings(server="myserver.database.windows.net", database="db")
+    assert settings.arrow_connection_string == (
+        "Server=myserver.database.windows.net;Database=db;"
+    )
+    assert "driver" not in settings.arrow_connection_string.lower()
+
+
+def test_arrow_connection_uses_arrow_connection_string(monkeypatch):
+    calls = []
+    fake_driver = types.ModuleType("mssql_python")
+    fake_driver.connect = lambda *args, **kwargs: calls.append(  # type: ignore
+        (args, kwargs)
+    )
+    monkeypatch.setitem(sys.modules, "mssql_python", fake_driver)
+
+    settings = AzureSqlSettings(server="myserver.database.windows.net", database="db")
+    connection = AzureSqlConnection(
+        settings=settings, credential=FakeCredential()  # type: ignore[arg-type]
+    )
+    connection.arrow_connection()
+
+    ((args, kwargs),) = calls
+    assert args == (settings.arrow_connection_string,)
+    assert kwargs == {"attrs_before": {SQL_COPT_SS_ACCESS_TOKEN: b"packed-token"}}
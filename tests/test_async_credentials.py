@@ -0,0 +1,36 @@
+import asyncio
+import gc
+import weakref
+
+from azure_connectors.config import CredentialScope
+from azure_connectors.credential.aio import (close_async_credentials,
+                                             get_async_base_credential)
+from azure_connectors.credential.enums import CredentialSource
+from azure_connectors.credential.settings import AzureCredentialSettings
+
+settings = AzureCredentialSettings(
+    source=CredentialSource.CLI, scope=CredentialScope.AZURE_BLOB
+)
+
+
+def test_async_credentials_are_shared_per_event_loop():
+    async def credentials():
+        first = get_async_base_credential(settings)
+        second = get_async_base_credential(settings)
+        await close_async_credentials()
+        return first, second
+
+    first, second = asyncio.run(credentials())
+    assert first is second
+    other_loop, _ = asyncio.run(credentials())
+    assert other_loop is not first
+
+
+def test_async_credentials_do_not_keep_their_loop_alive():
+    async def credential_loop():
+        get_async_base_credential(settings)
+        return weakref.ref(asyncio.get_running_loop())
+
+    loop_ref = asyncio.run(credential_loop())
+    gc.collect()
+    assert loop_ref() is None
@@ -0,0 +1,67 @@
+import io
+import threading
+
+import polars as pl
+import pytest
+import sqlalchemy
+
+from azure_connectors.dataframe_io.blob_export import export_parquet_to_blob
+
+
+class FakeBlobClient:
+    def __init__(self, fail_on_block: int | None = None):
+        self.fail_on_block = fail_on_block
+        self.staged: dict[str, bytes] = {}
+        self.committed: bytes | None = None
+        self._lock = threading.Lock()
+
+    def stage_block(self, block_id, data, length=None):
+        with self._lock:
+            if self.fail_on_block == len(self.staged):
+                raise OSError("upload failed")
+            self.staged[block_id] = data
+
+    def commit_block_list(self, block_list, content_settings=None):
+        self.committed = b"".join(self.staged[block.id] for block in block_list)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("CREATE TABLE items (id INTEGER, name TEXT)"))
+        conn.execute(
+            sqlalchemy.text("INSERT INTO items VALUES (:id, :name)"),
+            [{"id": i, "name": f"item {i}"} for i in range(1_000)],
+        )
+    return engine
+
+
+def test_export_stages_row_groups_as_blocks(engine):
+    blob_client = FakeBlobClient()
+    result = export_parquet_to_blob(
+        "SELECT id, name FROM items ORDER BY id",
+        blob_client=blob_client,  # type: ignore[arg-type]
+        engine=engine,
+        batch_size=300,
+        block_size=1_024,
+    )
+    assert (result.rows, result.row_groups) == (1_000, 4)
+    assert result.blocks == len(blob_client.staged) > 1
+    assert result.bytes == len(blob_client.committed)
+
+    df = pl.read_parquet(io.BytesIO(blob_client.committed))
+    assert df.get_column("id").to_list() == list(range(1_000))
+
+
+def test_failed_upload_does_not_commit(engine):
+    blob_client = FakeBlobClient(fail_on_block=2)
+    with pytest.raises(OSError):
+        export_parquet_to_blob(
+            "SELECT id, name FROM items",
+            blob_client=blob_client,  # type: ignore[arg-type]
+            engine=engine,
+            batch_size=300,
+            block_size=1_024,
+        )
+    assert blob_client.committed is None
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from azure_connectors.dataframe_io.checkpoint import ChunkLedger
+
+
+def test_contiguous_prefix():
+    ledger = ChunkLedger(table_name="t", chunk_size=10, n_rows=100)
+    assert ledger.contiguous_committed == 0
+    ledger.mark_committed(1)
+    ledger.mark_committed(3)
+    assert ledger.contiguous_committed == 0
+    ledger.mark_committed(0)
+    assert ledger.contiguous_committed == 2
+    ledger.mark_committed(2)
+    assert ledger.contiguous_committed == 4
+    assert ledger.is_committed(3)
+    assert not ledger.is_committed(4)
+
+    restored = ChunkLedger(table_name="t", chunk_size=10, n_rows=100, committed={0, 1})
+    assert restored.contiguous_committed == 2
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "ledger.json"
+    ledger = ChunkLedger.load(path, table_name="t", chunk_size=10, n_rows=100)
+    assert not path.exists()
+    for i in [0, 1, 2, 5, 7]:
+        ledger.mark_committed(i)
+
+    stored = json.loads(path.read_text())
+    assert stored["contiguous_committed"] == 3
+    assert stored["committed_out_of_order"] == [5, 7]
+    assert not path.with_suffix(".json.tmp").exists()
+
+    loaded = ChunkLedger.load(path, table_name="t", chunk_size=10, n_rows=100)
+    assert loaded.committed == {0, 1, 2, 5, 7}
+    assert loaded.contiguous_committed == 3
+    assert loaded.path == path
+
+
+@pytest.mark.parametrize(
+    "changed", [{"table_name": "other"}, {"chunk_size": 20}, {"n_rows": 101}]
+)
+def test_load_rejects_mismatched_ledger(tmp_path, changed):
+    path = tmp_path / "ledger.json"
+    shape = {"table_name": "t", "chunk_size": 10, "n_rows": 100}
+    ChunkLedger.load(path, **shape).mark_committed(0)
+    with pytest.raises(ValueError, match="does not match"):
+        ChunkLedger.load(path, **{**shape, **changed})
@@ -0,0 +1,46 @@
+import polars as pl
+
+from azure_connectors.dataframe_io.chunk_sizing import (AdaptiveChunkSizer,
+                                                        initial_chunk_size,
+                                                        iter_chunks,
+                                                        max_rows_for_parameter_limit)
+
+
+def test_parameter_limit():
+    assert max_rows_for_parameter_limit(1) == 2099
+    assert max_rows_for_parameter_limit(10) == 209
+    assert max_rows_for_parameter_limit(5000) == 1
+
+
+def test_initial_chunk_size_respects_parameter_limit():
+    wide_df = pl.DataFrame({f"col_{i}": range(1_000) for i in range(50)})
+    assert initial_chunk_size(wide_df, parameter_limited=True) * 50 < 2100
+    assert initial_chunk_size(wide_df) > initial_chunk_size(
+        wide_df, parameter_limited=True
+    )
+
+
+def test_adaptive_sizer_grows_shrinks_and_rolls_back():
+    sizer = AdaptiveChunkSizer(initial=1_000, min_rows=100, max_rows=100_000)
+
+    sizer.record(1_000, 0.1)  # fast: grow
+    assert sizer.chunk_size == 2_000
+    sizer.record(2_000, 5.0)  # growing lowered throughput: roll back
+    assert sizer.chunk_size == 1_000
+    sizer.record(1_000, 0.1)  # fast, but growth past here is known to hurt
+    assert sizer.chunk_size == 1_000
+    sizer.record(1_000, 10.0)  # slow: shrink
+    assert sizer.chunk_size == 500
+    sizer.record(10, 100.0)  # short final chunk: ignored
+    assert sizer.chunk_size == 500
+
+
+def test_iter_chunks_follows_sizer():
+    df = pl.DataFrame({"a": range(1_000)})
+    sizer = AdaptiveChunkSizer(initial=100, min_rows=100, max_rows=1_000)
+    sizes = []
+    for chunk in iter_chunks(df, sizer):
+        sizes.append(chunk.shape[0])
+        sizer.record(chunk.shape[0], 0.01)
+    assert sizes == [100, 200, 400, 300]
+    assert sum(chunk.shape[0] for chunk in iter_chunks(df, 300)) == 1_000
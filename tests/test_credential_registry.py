@@ -0,0 +1,71 @@
+import time
+
+from azure.core.credentials import AccessToken
+
+from azure_connectors.config import CredentialScope
+from azure_connectors.credential import (AzureCredential, close_credentials,
+                                         get_token_provider)
+from azure_connectors.credential.enums import CredentialSource
+
+
+def test_credentials_are_shared_across_scopes():
+    close_credentials()
+    sql = AzureCredential.from_env(
+        source=CredentialSource.CLI, scope=CredentialScope.AZURE_SQL
+    )
+    blob = AzureCredential.from_env(
+        source=CredentialSource.CLI, scope=CredentialScope.AZURE_BLOB
+    )
+    other = AzureCredential.from_env(
+        source=CredentialSource.DEFAULT, scope=CredentialScope.AZURE_SQL
+    )
+    assert sql.base_credential is blob.base_credential
+    assert sql.base_credential is not other.base_credential
+    assert sql.token_provider is get_token_provider(sql.settings)
+    assert sql.token_provider is not blob.token_provider
+
+    close_credentials()
+    again = AzureCredential.from_env(
+        source=CredentialSource.CLI, scope=CredentialScope.AZURE_SQL
+    )
+    assert again.base_credential is not sql.base_credential
+    close_credentials()
+
+
+class FakeCredential:
+    def __init__(self):
+        self.requests: list[tuple] = []
+
+    def get_token(self, *scopes, **kwargs):
+        self.requests.append((scopes, kwargs))
+        return AccessToken(f"token-{len(self.requests)}", int(time.time()) + 3_600)
+
+    def close(self):
+        pass
+
+
+def test_sdk_token_requests_are_served_by_the_shared_provider(monkeypatch):
+    close_credentials()
+    base_credential = FakeCredential()
+    monkeypatch.setattr(
+        "azure_connectors.credential.registry._create_credential",
+        lambda settings: base_credential,
+    )
+    credential = AzureCredential.from_env(
+        source=CredentialSource.CLI, scope=CredentialScope.AZURE_BLOB
+    )
+    scope = str(CredentialScope.AZURE_BLOB.value)
+    # e.g. fetched ahead of time by `warm_up`
+    token = credential.token_provider.get_token()
+
+    # as requested by an SDK client given `credential.token_credential`
+    assert credential.token_credential.get_token(scope) is token
+    assert len(base_credential.requests) == 1
+
+    # requests the provider cannot serve go to the shared base credential
+    credential.token_credential.get_token(scope, claims="challenge")
+    assert base_credential.requests[-1] == (
+        (scope,),
+        {"claims": "challenge", "tenant_id": None},
+    )
+    close_credentials()
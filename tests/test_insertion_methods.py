@@ -0,0 +1,242 @@
+import datetime
+import logging
+
+import polars as pl
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import mssql
+
+from azure_connectors.dataframe_io.insertion_methods import (
+    _cast_for_executemany, pl_to_sql_fast_executemany, pl_to_sql_parallel,
+    pl_to_sql_row_by_row)
+from azure_connectors.dataframe_io.metrics import MetricsAggregator
+from azure_connectors.dataframe_io.retry import RetryPolicy
+from azure_connectors.dataframe_io.utils import build_insert_sql
+
+metadata = sqlalchemy.MetaData()
+users = sqlalchemy.Table(
+    "users",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("first name", sqlalchemy.String(50)),
+    sqlalchemy.Column("age", sqlalchemy.Integer),
+    schema="dbo",
+)
+
+
+class FakeOdbcError(Exception):
+    pass
+
+
+def communication_link_failure() -> FakeOdbcError:
+    return FakeOdbcError("08S01", "[08S01] Communication link failure (10054)")
+
+
+class FakeCursor:
+    def __init__(self, statements: list):
+        self.statements = statements
+        self.fast_executemany = False
+
+    def execute(self, sql):
+        self.statements.append(sql)
+
+    def executemany(self, sql, params):
+        assert self.fast_executemany
+        params = list(params)
+        if (-1,) in params:
+            raise ValueError("bad row")
+        self.statements.append((sql, params))
+
+    def close(self):
+        pass
+
+
+class FakeRawConnection:
+    def __init__(self, statements: list):
+        self.statements = statements
+
+    def cursor(self):
+        return FakeCursor(self.statements)
+
+    def commit(self):
+        self.statements.append("COMMIT")
+
+    def close(self):
+        pass
+
+    def invalidate(self):
+        pass
+
+
+class FakeEngine:
+    dialect = mssql.dialect()
+
+    def __init__(self):
+        self.statements: list = []
+
+    def raw_connection(self):
+        return FakeRawConnection(self.statements)
+
+
+def test_build_insert_sql():
+    assert build_insert_sql(users, ["id", "first name"], mssql.dialect()) == (
+        "INSERT INTO dbo.users (id, [first name]) VALUES (?, ?)"
+    )
+
+
+def test_cast_for_executemany():
+    df = pl.DataFrame(
+        {
+            "category": pl.Series(["a", "b"], dtype=pl.Categorical),
+            "enum": pl.Series(["x", "y"], dtype=pl.Enum(["x", "y"])),
+            "number": [1, 2],
+        }
+    )
+    cast = _cast_for_executemany(df)
+    assert cast.schema == pl.Schema(
+        {"category": pl.String, "enum": pl.String, "number": pl.Int64}
+    )
+    assert cast.rows() == [("a", "x", 1), ("b", "y", 2)]
+
+
+@pytest.mark.parametrize(
+    "series",
+    [
+        pl.Series([datetime.datetime(2024, 1, 1)]).dt.replace_time_zone("UTC"),
+        pl.Series([datetime.timedelta(seconds=1)]),
+        pl.Series([[1, 2]]),
+        pl.Series([{"a": 1}]),
+    ],
+)
+def test_cast_for_executemany_rejects_unsupported_dtypes(series):
+    df = pl.DataFrame({"id": [1], "value": series})
+    with pytest.raises(ValueError, match="cannot insert: {'value'"):
+        _cast_for_executemany(df)
+
+
+def test_fast_executemany_inserts_identity_values():
+    engine = FakeEngine()
+    df = pl.DataFrame({"age": [30, 40, 50], "id": [1, 2, 3]})
+    pl_to_sql_fast_executemany(
+        df, users, engine, chunk_size=2, observer=MetricsAggregator()
+    )
+    insert_sql = "INSERT INTO dbo.users (id, age) VALUES (?, ?)"
+    assert engine.statements == [
+        "SET IDENTITY_INSERT dbo.users ON",
+        (insert_sql, [(1, 30), (2, 40)]),
+        "COMMIT",
+        (insert_sql, [(3, 50)]),
+        "COMMIT",
+        "SET IDENTITY_INSERT dbo.users OFF",
+    ]
+
+
+def test_fast_executemany_without_identity_values():
+    engine = FakeEngine()
+    df = pl.DataFrame({"age": [30]})
+    pl_to_sql_fast_executemany(df, users, engine, observer=MetricsAggregator())
+    assert engine.statements == [
+        ("INSERT INTO dbo.users (age) VALUES (?)", [(30,)]),
+        "COMMIT",
+    ]
+
+
+def test_parallel_failure_is_logged(caplog):
+    engine = FakeEngine()
+    df = pl.DataFrame({"age": [1, 2, -1]})
+    events = MetricsAggregator()
+    with caplog.at_level(logging.ERROR), pytest.raises(ValueError, match="bad row"):
+        pl_to_sql_parallel(
+            df, users, engine, chunk_size=1, max_workers=1, observer=events
+        )
+    assert "failed on chunk #2. 2 of 3 chunks are committed." in caplog.text
+    assert [event.error is not None for event in events.events] == [False, False, True]
+
+
+class FlakyEngine(FakeEngine):
+    """Drops the first insert and the first committed-chunk probe, as in a failover."""
+
+    def __init__(self):
+        super().__init__()
+        self.failures = {"insert": 1, "probe": 1}
+        self.connects = 0
+
+    def raw_connection(self):
+        conn = super().raw_connection()
+        cursor = conn.cursor()
+        executemany = cursor.executemany
+
+        def flaky_executemany(sql, params):
+            if self.failures["insert"]:
+                self.failures["insert"] -= 1
+                raise communication_link_failure()
+            executemany(sql, params)
+
+        cursor.executemany = flaky_executemany
+        conn.cursor = lambda: cursor
+        return conn
+
+    def connect(self):
+        self.connects += 1
+        if self.failures["probe"]:
+            self.failures["probe"] -= 1
+            raise communication_link_failure()
+        return FakeConnection(self.statements)
+
+
+class FakeConnection:
+    def __init__(self, statements: list):
+        self.statements = statements
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, statement, params=None):
+        if params is not None:
+            raise ValueError("constraint violated")
+        self.statements.append("PROBE")
+        return self
+
+    def first(self):
+        return None
+
+    def invalidate(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_transient_probe_failure_is_retried():
+    engine = FlakyEngine()
+    events = MetricsAggregator()
+    pl_to_sql_fast_executemany(
+        pl.DataFrame({"id": [1]}),
+        users,
+        engine,
+        observer=events,
+        retry_policy=RetryPolicy(base_delay=0.0),
+    )
+    assert engine.statements == [
+        "SET IDENTITY_INSERT dbo.users ON",
+        "PROBE",
+        "SET IDENTITY_INSERT dbo.users ON",
+        ("INSERT INTO dbo.users (id) VALUES (?)", [(1,)]),
+        "COMMIT",
+        "SET IDENTITY_INSERT dbo.users OFF",
+    ]
+    assert engine.connects == 2
+    assert [(event.retries, event.error) for event in events.events] == [(2, None)]
+
+
+def test_row_by_row_fatal_error_does_not_reconnect():
+    engine = FlakyEngine()
+    engine.failures["probe"] = 0
+    events = MetricsAggregator()
+    with pytest.raises(ValueError, match="constraint violated"):
+        pl_to_sql_row_by_row(pl.DataFrame({"id": [1]}), users, engine, observer=events)
+    assert engine.connects == 1
+    assert [event.retries for event in events.events] == [0]
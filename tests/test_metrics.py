@@ -0,0 +1,54 @@
+import logging
+
+from azure_connectors.dataframe_io.metrics import (ChunkEvent, MetricsAggregator,
+                                                   ProgressObserver)
+
+
+def make_event(chunk_index: int, seconds: float, timestamp: float, **kwargs):
+    return ChunkEvent(
+        operation="write",
+        method="test",
+        chunk_index=chunk_index,
+        rows=100,
+        bytes=800,
+        execute_seconds=seconds,
+        timestamp=timestamp,
+        **kwargs,
+    )
+
+
+def test_aggregator_summary():
+    aggregator = MetricsAggregator()
+    # two overlapping chunks over a 2s wall-clock span, then a failure
+    aggregator.on_chunk(make_event(0, 1.0, timestamp=11.0))
+    aggregator.on_chunk(make_event(1, 2.0, timestamp=12.0, retries=1))
+    aggregator.on_chunk(make_event(2, 0.5, timestamp=12.5, error=RuntimeError()))
+
+    summary = aggregator.summary()
+    assert summary["chunks"] == 2
+    assert summary["failures"] == 1
+    assert summary["rows"] == 200
+    assert summary["wall_seconds"] == 2.0
+    assert summary["rows_per_second"] == 100.0
+    assert summary["latency_p50"] == 1.0
+    assert summary["latency_p99"] == 2.0
+    assert summary["retries"] == 1
+
+
+def test_empty_aggregator():
+    assert MetricsAggregator().summary() == {"chunks": 0, "failures": 0}
+    assert MetricsAggregator().report() == "0 chunks, 0 failures"
+
+
+def test_progress_observer_logs_failures_and_fallbacks(caplog):
+    progress = ProgressObserver(total_rows=200)
+    failed = make_event(1, 0.5, timestamp=1.0, error=RuntimeError("boom"))
+    with caplog.at_level(logging.WARNING):
+        progress.on_chunk(make_event(0, 0.5, timestamp=1.0, fallback="pandas"))
+        progress.on_chunk(failed)
+    progress.close()
+    assert [(r.levelname, r.getMessage()) for r in caplog.records] == [
+        ("WARNING", "`test` fell back to pandas."),
+        ("ERROR", "`test` failed on chunk #1 (100 rows): RuntimeError('boom')"),
+    ]
+    assert caplog.records[1].chunk_event is failed
@@ -0,0 +1,132 @@
+import datetime
+import decimal
+from types import SimpleNamespace
+
+import polars as pl
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import mssql
+
+from azure_connectors.dataframe_io import partitioned_read
+from azure_connectors.dataframe_io.metrics import MetricsAggregator
+from azure_connectors.dataframe_io.partitioned_read import (partition_boundaries,
+                                                            read_df_partitioned)
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """Records the SQL of every `read_df` call, still running it."""
+    queries: list[str] = []
+    read_df = partitioned_read.read_df
+
+    def recording_read_df(query, **kwargs):
+        queries.append(query)
+        return read_df(query, **kwargs)
+
+    monkeypatch.setattr(partitioned_read, "read_df", recording_read_df)
+    return queries
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE votes (id INTEGER, label TEXT)")
+        conn.exec_driver_sql(
+            "INSERT INTO votes VALUES "
+            "(5, 'e'), (NULL, 'n'), (1, 'a'), (9, 'i'), (3, 'c'), (7, 'g')"
+        )
+    return engine
+
+
+def test_partition_boundaries_int():
+    assert partition_boundaries(0, 100, 4) == [0, 25, 50, 75, 100]
+    # fewer distinct values than partitions
+    assert partition_boundaries(1, 3, 8) == [1, 2, 3]
+    assert partition_boundaries(5, 5, 4) == [5]
+
+
+def test_partition_boundaries_float():
+    assert partition_boundaries(0.0, 1.0, 2) == [0.0, 0.5, 1.0]
+
+
+def test_partition_boundaries_dates():
+    start = datetime.date(2024, 1, 1)
+    end = datetime.date(2024, 1, 11)
+    assert partition_boundaries(start, end, 2) == [start, datetime.date(2024, 1, 6), end]
+
+    start_dt = datetime.datetime(2024, 1, 1)
+    end_dt = datetime.datetime(2024, 1, 1, 0, 0, 1, 500_000)
+    boundaries = partition_boundaries(start_dt, end_dt, 3)
+    assert boundaries[0] == start_dt and boundaries[-1] == end_dt
+    assert all(b.microsecond == 0 for b in boundaries[1:-1])
+    assert boundaries == sorted(set(boundaries))
+
+
+def test_read_df_partitioned(engine, queries):
+    events = MetricsAggregator()
+    df = read_df_partitioned(
+        "votes", "id", n_partitions=3, engine=engine, observer=events
+    )
+    # in range order, the NULL key with the first range
+    assert df["label"].to_list() == ["n", "a", "e", "c", "i", "g"]
+    subquery = "SELECT * \nFROM (SELECT * FROM votes) AS partitioned"
+    assert queries[0] == (
+        "SELECT min(partitioned.id) AS min_1, max(partitioned.id) AS max_1 \n"
+        "FROM (SELECT * FROM votes) AS partitioned"
+    )
+    assert sorted(queries[1:]) == [
+        f"{subquery} \nWHERE partitioned.id < 3 OR partitioned.id IS NULL",
+        f"{subquery} \nWHERE partitioned.id >= 3 AND partitioned.id < 6",
+        f"{subquery} \nWHERE partitioned.id >= 6",
+    ]
+    assert len(events.events) == 4
+
+
+def test_read_df_partitioned_with_stale_bounds(engine, queries):
+    df = read_df_partitioned(
+        "votes", "id", n_partitions=2, bounds=(4, 6), engine=engine
+    )
+    assert df.sort("id", nulls_last=True)["label"].to_list() == list("acegin")
+    assert len(queries) == 2
+
+
+def test_read_df_partitioned_without_ranges(engine, queries):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM votes WHERE id IS NOT NULL")
+    df = read_df_partitioned("votes", "id", engine=engine)
+    assert df.rows() == [(None, "n")]
+    assert queries[1] == "SELECT * \nFROM (SELECT * FROM votes) AS partitioned"
+    assert len(queries) == 2
+
+
+@pytest.mark.parametrize(
+    "bounds, literal",
+    [
+        ((datetime.datetime(2024, 1, 1), datetime.datetime(2024, 1, 3)),
+         "'2024-01-02 00:00:00'"),
+        ((decimal.Decimal("0.5"), decimal.Decimal("1.5")), "1.0"),
+    ],
+)  # fmt: skip
+def test_read_df_partitioned_renders_literals(monkeypatch, bounds, literal):
+    queries: list[str] = []
+
+    def read_df(query, **kwargs):
+        queries.append(query)
+        return pl.DataFrame({"x": [len(queries)]})
+
+    monkeypatch.setattr(partitioned_read, "read_df", read_df)
+    df = read_df_partitioned(
+        "SELECT x, k FROM dbo.t WHERE x > 0",
+        "k",
+        n_partitions=2,
+        bounds=bounds,
+        engine=SimpleNamespace(dialect=mssql.dialect()),  # type: ignore[arg-type]
+    )
+    subquery = "FROM (SELECT x, k FROM dbo.t WHERE x > 0) AS partitioned"
+    assert sorted(queries) == [
+        f"SELECT * \n{subquery} \nWHERE partitioned.k < {literal} "
+        "OR partitioned.k IS NULL",
+        f"SELECT * \n{subquery} \nWHERE partitioned.k >= {literal}",
+    ]
+    assert sorted(df["x"].to_list()) == [1, 2]
@@ -0,0 +1,19 @@
+import polars as pl
+import pytest
+
+from azure_connectors.dataframe_io.primary_key import check_primary_key_unique
+
+
+def test_unique_composite_key():
+    # each column repeats, but the composite key does not
+    df = pl.DataFrame({"a": [1, 1, 2, 2], "b": [1, 2, 1, 2]})
+    check_primary_key_unique(df, ["a", "b"])
+    check_primary_key_unique(df.lazy(), ["a", "b"])
+
+
+def test_duplicated_composite_key():
+    df = pl.DataFrame({"a": [1, 1, 2], "b": [1, 1, 2], "c": ["x", "y", "z"]})
+    with pytest.raises(ValueError) as exc_info:
+        check_primary_key_unique(df.lazy(), ["a", "b"])
+    offending_observations = exc_info.value.args[2]
+    assert offending_observations["c"].to_list() == ["x", "y"]
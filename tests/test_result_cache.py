@@ -0,0 +1,71 @@
+import datetime
+import os
+import time
+
+import polars as pl
+import sqlalchemy
+
+from azure_connectors.dataframe_io.result_cache import ResultCache, normalize_query
+
+
+def test_normalize_query_keeps_literals():
+    assert normalize_query("SELECT *\n    FROM t\n") == "SELECT * FROM t"
+    assert normalize_query("SELECT 'a  b' ,  x") == "SELECT 'a  b' , x"
+    assert normalize_query("SELECT 'it''s   here'") == "SELECT 'it''s   here'"
+
+
+def test_key(tmp_path):
+    cache = ResultCache(tmp_path)
+    engine = sqlalchemy.create_engine("sqlite://")
+    other_engine = sqlalchemy.create_engine("sqlite:///other.db")
+    key = cache.key("SELECT 1", engine)
+    assert key == cache.key("SELECT  1\n", engine)
+    assert key != cache.key("SELECT 1", other_engine)
+    assert key != cache.key("SELECT 1", engine, backend="arrow")
+    assert key != cache.key("SELECT 1", engine, schema_overrides={"a": pl.Int32})
+    assert key != cache.key("SELECT 1", engine, infer_schema_length=1_000)
+
+
+def test_key_includes_parameters(tmp_path):
+    cache = ResultCache(tmp_path)
+    engine = sqlalchemy.create_engine("sqlite://")
+    query = "SELECT * FROM t WHERE id = :id AND day >= :day"
+    first = {"parameters": {"id": 1, "day": datetime.date(2024, 1, 1)}}
+    second = {"parameters": {"id": 2, "day": datetime.date(2024, 1, 1)}}
+    key = cache.key(query, engine, execute_options=first)
+    assert key != cache.key(query, engine, execute_options=second)
+    assert key != cache.key(query, engine)
+    reordered = {"parameters": {"day": datetime.date(2024, 1, 1), "id": 1}}
+    assert key == cache.key(query, engine, execute_options=reordered)
+
+
+def test_store_and_load(tmp_path):
+    cache = ResultCache(tmp_path, ttl=60)
+    df = pl.DataFrame({"a": [1, 2, 3]})
+    assert cache.load("k") is None
+    cache.store("k", df, signal="1")
+    assert cache.load("k", signal="1").equals(df)
+    assert cache.load("k", signal="2") is None
+
+    expired = ResultCache(tmp_path, ttl=0)
+    time.sleep(0.01)
+    assert expired.load("k", signal="1") is None
+
+
+def test_lru_eviction(tmp_path):
+    df = pl.DataFrame({"a": range(1_000)})
+    cache = ResultCache(tmp_path)
+    cache.store("first", df)
+    entry_size = (tmp_path / "first.arrow").stat().st_size
+    cache.max_bytes = 2 * entry_size
+    cache.store("second", df)
+
+    # use "first", so that "second" is the least recently used
+    past = time.time() - 100
+    os.utime(tmp_path / "second.arrow", (past, past))
+    assert cache.load("first") is not None
+    cache.store("third", df)
+
+    assert cache.load("second") is None
+    assert cache.load("first") is not None
+    assert cache.load("third") is not None
@@ -0,0 +1,88 @@
+import polars as pl
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import mssql
+
+from azure_connectors.dataframe_io.resume import (has_orderable_key, is_sorted_by,
+                                                  keys_after_watermark,
+                                                  resume_after_watermark,
+                                                  resume_by_anti_join)
+
+
+def make_table(*key_types: sqlalchemy.types.TypeEngine) -> sqlalchemy.Table:
+    return sqlalchemy.Table(
+        "items",
+        sqlalchemy.MetaData(),
+        *(
+            sqlalchemy.Column(f"k{i}", key_type, primary_key=True)
+            for i, key_type in enumerate(key_types)
+        ),
+        sqlalchemy.Column("value", sqlalchemy.Integer),
+    )
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            sqlalchemy.text(
+                "CREATE TABLE items (k0 INTEGER, k1 INTEGER, value INTEGER, "
+                "PRIMARY KEY (k0, k1))"
+            )
+        )
+        conn.execute(sqlalchemy.text("INSERT INTO items VALUES (1, 1, 0), (2, 5, 0)"))
+    return engine
+
+
+def test_keys_after_watermark_is_lexicographic():
+    df = pl.DataFrame({"a": [1, 2, 2, 2, 3, 1], "b": [9, 4, 5, 6, 0, 1]})
+    result = df.filter(keys_after_watermark(["a", "b"], (2, 5)))
+    assert result.rows() == [(2, 6), (3, 0)]
+
+
+def test_keys_after_watermark_single_key():
+    df = pl.DataFrame({"a": [3, 1, 4, 2]})
+    assert df.filter(keys_after_watermark(["a"], (2,)))["a"].to_list() == [3, 4]
+
+
+@pytest.mark.parametrize(
+    "key_types, expected",
+    [
+        ((sqlalchemy.Integer(),), True),
+        ((sqlalchemy.BigInteger(), sqlalchemy.DateTime()), True),
+        ((sqlalchemy.Numeric(18, 2),), True),
+        ((sqlalchemy.String(50),), False),
+        ((sqlalchemy.Integer(), sqlalchemy.Unicode(10)), False),
+        ((mssql.UNIQUEIDENTIFIER(),), False),
+        ((sqlalchemy.Uuid(),), False),
+    ],
+)
+def test_has_orderable_key(key_types, expected):
+    assert has_orderable_key(make_table(*key_types)) is expected
+
+
+def test_is_sorted_by():
+    df = pl.DataFrame({"a": [1, 1, 2], "b": [2, 3, 1]})
+    assert is_sorted_by(df, ["a"])
+    assert is_sorted_by(df, ["a", "b"])
+    assert not is_sorted_by(df, ["b"])
+    assert not is_sorted_by(df.reverse(), ["a", "b"])
+
+
+def test_resume_after_watermark(engine):
+    table = make_table(sqlalchemy.Integer(), sqlalchemy.Integer())
+    df = pl.DataFrame({"k0": [1, 2, 2, 3], "k1": [1, 5, 6, 0], "value": [0, 0, 0, 0]})
+    assert resume_after_watermark(df, table, engine).rows() == [(2, 6, 0), (3, 0, 0)]
+    # an unsorted frame loses rows below the watermark that were never written
+    df = pl.DataFrame({"k0": [2, 1, 3], "k1": [5, 2, 0], "value": [0, 0, 0]})
+    assert resume_after_watermark(df, table, engine).rows() == [(3, 0, 0)]
+
+
+def test_resume_by_anti_join_ignores_order(engine):
+    table = make_table(sqlalchemy.Integer(), sqlalchemy.Integer())
+    df = pl.DataFrame({"k0": [2, 1, 3, 1], "k1": [5, 2, 0, 1], "value": [0, 0, 0, 0]})
+    result = resume_by_anti_join(df, table, engine)
+    assert sorted(result.select("k0", "k1").rows()) == [(1, 2), (3, 0)]
+    lazy_result = resume_by_anti_join(df.lazy(), table, engine).collect()
+    assert sorted(lazy_result.select("k0", "k1").rows()) == [(1, 2), (3, 0)]
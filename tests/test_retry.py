@@ -0,0 +1,70 @@
+import time
+
+import pytest
+import sqlalchemy
+
+from azure_connectors.dataframe_io.insertion_methods import _ChunkTimer
+from azure_connectors.dataframe_io.retry import RetryPolicy, is_transient
+
+
+class FakeOdbcError(Exception):
+    pass
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (FakeOdbcError("08S01", "[08S01] Communication link failure (10054)"), True),
+        (FakeOdbcError("42000", "[42000] Resource ID : 1. (10928) (SQLExecDirectW)"), True),
+        (FakeOdbcError("40001", "Transaction was deadlocked (1205)"), True),
+        (FakeOdbcError("23000", "Violation of PRIMARY KEY constraint (2627)"), False),
+        (
+            FakeOdbcError(
+                "23000",
+                "[SQL Server]Violation of PRIMARY KEY constraint 'pk'. Cannot insert "
+                "duplicate key in object 'dbo.t'. The duplicate key value is (1205). "
+                "(2627) (SQLExecDirectW)",
+            ),
+            False,
+        ),
+        (
+            FakeOdbcError(
+                "42000",
+                "[SQL Server]Cannot open database (4060) (SQLDriverConnect); "
+                "[42000] [SQL Server]Login failed (18456)",
+            ),
+            True,
+        ),
+        (ValueError("bad value"), False),
+        (TimeoutError(), True),
+    ],
+)
+def test_is_transient(error, expected):
+    assert is_transient(error) is expected
+
+
+def test_is_transient_unwraps_sqlalchemy():
+    orig = FakeOdbcError("42000", "Database is not currently available (40613)")
+    assert is_transient(sqlalchemy.exc.DBAPIError("INSERT", {}, orig))
+    orig = FakeOdbcError("23000", "Cannot insert duplicate key (2627)")
+    assert not is_transient(sqlalchemy.exc.DBAPIError("INSERT", {}, orig))
+
+
+def test_retry_policy():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=3.0)
+    transient = TimeoutError()
+    assert policy.should_retry(transient, 0)
+    assert policy.should_retry(transient, 1)
+    assert not policy.should_retry(transient, 2)
+    assert not policy.should_retry(ValueError(), 0)
+    assert all(0 <= policy.delay(attempt) <= 3.0 for attempt in range(10))
+
+
+def test_chunk_timer_skips_backoff(monkeypatch):
+    clock = iter([0.0, 1.0, 31.0, 32.0])
+    monkeypatch.setattr(time, "perf_counter", lambda: next(clock))
+    timer = _ChunkTimer()
+    timer.lap("execute")
+    timer.skip()  # e.g. a 30 s backoff
+    timer.lap("encode")
+    assert timer.seconds == {"encode": 1.0, "execute": 1.0, "commit": 0.0}
@@ -0,0 +1,139 @@
+import datetime
+from types import SimpleNamespace
+
+import polars as pl
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import mssql
+
+from azure_connectors.dataframe_io import scan
+from azure_connectors.dataframe_io.scan import polars_schema, push_down, scan_sql
+
+table = sqlalchemy.Table(
+    "events",
+    sqlalchemy.MetaData(),
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("name", sqlalchemy.String(50)),
+    sqlalchemy.Column("day", sqlalchemy.Date),
+    sqlalchemy.Column("amount", sqlalchemy.Numeric(10, 2)),
+    sqlalchemy.Column("created_at", mssql.DATETIME2),
+    sqlalchemy.Column("legacy_at", sqlalchemy.DateTime),
+)
+
+
+def compile_pushed(predicate: pl.Expr) -> tuple[str | None, bool]:
+    clause, exact = push_down(predicate, table)
+    if clause is None:
+        return None, exact
+    compiled = clause.compile(dialect=mssql.dialect(), compile_kwargs={"literal_binds": True})
+    return " ".join(str(compiled).split()), exact
+
+
+def test_push_down_comparisons():
+    assert compile_pushed(pl.col("id") > 5) == ("events.id > 5", True)
+    assert compile_pushed(5 < pl.col("id")) == ("events.id > 5", True)
+    assert compile_pushed(pl.col("day") >= datetime.date(2024, 1, 1)) == (
+        "events.day >= '2024-01-01'",
+        True,
+    )
+    assert compile_pushed(pl.col("name").is_null()) == ("events.name IS NULL", True)
+
+
+def test_push_down_datetimes():
+    at = datetime.datetime(2024, 1, 1, 12, 0, 0, 123456)
+    literal = "CAST('2024-01-01 12:00:00.123456' AS DATETIME2)"
+    assert compile_pushed(pl.col("created_at") >= at) == (
+        f"events.created_at >= {literal}",
+        True,
+    )
+    # legacy DATETIME columns are compared at their own precision, as a superset
+    assert compile_pushed(pl.col("legacy_at") >= at) == (
+        f"events.legacy_at >= CAST({literal} AS DATETIME)",
+        False,
+    )
+    assert compile_pushed(pl.col("legacy_at") != at) == (None, False)
+
+
+def test_push_down_strings_only_as_superset():
+    assert compile_pushed(pl.col("name") == "a") == ("events.name = 'a'", False)
+    assert compile_pushed(pl.col("name") > "a") == (None, False)
+    # negating a superset is not safe
+    assert compile_pushed(~(pl.col("name") == "a")) == (None, False)
+
+
+def test_push_down_partial_conjunction():
+    sql, exact = compile_pushed((pl.col("id") > 5) & pl.col("name").str.contains("x"))
+    assert sql == "events.id > 5"
+    assert not exact
+    # a disjunction needs both sides
+    assert compile_pushed((pl.col("id") > 5) | pl.col("name").str.contains("x")) == (
+        None,
+        False,
+    )
+
+
+def test_polars_schema():
+    assert polars_schema(table) == pl.Schema(
+        {
+            "id": pl.Int64,
+            "name": pl.String,
+            "day": pl.Date,
+            "amount": pl.Decimal(10, 2),
+            "created_at": pl.Datetime("us"),
+            "legacy_at": pl.Datetime("us"),
+        }
+    )
+
+
+votes = sqlalchemy.Table(
+    "votes",
+    sqlalchemy.MetaData(),
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("name", sqlalchemy.String(50)),
+)
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """
+    Stubs `read_df`, recording the SQL and batch size it receives and returning every
+    row regardless, so that the results show what Polars filters locally.
+    """
+    queries: list[tuple[str, int]] = []
+    data = pl.DataFrame({"id": [1, 2, 3, 4], "name": ["a", "b", "c", "d"]})
+
+    def read_df(query, engine, iter_batches, batch_size):
+        queries.append((" ".join(query.split()), batch_size))
+        return (batch for batch in data.iter_slices(batch_size))
+
+    monkeypatch.setattr(scan, "read_df", read_df)
+    return queries
+
+
+def scan_votes() -> pl.LazyFrame:
+    engine = SimpleNamespace(dialect=mssql.dialect())
+    return scan_sql(votes, engine=engine, batch_size=2)  # type: ignore[arg-type]
+
+
+def test_scan_sql_pushes_down_projection_predicate_and_limit(queries):
+    assert scan_votes().select("name").collect()["name"].to_list() == list("abcd")
+    assert scan_votes().filter(pl.col("id") > 2).select("name").collect().rows() == [
+        ("c",),
+        ("d",),
+    ]
+    assert scan_votes().head(1).collect().rows() == [(1, "a")]
+    assert queries == [
+        ("SELECT votes.name FROM votes", 2),
+        ("SELECT votes.id, votes.name FROM votes WHERE votes.id > 2", 2),
+        ("SELECT TOP 1 votes.id, votes.name FROM votes", 2),
+    ]
+
+
+def test_scan_sql_filters_locally_without_push_down(queries, monkeypatch):
+    def unparseable(document):
+        raise ValueError("unknown expression format")
+
+    monkeypatch.setattr(scan.json, "loads", unparseable)
+    df = scan_votes().filter(pl.col("id") > 2).head(1).collect()
+    assert df.rows() == [(3, "c")]
+    assert queries == [("SELECT votes.id, votes.name FROM votes", 2)]
@@ -0,0 +1,37 @@
+import polars as pl
+import sqlalchemy
+
+import azure_connectors.dataframe_io.read as read_module
+from azure_connectors.dataframe_io import read_df
+from azure_connectors.dataframe_io.schema_resolver import sql_server_dtype
+
+
+def test_sql_server_dtype():
+    assert sql_server_dtype("decimal(18,2)", 18, 2) == pl.Decimal(18, 2)
+    assert sql_server_dtype("numeric(10, 4)") == pl.Decimal(10, 4)
+    assert sql_server_dtype("bit") == pl.Boolean()
+    assert sql_server_dtype("smallint") == pl.Int16()
+    assert sql_server_dtype("datetime2(7)") == pl.Datetime("us")
+    assert sql_server_dtype("nvarchar(max)") == pl.String()
+    assert sql_server_dtype("uniqueidentifier") == pl.String()
+    assert sql_server_dtype("sql_variant") is None
+
+
+def test_read_df_builds_columns_at_catalog_dtypes(monkeypatch, tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("CREATE TABLE t (id INTEGER, amount TEXT)"))
+        conn.execute(sqlalchemy.text("INSERT INTO t VALUES (1, '1.50'), (2, NULL)"))
+    monkeypatch.setattr(
+        read_module,
+        "resolve_schema",
+        lambda query, engine: pl.Schema({"id": pl.Int16(), "amount": pl.String()}),
+    )
+
+    df = read_df(
+        "SELECT id, amount FROM t",
+        engine=engine,
+        catalog_schema=True,
+        schema_overrides=pl.Schema({"amount": pl.Decimal(10, 2)}),
+    )
+    assert df.schema == pl.Schema({"id": pl.Int16(), "amount": pl.Decimal(10, 2)})
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+
+from azure_connectors.azure_sql.registry import (_reset_after_fork,
+                                                 dispose_sql_connections,
+                                                 get_sql_connection)
+
+REGISTRY = "azure_connectors.azure_sql.registry"
+
+
+class FakeConnection:
+    CREDENTIAL_SCOPE = "azure_sql"
+
+    def __init__(self, settings, credential):
+        self.settings = settings
+        self.credential = credential
+        self.disposed_with: list[bool] = []
+
+    def dispose(self, close: bool = True) -> None:
+        self.disposed_with.append(close)
+
+
+def settings(database: str = "db") -> SimpleNamespace:
+    return SimpleNamespace(server="server", database=database, driver="driver")
+
+
+@pytest.fixture
+def env_reads(monkeypatch):
+    """Counts the settings parsed from the environment, with no credentials created."""
+    reads = {"settings": 0, "source": 0}
+
+    def read_settings():
+        reads["settings"] += 1
+        return settings()
+
+    def read_source(scope):
+        reads["source"] += 1
+        return SimpleNamespace(source="cli")
+
+    monkeypatch.setattr(f"{REGISTRY}.AzureSqlSettings", read_settings)
+    monkeypatch.setattr(f"{REGISTRY}.AzureCredentialSettings", read_source)
+    monkeypatch.setattr(
+        f"{REGISTRY}.AzureCredential.from_env", lambda source, scope: source
+    )
+    monkeypatch.setattr(f"{REGISTRY}.AzureSqlConnection", FakeConnection)
+    dispose_sql_connections()
+    yield reads
+    dispose_sql_connections()
+
+
+def test_connections_are_shared_per_key(env_reads):
+    first = get_sql_connection(settings(), source="cli")
+    assert get_sql_connection(settings(), source="cli") is first
+    assert get_sql_connection(settings("other"), source="cli") is not first
+    assert get_sql_connection(settings(), source="default") is not first
+
+
+def test_env_settings_are_read_once(env_reads):
+    connection = get_sql_connection()
+    assert get_sql_connection() is connection
+    assert get_sql_connection() is connection
+    assert env_reads == {"settings": 1, "source": 1}
+
+    dispose_sql_connections()
+    assert connection.disposed_with == [True]
+    assert get_sql_connection() is not connection
+    assert env_reads == {"settings": 2, "source": 2}
+
+
+def test_reset_after_fork_drops_connections_without_closing(env_reads):
+    connection = get_sql_connection(settings(), source="cli")
+    _reset_after_fork()
+    assert connection.disposed_with == [False]
+    assert get_sql_connection(settings(), source="cli") is not connection
@@ -0,0 +1,35 @@
+import threading
+
+import pytest
+
+from azure_connectors.dataframe_io.streaming import prefetch
+
+
+def test_prefetch_yields_in_order():
+    assert list(prefetch(iter(range(100)), depth=3)) == list(range(100))
+
+
+def test_prefetch_reraises():
+    def failing():
+        yield 1
+        raise RuntimeError("boom")
+
+    batches = prefetch(failing())
+    assert next(batches) == 1
+    with pytest.raises(RuntimeError, match="boom"):
+        next(batches)
+
+
+def test_prefetch_closes_abandoned_generator():
+    closed = threading.Event()
+
+    def source():
+        try:
+            yield from range(100)
+        finally:
+            closed.set()
+
+    batches = prefetch(source())
+    assert next(batches) == 0
+    batches.close()
+    assert closed.wait(timeout=5)
@@ -0,0 +1,37 @@
+import asyncio
+
+from azure_connectors.config import CredentialScope
+from azure_connectors.credential import AzureCredential, close_credentials
+from azure_connectors.credential.enums import CredentialSource
+
+
+def test_subscription_id_setting_skips_lookup(monkeypatch):
+    monkeypatch.setenv("AZURE_CREDENTIAL_SUBSCRIPTION_ID", "sub-from-env")
+    credential = AzureCredential.from_env(
+        source=CredentialSource.CLI, scope=CredentialScope.AZURE_SQL
+    )
+    monkeypatch.setattr(AzureCredential, "_list_subscription_id", lambda self: 1 / 0)
+    assert credential.subscription_id == "sub-from-env"
+    assert asyncio.run(credential.get_subscription_id_async()) == "sub-from-env"
+
+
+def test_subscription_id_is_memoized_per_credential(monkeypatch):
+    monkeypatch.delenv("AZURE_CREDENTIAL_SUBSCRIPTION_ID", raising=False)
+    close_credentials()
+    calls = []
+    monkeypatch.setattr(
+        AzureCredential,
+        "_list_subscription_id",
+        lambda self: calls.append(1) or "sub-listed",
+    )
+    sql = AzureCredential.from_env(
+        source=CredentialSource.CLI, scope=CredentialScope.AZURE_SQL
+    )
+    blob = AzureCredential.from_env(
+        source=CredentialSource.CLI, scope=CredentialScope.AZURE_BLOB
+    )
+    assert sql.subscription_id == "sub-listed"
+    assert blob.subscription_id == "sub-listed"
+    assert asyncio.run(blob.get_subscription_id_async()) == "sub-listed"
+    assert len(calls) == 1
+    close_credentials()
@@ -0,0 +1,88 @@
+import datetime
+
+import polars as pl
+import pytest
+import sqlalchemy
+
+from azure_connectors.dataframe_io.sync import (
+    _decode,
+    _encode,
+    sync_parquet_snapshot,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            sqlalchemy.text(
+                "CREATE TABLE items "
+                "(id INTEGER PRIMARY KEY, name TEXT, version INTEGER)"
+            )
+        )
+        conn.execute(
+            sqlalchemy.text(
+                "INSERT INTO items VALUES (1, 'a', 1), (2, 'b', 1), (3, 'c', 2)"
+            )
+        )
+    return engine
+
+
+def test_modified_at_sync_merges_by_primary_key(engine, tmp_path):
+    path = tmp_path / "items.parquet"
+    first = sync_parquet_snapshot(
+        "items", path, strategy="modified_at", watermark_column="version", engine=engine
+    )
+    assert first.full_refresh
+    assert first.rows_upserted == 3
+    assert first.watermark == 2
+
+    with engine.begin() as conn:
+        conn.execute(
+            sqlalchemy.text("UPDATE items SET name = 'b2', version = 3 WHERE id = 2")
+        )
+        conn.execute(sqlalchemy.text("INSERT INTO items VALUES (4, 'd', 3)"))
+
+    second = sync_parquet_snapshot(
+        "items", path, strategy="modified_at", watermark_column="version", engine=engine
+    )
+    assert not second.full_refresh
+    # the row at the old watermark is re-read
+    assert second.rows_upserted == 3
+    assert second.watermark == 3
+    assert pl.read_parquet(path).sort("id").to_dict(as_series=False) == {
+        "id": [1, 2, 3, 4],
+        "name": ["a", "b2", "c", "d"],
+        "version": [1, 3, 2, 3],
+    }
+
+
+def test_sync_state_is_bound_to_its_strategy(engine, tmp_path):
+    path = tmp_path / "items.parquet"
+    sync_parquet_snapshot(
+        "items", path, strategy="modified_at", watermark_column="version", engine=engine
+    )
+    with pytest.raises(ValueError):
+        sync_parquet_snapshot(
+            "items", path, strategy="modified_at", watermark_column="name", engine=engine
+        )
+
+
+def test_change_tracking_disabled_on_database_raises(engine, tmp_path, monkeypatch):
+    # CHANGE_TRACKING_CURRENT_VERSION() is NULL without database-level change tracking
+    monkeypatch.setattr(
+        "azure_connectors.dataframe_io.sync._ChangeTrackingSync._scalar",
+        lambda self, query: None,
+    )
+    path = tmp_path / "items.parquet"
+    with pytest.raises(ValueError, match="Change tracking is not enabled"):
+        sync_parquet_snapshot("items", path, engine=engine)
+    assert not path.exists()
+
+
+def test_watermark_encoding_round_trips():
+    rowversion = b"\x00\x00\x00\x00\x00\x00\x07\xd1"
+    timestamp = datetime.datetime(2024, 1, 2, 3, 4, 5, 6)
+    for value in [None, 42, rowversion, timestamp]:
+        assert _decode(_encode(value)) == value
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from azure_connectors.dataframe_io.table_stats import (clear_table_stats_cache,
+                                                       get_table_stats)
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def one(self):
+        return self.value
+
+    def scalar_one(self):
+        return self.value
+
+
+class FakeEngine:
+    """Answers the partition-stats query and `COUNT_BIG(*)`, counting queries."""
+
+    def __init__(self):
+        self.row_count = 10
+        self.queries: list[str] = []
+
+    @contextmanager
+    def connect(self):
+        yield self
+
+    def execute(self, query, params=None):
+        self.queries.append(str(query))
+        if "COUNT_BIG" in str(query):
+            return FakeResult(self.row_count)
+        return FakeResult(
+            SimpleNamespace(
+                object_id=1,
+                row_count=self.row_count,
+                reserved_pages=2,
+                used_pages=1,
+                n_partitions=1,
+            )
+        )
+
+
+@pytest.fixture
+def engine():
+    engine = FakeEngine()
+    yield engine
+    clear_table_stats_cache(engine)  # type: ignore[arg-type]
+
+
+def test_stats_are_cached(engine):
+    stats = get_table_stats("t", engine=engine)
+    assert (stats.row_count, stats.reserved_bytes, stats.exact) == (10, 16_384, False)
+    engine.row_count = 11
+    assert get_table_stats("t", engine=engine) is stats
+    assert get_table_stats("t", engine=engine, max_age=0).row_count == 11
+    assert len(engine.queries) == 2
+
+
+def test_exact_stats_skip_the_cache(engine):
+    assert get_table_stats("t", engine=engine, exact=True).row_count == 10
+    engine.row_count = 11
+    exact = get_table_stats("t", engine=engine, exact=True, max_age=None)
+    assert (exact.row_count, exact.exact) == (11, True)
+    assert sum("COUNT_BIG" in query for query in engine.queries) == 2
+    # nor do they fill it
+    assert not get_table_stats("t", engine=engine).exact
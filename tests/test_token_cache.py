@@ -0,0 +1,83 @@
+import logging
+import os
+import stat
+import time
+
+import pytest
+
+from azure.core.credentials import AccessToken
+
+from azure_connectors.credential.enums import CredentialSource
+from azure_connectors.credential.token_cache import (
+    PersistentlyCachedCredential,
+    PersistentTokenCache,
+)
+
+
+class FakeCredential:
+    def __init__(self, lifetime: float = 3_600):
+        self.lifetime = lifetime
+        self.calls = 0
+
+    def get_token(self, *scopes, **kwargs):
+        self.calls += 1
+        return AccessToken(f"token-{self.calls}", int(time.time() + self.lifetime))
+
+
+def test_tokens_are_shared_through_the_file(tmp_path):
+    path = tmp_path / "token_cache.bin"
+    first = FakeCredential()
+    credential = PersistentlyCachedCredential(
+        first, CredentialSource.CLI, PersistentTokenCache(path, allow_unencrypted=True)
+    )
+    assert credential.get_token("scope").token == "token-1"
+    assert credential.get_token("scope").token == "token-1"
+    assert first.calls == 1
+
+    # e.g. another worker process, with its own cache instance
+    second = FakeCredential()
+    credential = PersistentlyCachedCredential(
+        second, CredentialSource.CLI, PersistentTokenCache(path, allow_unencrypted=True)
+    )
+    assert credential.get_token("scope").token == "token-1"
+    assert second.calls == 0
+    # keyed by source and scope
+    assert credential.get_token("other-scope").token == "token-1"
+    assert second.calls == 1
+
+
+def test_tokens_near_expiry_are_refetched(tmp_path):
+    cache = PersistentTokenCache(tmp_path / "token_cache.bin", allow_unencrypted=True)
+    fake = FakeCredential(lifetime=60)
+    credential = PersistentlyCachedCredential(fake, CredentialSource.DEFAULT, cache)
+    credential.get_token("scope")
+    credential.get_token("scope")
+    assert fake.calls == 2
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file modes")
+def test_unencrypted_cache_file_is_user_only_before_any_write(
+    tmp_path, monkeypatch, caplog
+):
+    def unavailable(path):
+        raise RuntimeError("no secret store")
+
+    monkeypatch.setattr(
+        "azure_connectors.credential.token_cache.build_encrypted_persistence",
+        unavailable,
+    )
+    old_umask = os.umask(0o022)
+    try:
+        existing = tmp_path / "existing.bin"
+        existing.write_text("{}")
+        with caplog.at_level(logging.WARNING):
+            cache = PersistentTokenCache(tmp_path / "new.bin", allow_unencrypted=True)
+            PersistentTokenCache(existing, allow_unencrypted=True)
+    finally:
+        os.umask(old_umask)
+
+    assert "storing tokens unencrypted" in caplog.text
+    assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
+    assert stat.S_IMODE(existing.stat().st_mode) == 0o600
+    cache.get_or_fetch("key", FakeCredential().get_token)
+    assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
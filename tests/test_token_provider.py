@@ -0,0 +1,53 @@
+import struct
+import time
+
+import pytest
+from azure.core.credentials import AccessToken
+
+from azure_connectors.credential.token_provider import TokenProvider, pack_token
+
+
+class FakeCredential:
+    def __init__(self, lifetime: float, fail: bool = False):
+        self.lifetime = lifetime
+        self.fail = fail
+        self.calls = 0
+
+    def get_token(self, *scopes):
+        if self.fail:
+            raise OSError("identity provider unavailable")
+        self.calls += 1
+        return AccessToken(f"token-{self.calls}", int(time.time() + self.lifetime))
+
+
+def test_pack_token():
+    packed = pack_token("ab")
+    assert struct.unpack("<I", packed[:4])[0] == 4
+    assert packed[4:].decode("UTF-16-LE") == "ab"
+
+
+def test_token_is_reused_until_refresh():
+    credential = FakeCredential(lifetime=3_600)
+    provider = TokenProvider(credential, "scope")
+    assert provider.get_token().token == "token-1"
+    assert provider.packed_token() == pack_token("token-1")
+    assert credential.calls == 1
+    provider.close()
+
+
+def test_token_is_refreshed_in_the_background():
+    credential = FakeCredential(lifetime=4)
+    provider = TokenProvider(credential, "scope", refresh_margin=3)
+    assert provider.get_token().token == "token-1"
+    deadline = time.time() + 5
+    while credential.calls < 2 and time.time() < deadline:
+        time.sleep(0.05)
+    assert provider.get_token().token == "token-2"
+    provider.close()
+
+
+def test_failed_fetch_raises_runtime_error():
+    provider = TokenProvider(FakeCredential(lifetime=3_600, fail=True), "scope")
+    with pytest.raises(RuntimeError):
+        provider.get_token()
+    provider.close()
@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import polars as pl
+import sqlalchemy
+from sqlalchemy.dialects import mssql
+
+from azure_connectors.dataframe_io.metrics import MetricsAggregator
+from azure_connectors.dataframe_io.upsert import build_merge_sql
+from azure_connectors.dataframe_io.utils import identity_insert_sql
+from azure_connectors.dataframe_io.write import write_df_from_sqltable
+
+WRITE = "azure_connectors.dataframe_io.write"
+
+metadata = sqlalchemy.MetaData()
+users = sqlalchemy.Table(
+    "users",
+    metadata,
+    sqlalchemy.Column("tenant", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("user id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("name", sqlalchemy.String(50)),
+    sqlalchemy.Column("age", sqlalchemy.Integer),
+    schema="dbo",
+)
+users_staging = sqlalchemy.Table(
+    "users__staging_0000",
+    metadata,
+    *(sqlalchemy.Column(col.name, col.type) for col in users.columns),
+    schema="dbo",
+)
+events = sqlalchemy.Table(
+    "events",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("payload", sqlalchemy.String(50)),
+)
+counters = sqlalchemy.Table(
+    "counters",
+    metadata,
+    sqlalchemy.Column("name", sqlalchemy.String(50), primary_key=True),
+    sqlalchemy.Column("seq", sqlalchemy.Integer, sqlalchemy.Identity()),
+)
+
+
+def test_build_merge_sql():
+    merge_sql = build_merge_sql(
+        users, users_staging, ["tenant", "user id", "name", "age"], mssql.dialect()
+    )
+    assert merge_sql == (
+        "MERGE INTO dbo.users WITH (HOLDLOCK) AS target\n"
+        "USING dbo.users__staging_0000 AS source\n"
+        "ON target.tenant = source.tenant AND target.[user id] = source.[user id]\n"
+        "WHEN MATCHED AND EXISTS (\n"
+        "    SELECT source.name, source.age\n"
+        "    EXCEPT SELECT target.name, target.age\n"
+        ") THEN UPDATE SET target.name = source.name, target.age = source.age\n"
+        "WHEN NOT MATCHED BY TARGET THEN INSERT (tenant, [user id], name, age)\n"
+        "VALUES (source.tenant, source.[user id], source.name, source.age);"
+    )
+
+
+def test_build_merge_sql_with_only_key_columns_never_updates():
+    merge_sql = build_merge_sql(
+        users, users_staging, ["tenant", "user id"], mssql.dialect()
+    )
+    assert "WHEN MATCHED" not in merge_sql
+    assert "WHEN NOT MATCHED BY TARGET THEN INSERT (tenant, [user id])" in merge_sql
+
+
+def test_identity_insert_sql():
+    dialect = mssql.dialect()
+    # a single integer primary key is created as IDENTITY
+    assert identity_insert_sql(events, ["id", "payload"], dialect) == (
+        "SET IDENTITY_INSERT events ON",
+        "SET IDENTITY_INSERT events OFF",
+    )
+    assert identity_insert_sql(events, ["payload"], dialect) is None
+    assert identity_insert_sql(counters, ["name", "seq"], dialect) == (
+        "SET IDENTITY_INSERT counters ON",
+        "SET IDENTITY_INSERT counters OFF",
+    )
+    # composite keys have no IDENTITY column
+    assert identity_insert_sql(users, ["tenant", "user id", "name"], dialect) is None
+
+
+def test_upsert_omits_defaulted_columns_from_staging(monkeypatch, tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+    table = sqlalchemy.Table(
+        "audited",
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+        sqlalchemy.Column("name", sqlalchemy.String(50)),
+        sqlalchemy.Column(
+            "created_at", sqlalchemy.String(20), nullable=False, server_default="now"
+        ),
+    )
+    table.create(engine)
+    merged = []
+
+    def merge_from_staging(table, staging_table, columns, engine):
+        with engine.connect() as conn:
+            rows = conn.execute(sqlalchemy.select(staging_table)).all()
+        merged.append(([col.name for col in staging_table.columns], columns, rows))
+        return len(rows)
+
+    monkeypatch.setattr(
+        f"{WRITE}.get_sql_connection", lambda: SimpleNamespace(engine=engine)
+    )
+    monkeypatch.setattr(f"{WRITE}.merge_from_staging", merge_from_staging)
+    write_df_from_sqltable(
+        pl.DataFrame({"id": [1, 2], "name": ["a", "b"]}),
+        if_table_exists="upsert",
+        table=table,
+        insertion_method="pl_to_sql_row_by_row",
+        observer=MetricsAggregator(),
+    )
+    assert merged == [(["id", "name"], ["id", "name"], [(1, "a"), (2, "b")])]
+    assert sqlalchemy.inspect(engine).get_table_names() == ["audited"]
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from azure_connectors.config import CredentialScope
+from azure_connectors.credential.enums import CredentialSource
+from azure_connectors.warmup import warmup
+
+
+class FakeProvider:
+    def __init__(self, done: threading.Event):
+        self.done = done
+
+    def get_token(self):
+        self.done.wait()
+
+
+class FakeConnection:
+    closed = 0
+
+    def close(self):
+        FakeConnection.closed += 1
+
+
+class FakeEngine:
+    def connect(self):
+        time.sleep(0.2)
+        return FakeConnection()
+
+
+class FakeSqlConnection:
+    engine = FakeEngine()
+
+
+def test_warm_up_runs_concurrently_and_reports_per_step(monkeypatch):
+    sql_token, blob_token = threading.Event(), threading.Event()
+    sql_token.set()
+    # the blob token misses the deadline; it is released once warm_up has returned,
+    # so that its fetch thread does not outlive the test
+    done = {
+        str(CredentialScope.AZURE_SQL.value): sql_token,
+        str(CredentialScope.AZURE_BLOB.value): blob_token,
+    }
+    fetched = []
+
+    def get_token_provider(settings):
+        fetched.append(str(settings.scope.value))
+        return FakeProvider(done[str(settings.scope.value)])
+
+    monkeypatch.setattr(warmup, "get_token_provider", get_token_provider)
+    monkeypatch.setattr(
+        warmup, "get_sql_connection", lambda source=None: FakeSqlConnection()
+    )
+    FakeConnection.closed = 0
+
+    try:
+        report = warmup.warm_up(
+            scopes=[
+                CredentialScope.AZURE_SQL,
+                CredentialScope.AZURE_BLOB,
+                CredentialScope.AZURE_TABLES,
+            ],
+            sql_connections=3,
+            deadline=1.0,
+            source=CredentialSource.CLI,
+        )
+    finally:
+        blob_token.set()
+    steps = {step.name: step for step in report.steps}
+
+    # the storage scopes share a value, so their token is fetched once
+    assert sorted(fetched) == sorted(done)
+    assert steps[f"token {CredentialScope.AZURE_SQL.value}"].ok
+    assert steps[f"token {CredentialScope.AZURE_BLOB.value}"].seconds is None
+    assert all(steps[f"sql connection {i}"].ok for i in (1, 2, 3))
+    assert not report.ok
+    assert report.seconds < 2.0
+    assert FakeConnection.closed == 3
@@ -3,6 +3,7 @@ import itertools
 import sys
 from collections import defaultdict
 from pathlib import Path
+from types import ModuleType
 from typing import Iterator, Optional
 
 from loguru import logger
@@ -26,25 +27,57 @@ def create_envfile_content(envfile_dict: EnvDict) -> str:
     return "\n".join([f"{var}={val}" for var, val in envfile_dict.items()]) + "\n"
 
 
+def src_modules() -> dict[str, ModuleType]:
+    """The imported modules of the 'src' directory, by name"""
+    src_path = Path(__file__).resolve().parent.parent / "src"
+    return {
+        name: module
+        for name, module in list(sys.modules.items())
+        if module
+        and hasattr(module, "__file__")
+        and str(module.__file__).startswith(str(src_path))
+    }
+
+
 def reload_all_modules() -> None:
     """Reload all modules in the 'src' directory"""
     # A little brute-force, but handles problems with module caching causing
     # the env_file.ENV_FILE variable not to propagate to the pydantic_settings classes
     # between tests
 
-    src_path = Path(__file__).resolve().parent.parent / "src"
-    for module in list(sys.modules.values()):
+    for module in src_modules().values():
         try:
-            if (
-                module
-                and hasattr(module, "__file__")
-                and str(module.__file__).startswith(str(src_path))
-            ):
-                importlib.reload(module)
+            importlib.reload(module)
         except Exception as e:
             logger.error(f"Error reloading module {module.__name__}: {e}")
 
 
+ModuleSnapshot = dict[str, tuple[ModuleType, dict]]
+
+
+def snapshot_modules() -> ModuleSnapshot:
+    """Record the contents of the modules in the 'src' directory"""
+    return {
+        name: (module, dict(vars(module))) for name, module in src_modules().items()
+    }
+
+
+def restore_modules(snapshot: ModuleSnapshot) -> None:
+    """
+    Undo `reload_all_modules`: put back the contents recorded by `snapshot_modules`,
+    and forget modules imported since, so they are imported again from the restored
+    ones. Reloading replaces every class, so without this, classes imported at module
+    level by test files (e.g. enums validated by pydantic) would no longer be the
+    package's own.
+    """
+    for name in src_modules().keys() - snapshot.keys():
+        del sys.modules[name]
+    for name, (module, contents) in snapshot.items():
+        vars(module).clear()
+        vars(module).update(contents)
+        sys.modules[name] = module
+
+
 def pack_dict_of_dicts(
     env_vars: EnvDict,
     envfile_vars: EnvDict,